@@ -8,9 +8,12 @@ import json
 try:
     from automate import Automate
     from operations import OperationsAutomate
-    from glushkov import construire_automate_glushkov
+    from glushkov import construire_automate_glushkov, construire_glushkov
     from minimise import MinimisationAutomate, minimiser_automate
     from thompson import thompson_construction
+    from derivees import automate_antimirov
+    from compteurs import afd_regex, reconnaitre_regex
+    from cache_regex import cache_partage
 
     
 except ImportError as e:
@@ -55,30 +58,21 @@ def creer_automate_glushkov():
         if not regex:
             return jsonify({'erreur': 'Expression régulière manquante'}), 400
         
-        # Pour l'instant, créons un automate simple pour tester
-        # Vous devrez implémenter la vraie logique Glushkov
-        automate_exemple = {
-            'alphabet': ['a', 'b'],
-            'etats': ['0', '1', '2', '3'],
-            'etats_initiaux': ['0'],
-            'etats_finaux': ['3'],
-            'transitions': {
-                '0,b': ['1'],
-                '1,a': ['2'],
-                '2,b': ['3'],
-                '1,b': ['1']
-            }
-        }
+        try:
+            construction = cache_partage().obtenir(regex, 'glushkov', construire_glushkov)
+        except ValueError as e:
+            return jsonify({'erreur': str(e)}), 400
+        automate = construction['automate']
         
         # Mettre à jour les automates globaux
-        automate_courant = automate_exemple
-        automate_original = automate_exemple.copy()
+        automate_courant = automate
+        automate_original = automate.copy()
         
         return jsonify({
             'succes': True,
             'message': f'Automate de Glushkov créé pour "{regex}"',
-            'automate': automate_exemple,
-            'positions': {'1': 'b', '2': 'a', '3': 'b'},
+            'automate': automate,
+            'positions': construction['positions'],
             'regex': regex
         })
         
@@ -97,7 +91,10 @@ def creer_automate_thompson():
         if not regex:
             return jsonify({'erreur': 'Expression régulière manquante'}), 400
 
-        automate = thompson_construction(regex)
+        try:
+            automate = cache_partage().obtenir(regex, 'thompson', thompson_construction)
+        except ValueError as e:
+            return jsonify({'erreur': str(e)}), 400
 
         automate_courant = automate
         automate_original = automate.copy()
@@ -113,6 +110,56 @@ def creer_automate_thompson():
         return jsonify({'erreur': f'Erreur lors de la construction Thompson : {str(e)}'}), 500
 
 
+@app.route('/api/creer_automate_derivees', methods=['POST'])
+def creer_automate_derivees():
+    """
+    Crée un automate par dérivation de l'expression régulière :
+    AFD de Brzozowski (methode='brzozowski', par défaut) ou AFN d'Antimirov.
+    L'AFD d'une expression avec répétition E{m,n} est celui de l'automate à
+    compteurs (compteurs.afd_regex) : la répétition n'est pas recopiée.
+    """
+    global automate_courant, automate_original
+
+    try:
+        donnees = request.json
+        regex = donnees.get('regex', '')
+        methode = donnees.get('methode', 'brzozowski')
+        # Lettres absentes de l'expression mais utiles au complément ~
+        alphabet = donnees.get('alphabet', [])
+
+        if not regex:
+            return jsonify({'erreur': 'Expression régulière manquante'}), 400
+        if methode not in ('brzozowski', 'antimirov'):
+            return jsonify({'erreur': f'Méthode inconnue : {methode}'}), 400
+
+        try:
+            if methode == 'brzozowski':
+                automate = afd_regex(regex, alphabet_supplementaire=alphabet)
+            else:
+                automate = automate_antimirov(regex, alphabet_supplementaire=alphabet)
+        except ValueError as e:
+            return jsonify({'erreur': str(e)}), 400
+
+        automate_courant = automate
+        automate_original = automate.copy()
+
+        return jsonify({
+            'succes': True,
+            'message': f'Automate de {methode.capitalize()} créé pour "{regex}"',
+            'automate': automate,
+            'regex': regex
+        })
+
+    except Exception as e:
+        return jsonify({'erreur': f'Erreur lors de la dérivation : {str(e)}'}), 500
+
+
+@app.route('/api/cache_regex', methods=['GET'])
+def statistiques_cache_regex():
+    """Compteurs du cache des constructions Thompson et Glushkov"""
+    return jsonify({'succes': True, 'cache': cache_partage().statistiques()})
+
+
 @app.route('/api/creer_automate', methods=['POST'])
 def creer_automate():
     """Crée un nouvel automate à partir des données fournies"""
@@ -158,13 +205,30 @@ def creer_automate():
 
 @app.route('/api/reconnaitre_mot', methods=['POST'])
 def reconnaitre_mot():
-    """Teste si un mot est reconnu par l'automate"""
+    """
+    Teste si un mot est reconnu par l'automate, ou par l'expression 'regex'
+    si elle est fournie (automate à compteurs pour E{m,n}, sans recopie)
+    """
     try:
-        if not automate_courant:
-            return jsonify({'erreur': 'Aucun automate défini'}), 400
-        
         donnees = request.json
         mot = donnees.get('mot', '')
+
+        regex = donnees.get('regex')
+        if regex:
+            try:
+                accepte = reconnaitre_regex(regex, mot)
+            except ValueError as e:
+                return jsonify({'erreur': str(e)}), 400
+            return jsonify({
+                'succes': True,
+                'accepte': accepte,
+                'mot': mot,
+                'regex': regex,
+                'message': f'Mot "{mot}" {"accepté" if accepte else "rejeté"}'
+            })
+
+        if not automate_courant:
+            return jsonify({'erreur': 'Aucun automate défini'}), 400
         
         # Simulation simple pour tester - à remplacer par la vraie logique
         # Cette implémentation basique simule un automate qui accepte les mots de longueur paire
@@ -201,23 +265,28 @@ def analyser_etats():
         if not automate_courant:
             return jsonify({'erreur': 'Aucun automate défini'}), 400
         
-        # Analyse simple pour tester - à remplacer par la vraie logique
-        etats = automate_courant.get('etats', [])
+        # Un seul index d'adjacence sert aux quatre analyses
+        automate = Automate.depuis_dict(automate_courant)
+        operations = OperationsAutomate(automate)
+        
+        accessibles = operations.trouver_etats_accessibles()
+        coaccessibles = operations.trouver_etats_coaccessibles()
+        utiles = operations.trouver_etats_utiles()
+        inutiles = operations.trouver_etats_inutiles()
         
-        # Pour l'instant, considérons tous les états comme utiles
         return jsonify({
             'succes': True,
-            'etats_accessibles': etats,
-            'etats_coaccessibles': etats,
-            'etats_utiles': etats,
-            'etats_inutiles': [],
-            'est_emonde': True,
+            'etats_accessibles': accessibles,
+            'etats_coaccessibles': coaccessibles,
+            'etats_utiles': utiles,
+            'etats_inutiles': inutiles,
+            'est_emonde': not inutiles,
             'statistiques': {
-                'nombre_etats_total': len(etats),
-                'nombre_etats_accessibles': len(etats),
-                'nombre_etats_coaccessibles': len(etats),
-                'nombre_etats_utiles': len(etats),
-                'nombre_etats_inutiles': 0
+                'nombre_etats_total': automate.index_graphe().nombre_etats,
+                'nombre_etats_accessibles': len(accessibles),
+                'nombre_etats_coaccessibles': len(coaccessibles),
+                'nombre_etats_utiles': len(utiles),
+                'nombre_etats_inutiles': len(inutiles)
             }
         })
         
@@ -420,7 +489,7 @@ def info_application():
             modules_disponibles['operations'] = False
         
         try:
-            from glushkov import construire_automate_glushkov
+            from glushkov import construire_automate_glushkov, construire_glushkov
             modules_disponibles['glushkov'] = True
         except ImportError:
             modules_disponibles['glushkov'] = False
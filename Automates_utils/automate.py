@@ -1,4 +1,8 @@
 # automate.py - Classe principale pour représenter un automate
+from automate_compact import AutomateCompact
+from index_graphe import IndexGraphe
+
+
 class Automate:
     """Classe représentant un automate fini"""
     
@@ -8,6 +12,51 @@ class Automate:
         self.etats_initiaux = etats_initiaux if isinstance(etats_initiaux, list) else [etats_initiaux]
         self.etats_finaux = etats_finaux if isinstance(etats_finaux, list) else [etats_finaux]
         self.transitions = transitions
+        self._index = None
+    
+    @classmethod
+    def depuis_dict(cls, donnees):
+        """
+        Construit un automate depuis le format JSON de l'interface.
+        Accepte les transitions imbriquées {etat: {symbole: [...]}} comme
+        le format à clés plates {'etat,symbole': [...]} de Thompson et Glushkov.
+        """
+        etats = list(donnees.get('etats', []))
+        # Les clés JSON sont toujours des chaînes : retrouver le nom d'origine de l'état
+        par_texte = {str(etat): etat for etat in etats}
+        
+        def nom(etat):
+            return par_texte.get(str(etat), etat)
+        
+        transitions = {}
+        for cle, valeur in donnees.get('transitions', {}).items():
+            if isinstance(valeur, dict):
+                arcs = transitions.setdefault(nom(cle), {})
+                for symbole, dests in valeur.items():
+                    dests = dests if isinstance(dests, list) else [dests]
+                    arcs.setdefault(symbole, []).extend(nom(d) for d in dests)
+            else:
+                etat, symbole = cle.split(',', 1)
+                transitions.setdefault(nom(etat), {}).setdefault(symbole, []).extend(
+                    nom(d) for d in valeur)
+        
+        return cls(
+            alphabet=list(donnees.get('alphabet', [])),
+            etats=etats,
+            etats_initiaux=[nom(e) for e in donnees.get('etats_initiaux', [])],
+            etats_finaux=[nom(e) for e in donnees.get('etats_finaux', [])],
+            transitions=transitions
+        )
+    
+    def index_graphe(self):
+        """Retourne l'index d'adjacence de l'automate, construit au premier appel"""
+        if self._index is None:
+            self._index = IndexGraphe(AutomateCompact.depuis_automate(self))
+        return self._index
+    
+    def invalider_index(self):
+        """À appeler après toute modification directe de etats ou transitions"""
+        self._index = None
         
     def copier(self):
         """Crée une copie profonde de l'automate"""
@@ -80,6 +129,8 @@ class Automate:
     
     def ajouter_transition(self, etat_source, symbole, etat_destination):
         """Ajoute une transition à l'automate"""
+        self.invalider_index()
+        
         if etat_source not in self.transitions:
             self.transitions[etat_source] = {}
         
@@ -0,0 +1,278 @@
+# automate_compact.py - Représentation compacte commune des automates
+#
+# Chaque module manipule son propre format (clés plates 'q,a' pour Thompson,
+# Glushkov et la minimisation, dictionnaires imbriqués pour Automate, listes
+# d'objets State/Transition pour l'application principale). Ce module fournit
+# un noyau unique : états et symboles internés en entiers, transitions en CSR
+# dans des array('i'). Les conversions se font une seule fois, aux bords.
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EPSILON = 'ε'
+SYMBOLES_EPSILON = ('ε', 'epsilon')
+
+
+class TableNoms:
+    """Internement de noms (états ou symboles) en entiers consécutifs"""
+
+    __slots__ = ('noms', 'numeros')
+
+    def __init__(self, noms=()):
+        self.noms = []
+        self.numeros = {}
+        for nom in noms:
+            self.numero(nom)
+
+    def numero(self, nom):
+        """Numéro du nom, attribué au premier appel"""
+        numero = self.numeros.get(nom)
+        if numero is None:
+            numero = len(self.noms)
+            self.numeros[nom] = numero
+            self.noms.append(nom)
+        return numero
+
+    def get(self, nom, defaut=None):
+        return self.numeros.get(nom, defaut)
+
+    def __getitem__(self, numero):
+        return self.noms[numero]
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __iter__(self):
+        return iter(self.noms)
+
+    def __contains__(self, nom):
+        return nom in self.numeros
+
+
+class AutomateCompact:
+    """
+    Automate à états et symboles entiers.
+
+    Les transitions de l'état q occupent les indices [debuts[q], debuts[q + 1])
+    des tableaux `symboles` et `cibles`, triées par (symbole, cible) et sans
+    doublon : la recherche d'une transition se fait par dichotomie.
+    """
+
+    __slots__ = ('etats', 'alphabet', 'initiaux', 'finaux',
+                 'debuts', 'symboles', 'cibles')
+
+    def __init__(self, etats, alphabet, initiaux, finaux, debuts, symboles, cibles):
+        self.etats = etats
+        self.alphabet = alphabet
+        self.initiaux = initiaux
+        self.finaux = finaux
+        self.debuts = debuts
+        self.symboles = symboles
+        self.cibles = cibles
+
+    @classmethod
+    def depuis_arcs(cls, etats, alphabet, initiaux, finaux, arcs):
+        """
+        Construit l'automate à partir de tables de noms déjà remplies et
+        d'arcs (source, symbole, cible) exprimés en numéros.
+        """
+        arcs = sorted(set(arcs))
+        n = len(etats)
+        debuts = array('i', bytes(4 * (n + 1)))
+        symboles = array('i', bytes(4 * len(arcs)))
+        cibles = array('i', bytes(4 * len(arcs)))
+
+        for k, (source, symbole, cible) in enumerate(arcs):
+            debuts[source + 1] += 1
+            symboles[k] = symbole
+            cibles[k] = cible
+        for q in range(n):
+            debuts[q + 1] += debuts[q]
+
+        return cls(etats, alphabet,
+                   array('i', sorted(set(initiaux))),
+                   array('i', sorted(set(finaux))),
+                   debuts, symboles, cibles)
+
+    # ------------------------------------------------------------------
+    # Adaptateurs d'entrée
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def depuis_dict(cls, donnees):
+        """
+        Format JSON de Automates_utils : transitions à clés plates
+        {'q,a': [...]} ou imbriquées {q: {a: [...]}}.
+        """
+        etats = TableNoms(donnees.get('etats', []))
+        alphabet = TableNoms(donnees.get('alphabet', []))
+        # Les clés JSON sont des chaînes : retrouver le nom d'origine de l'état
+        par_texte = {str(nom): nom for nom in etats}
+
+        def etat(nom):
+            return etats.numero(par_texte.get(str(nom), nom))
+
+        arcs = []
+        for cle, valeur in donnees.get('transitions', {}).items():
+            if isinstance(valeur, dict):
+                source = etat(cle)
+                for symbole, destinations in valeur.items():
+                    a = alphabet.numero(symbole)
+                    arcs.extend((source, a, etat(d)) for d in _en_liste(destinations))
+            else:
+                nom_source, symbole = cle.split(',', 1)
+                source = etat(nom_source)
+                a = alphabet.numero(symbole)
+                arcs.extend((source, a, etat(d)) for d in _en_liste(valeur))
+
+        initiaux = [etat(e) for e in donnees.get('etats_initiaux', [])]
+        finaux = [etat(e) for e in donnees.get('etats_finaux', [])]
+        return cls.depuis_arcs(etats, alphabet, initiaux, finaux, arcs)
+
+    @classmethod
+    def depuis_automate(cls, automate):
+        """Objet Automate (transitions imbriquées)"""
+        etats = TableNoms(automate.etats)
+        alphabet = TableNoms(automate.alphabet)
+        arcs = []
+        for nom_source, arcs_sortants in automate.transitions.items():
+            source = etats.numero(nom_source)
+            for symbole, destinations in arcs_sortants.items():
+                a = alphabet.numero(symbole)
+                arcs.extend((source, a, etats.numero(d)) for d in _en_liste(destinations))
+
+        initiaux = [etats.numero(e) for e in automate.etats_initiaux]
+        finaux = [etats.numero(e) for e in automate.etats_finaux]
+        return cls.depuis_arcs(etats, alphabet, initiaux, finaux, arcs)
+
+    @classmethod
+    def depuis_format_webapp(cls, donnees):
+        """
+        Format de l'application principale (Automaton.to_dict) :
+        {'states': [{'name', 'initial', 'final'}], 'transitions': [{'from', 'to', 'symbol'}]}
+        """
+        etats = TableNoms(s['name'] for s in donnees.get('states', []))
+        alphabet = TableNoms(donnees.get('alphabet', []))
+        arcs = [(etats.numero(t['from']), alphabet.numero(t['symbol']), etats.numero(t['to']))
+                for t in donnees.get('transitions', [])]
+
+        initiaux = [etats.numero(s['name']) for s in donnees.get('states', []) if s.get('initial')]
+        finaux = [etats.numero(s['name']) for s in donnees.get('states', []) if s.get('final')]
+        return cls.depuis_arcs(etats, alphabet, initiaux, finaux, arcs)
+
+    # ------------------------------------------------------------------
+    # Adaptateurs de sortie
+    # ------------------------------------------------------------------
+
+    def _symboles_visibles(self):
+        return [a for a in self.alphabet if a not in SYMBOLES_EPSILON]
+
+    def vers_dict(self, cles_plates=True):
+        """Format JSON de Automates_utils (clés 'q,a' par défaut)"""
+        noms = self.etats.noms
+        transitions = {}
+        for q, a, cible in self.arcs():
+            if cles_plates:
+                transitions.setdefault(f"{noms[q]},{self.alphabet[a]}", []).append(noms[cible])
+            else:
+                transitions.setdefault(noms[q], {}).setdefault(self.alphabet[a], []).append(noms[cible])
+
+        return {
+            'alphabet': self._symboles_visibles(),
+            'etats': list(noms),
+            'etats_initiaux': [noms[q] for q in self.initiaux],
+            'etats_finaux': [noms[q] for q in self.finaux],
+            'transitions': transitions
+        }
+
+    def vers_automate(self):
+        """Objet Automate (transitions imbriquées)"""
+        from automate import Automate
+        donnees = self.vers_dict(cles_plates=False)
+        return Automate(
+            alphabet=donnees['alphabet'],
+            etats=donnees['etats'],
+            etats_initiaux=donnees['etats_initiaux'],
+            etats_finaux=donnees['etats_finaux'],
+            transitions=donnees['transitions']
+        )
+
+    def vers_format_webapp(self, nom=''):
+        """Format de l'application principale, relu par create_automaton_from_dict"""
+        noms = self.etats.noms
+        initiaux = set(self.initiaux)
+        finaux = set(self.finaux)
+        return {
+            'name': nom,
+            'states': [{'name': str(noms[q]), 'initial': q in initiaux, 'final': q in finaux}
+                       for q in range(len(noms))],
+            'alphabet': self._symboles_visibles(),
+            'transitions': [{'from': str(noms[q]), 'to': str(noms[cible]), 'symbol': self.alphabet[a]}
+                            for q, a, cible in self.arcs()]
+        }
+
+    def vers_numpy(self):
+        """Vues NumPy (sans copie) des tableaux de transitions"""
+        if np is None:
+            raise ImportError("NumPy n'est pas installé")
+        return {
+            'debuts': np.frombuffer(self.debuts, dtype=np.int32),
+            'symboles': np.frombuffer(self.symboles, dtype=np.int32),
+            'cibles': np.frombuffer(self.cibles, dtype=np.int32),
+            'initiaux': np.frombuffer(self.initiaux, dtype=np.int32),
+            'finaux': np.frombuffer(self.finaux, dtype=np.int32)
+        }
+
+    # ------------------------------------------------------------------
+    # Accès
+    # ------------------------------------------------------------------
+
+    @property
+    def nombre_etats(self):
+        return len(self.debuts) - 1
+
+    @property
+    def nombre_transitions(self):
+        return len(self.cibles)
+
+    def arcs(self):
+        """Itère sur les transitions (source, symbole, cible)"""
+        debuts, symboles, cibles = self.debuts, self.symboles, self.cibles
+        for q in range(self.nombre_etats):
+            for k in range(debuts[q], debuts[q + 1]):
+                yield q, symboles[k], cibles[k]
+
+    def destinations(self, q, a):
+        """Cibles des transitions q --a-->"""
+        debut, fin = self.debuts[q], self.debuts[q + 1]
+        gauche = bisect_left(self.symboles, a, debut, fin)
+        droite = bisect_right(self.symboles, a, gauche, fin)
+        return self.cibles[gauche:droite]
+
+    def successeurs(self, q):
+        """Cibles de toutes les transitions issues de q (avec répétitions)"""
+        return self.cibles[self.debuts[q]:self.debuts[q + 1]]
+
+    def est_deterministe(self):
+        """Un seul état initial, pas d'ε et au plus une cible par (état, symbole)"""
+        if len(self.initiaux) > 1:
+            return False
+        epsilon = {self.alphabet.get(e) for e in SYMBOLES_EPSILON} - {None}
+        symboles = self.symboles
+        for q in range(self.nombre_etats):
+            for k in range(self.debuts[q], self.debuts[q + 1]):
+                if symboles[k] in epsilon:
+                    return False
+                if k > self.debuts[q] and symboles[k] == symboles[k - 1]:
+                    return False
+        return True
+
+
+def _en_liste(destinations):
+    if isinstance(destinations, list):
+        return destinations
+    return [] if destinations is None else [destinations]
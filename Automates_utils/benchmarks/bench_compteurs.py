@@ -0,0 +1,47 @@
+# bench_compteurs.py - Répétitions [ab]{n} : automate à compteurs contre recopie
+#
+# Usage : cd Automates_utils && python3 benchmarks/bench_compteurs.py [n_max]
+#
+# La recopie crée un automate de Thompson de taille proportionnelle à n et
+# refuse au-delà du budget de développement ; l'automate à compteurs garde
+# une taille constante et ne paie n qu'à la lecture du mot.
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from compteurs import AutomateCompteurs  # noqa: E402
+from thompson import thompson_construction  # noqa: E402
+
+
+def chronometrer(fonction, repetitions=3):
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main(n_max=100000):
+    print(f"{'n':>8}{'états compteurs':>17}{'états recopie':>15}"
+          f"{'recopie (ms)':>14}{'lecture (ms)':>14}")
+    n = 10
+    while n <= n_max:
+        motif = f"c[ab]{{{n}}}c"
+        automate = AutomateCompteurs.depuis_regex(motif)
+        mot = 'c' + 'ab' * (n // 2) + 'b' * (n % 2) + 'c'
+        assert automate.accepte(mot) and not automate.accepte(mot[:-1])
+        lecture = chronometrer(lambda: automate.accepte(mot))
+        try:
+            etats = len(thompson_construction(motif)['etats'])
+            recopie = f"{chronometrer(lambda: thompson_construction(motif)) * 1000:>14.2f}"
+        except ValueError:
+            etats, recopie = 'budget', f"{'-':>14}"
+        print(f"{n:>8}{automate.nombre_etats:>17}{etats:>15}{recopie}{lecture * 1000:>14.2f}")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
@@ -0,0 +1,256 @@
+# bench_constructions.py - Thompson, Glushkov et dérivées sur des familles d'expressions
+#
+# Usage : cd Automates_utils && python3 benchmarks/bench_constructions.py [n_max] [sortie.json] [reference.json]
+#
+# Pour chaque famille d'expressions (aléatoires, imbriquées, unions larges,
+# longues concaténations, étoiles imbriquées) et chaque taille n = 10, 100...
+# jusqu'à n_max, mesure pour chaque construction le temps, le pic mémoire
+# (tracemalloc), le nombre d'états et de transitions, puis le coût de la
+# déterminisation et de la minimisation de l'automate obtenu. Les résultats
+# sont écrits en JSON ; avec un fichier de référence (sortie d'un run
+# précédent), les temps sont comparés ligne à ligne.
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from automate_compact import SYMBOLES_EPSILON  # noqa: E402
+from derivees import automate_antimirov, automate_brzozowski  # noqa: E402
+from glushkov import construire_automate_glushkov  # noqa: E402
+from minimise import minimiser_automate  # noqa: E402
+from thompson import thompson_construction  # noqa: E402
+
+# Au-delà, la déterminisation est abandonnée (les minimisations sont quadratiques)
+BUDGET_AFD = 2000
+
+
+def glushkov(regex):
+    resultat = construire_automate_glushkov(regex)
+    if not resultat['succes']:
+        raise ValueError(resultat['erreur'])
+    return resultat['automate']
+
+
+CONSTRUCTIONS = {
+    'thompson': thompson_construction,
+    'glushkov': glushkov,
+    'brzozowski': automate_brzozowski,
+    'antimirov': automate_antimirov,
+}
+
+
+# ----------------------------------------------------------------------
+# Familles d'expressions (n : nombre approximatif de symboles)
+# ----------------------------------------------------------------------
+
+def aleatoire(n, graine=0):
+    """Arbre aléatoire à n feuilles sur {a, b, c}"""
+    hasard = random.Random(graine)
+    morceaux = [hasard.choice('abc') for _ in range(n)]
+    while len(morceaux) > 1:
+        i = hasard.randrange(len(morceaux) - 1)
+        gauche, droite = morceaux[i], morceaux.pop(i + 1)
+        operateur = hasard.choice(('|', '', ''))
+        morceau = f"({gauche}{operateur}{droite})"
+        if hasard.random() < 0.2:
+            morceau += hasard.choice('*?')
+        morceaux[i] = morceau
+    return morceaux[0]
+
+
+def imbrique(n):
+    """(a(b(a(...)?)?)?)? : n niveaux de parenthèses"""
+    return ''.join(f"({'ab'[i % 2]}" for i in range(n)) + ')?' * n
+
+
+def unions_larges(n):
+    """Union de n mots binaires distincts de même longueur"""
+    longueur = max(1, (n - 1).bit_length())
+    mots = (format(i, f'0{longueur}b').replace('0', 'a').replace('1', 'b') for i in range(n))
+    return '|'.join(mots)
+
+
+def concatenations_longues(n, graine=0):
+    hasard = random.Random(graine)
+    return ''.join(hasard.choice('ab') for _ in range(n))
+
+
+def etoiles_imbriquees(n):
+    """((((a)*b)*a)*b)* : n étoiles emboîtées"""
+    regex = 'a'
+    for i in range(n):
+        regex = f"({regex}{'ba'[i % 2]})*"
+    return regex
+
+
+FAMILLES = {
+    'aleatoire': aleatoire,
+    'imbrique': imbrique,
+    'unions_larges': unions_larges,
+    'concatenations_longues': concatenations_longues,
+    'etoiles_imbriquees': etoiles_imbriquees,
+}
+
+
+# ----------------------------------------------------------------------
+# Mesures
+# ----------------------------------------------------------------------
+
+def chronometrer(fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    return resultat, time.perf_counter() - debut
+
+
+def mesurer_memoire(fonction):
+    tracemalloc.start()
+    try:
+        fonction()
+        _, pic = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pic
+
+
+def nombre_transitions(automate):
+    return sum(len(destinations) for destinations in automate['transitions'].values())
+
+
+def determiniser(automate, budget=BUDGET_AFD):
+    """
+    Construction par sous-ensembles avec fermeture ε (les automates de
+    Thompson en ont) ; ValueError au-delà de `budget` états.
+    """
+    arcs = {}
+    for cle, destinations in automate['transitions'].items():
+        etat, symbole = cle.split(',', 1)
+        arcs.setdefault(etat, {}).setdefault(symbole, []).extend(destinations)
+    lettres = [a for a in automate['alphabet'] if a not in SYMBOLES_EPSILON]
+
+    def cloture(etats):
+        resultat = set(etats)
+        pile = list(resultat)
+        while pile:
+            sortants = arcs.get(pile.pop(), {})
+            for epsilon in SYMBOLES_EPSILON:
+                for suivant in sortants.get(epsilon, ()):
+                    if suivant not in resultat:
+                        resultat.add(suivant)
+                        pile.append(suivant)
+        return frozenset(resultat)
+
+    finaux_origine = set(automate['etats_finaux'])
+    initial = cloture(automate['etats_initiaux'])
+    numeros = {initial: 0}
+    file = deque([initial])
+    transitions = {}
+    finaux = []
+    while file:
+        courant = file.popleft()
+        q = numeros[courant]
+        if courant & finaux_origine:
+            finaux.append(str(q))
+        for lettre in lettres:
+            suivant = cloture(d for etat in courant for d in arcs.get(etat, {}).get(lettre, ()))
+            if not suivant:
+                continue
+            if suivant not in numeros:
+                if len(numeros) >= budget:
+                    raise ValueError(f"L'AFD dépasse le budget de {budget} états")
+                numeros[suivant] = len(numeros)
+                file.append(suivant)
+            transitions[f"{q},{lettre}"] = [str(numeros[suivant])]
+    return {
+        'alphabet': lettres,
+        'etats': [str(q) for q in range(len(numeros))],
+        'etats_initiaux': ['0'],
+        'etats_finaux': finaux,
+        'transitions': transitions
+    }
+
+
+def mesurer(construction, regex):
+    """Mesures d'une construction sur une expression (dictionnaire sérialisable)"""
+    try:
+        automate, temps = chronometrer(lambda: construction(regex))
+    except ValueError as e:
+        return {'erreur': str(e)}
+    mesures = {
+        'temps_construction': temps,
+        'memoire_pic': mesurer_memoire(lambda: construction(regex)),
+        'etats': len(automate['etats']),
+        'transitions': nombre_transitions(automate),
+    }
+    try:
+        afd, mesures['temps_determinisation'] = chronometrer(lambda: determiniser(automate))
+    except ValueError as e:
+        mesures['erreur_determinisation'] = str(e)
+        return mesures
+    mesures['etats_afd'] = len(afd['etats'])
+    (minimal, _), mesures['temps_minimisation'] = chronometrer(lambda: minimiser_automate(afd))
+    mesures['etats_minimal'] = len(minimal['etats'])
+    return mesures
+
+
+def comparer(resultats, reference):
+    """Rapport temps de construction nouveau / ancien, pour les lignes communes"""
+    anciens = {(r['famille'], r['n'], r['construction']): r for r in reference['resultats']}
+    print(f"\n{'famille':<24}{'n':>6}{'construction':>13}{'ancien (ms)':>13}{'nouveau (ms)':>14}{'rapport':>9}")
+    for r in resultats:
+        ancien = anciens.get((r['famille'], r['n'], r['construction']))
+        if ancien is None or 'temps_construction' not in ancien or 'temps_construction' not in r:
+            continue
+        rapport = r['temps_construction'] / ancien['temps_construction'] if ancien['temps_construction'] else float('inf')
+        print(f"{r['famille']:<24}{r['n']:>6}{r['construction']:>13}"
+              f"{ancien['temps_construction'] * 1000:>13.2f}{r['temps_construction'] * 1000:>14.2f}{rapport:>9.2f}")
+
+
+def main(n_max=100, sortie='resultats_constructions.json', reference=None):
+    resultats = []
+    print(f"{'famille':<24}{'n':>6}{'construction':>13}{'temps (ms)':>12}{'pic (Ko)':>10}"
+          f"{'états':>8}{'trans.':>8}{'AFD':>7}{'dét. (ms)':>11}{'min.':>7}{'min. (ms)':>11}")
+    for famille, generer in FAMILLES.items():
+        n = 10
+        while n <= n_max:
+            regex = generer(n)
+            for nom, construction in CONSTRUCTIONS.items():
+                mesures = mesurer(construction, regex)
+                resultats.append({'famille': famille, 'n': n, 'construction': nom,
+                                  'taille_regex': len(regex), **mesures})
+                ligne = f"{famille:<24}{n:>6}{nom:>13}"
+                if 'erreur' in mesures:
+                    print(f"{ligne}  {mesures['erreur']}")
+                    continue
+                ligne += (f"{mesures['temps_construction'] * 1000:>12.2f}{mesures['memoire_pic'] / 1024:>10.1f}"
+                          f"{mesures['etats']:>8}{mesures['transitions']:>8}")
+                if 'etats_afd' in mesures:
+                    ligne += (f"{mesures['etats_afd']:>7}{mesures['temps_determinisation'] * 1000:>11.2f}"
+                              f"{mesures['etats_minimal']:>7}{mesures['temps_minimisation'] * 1000:>11.2f}")
+                else:
+                    ligne += f"{'budget':>7}"
+                print(ligne)
+            n *= 10
+
+    with open(sortie, 'w', encoding='utf-8') as fichier:
+        json.dump({
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'n_max': n_max,
+            'resultats': resultats,
+        }, fichier, ensure_ascii=False, indent=2)
+    print(f"\nRésultats écrits dans {sortie}")
+
+    if reference is not None:
+        with open(reference, encoding='utf-8') as fichier:
+            comparer(resultats, json.load(fichier))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]], *sys.argv[2:4])
@@ -0,0 +1,81 @@
+# bench_etoile_normale.py - Glushkov avec et sans forme normale étoile
+#
+# Usage : cd Automates_utils && python3 benchmarks/bench_etoile_normale.py [profondeur_max]
+#
+# Motifs à étoiles imbriquées ((a1*a2*)*a3*)*... : sans forme normale étoile,
+# chaque étoile refait l'union Last -> First de toutes les positions qu'elle
+# contient, soit un coût quadratique en la profondeur.
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etoile_normale import forme_normale_etoile  # noqa: E402
+from glushkov import analyser_glushkov  # noqa: E402
+from regex_parser import analyser_regex, CHAR, EPSILON, UNION, CONCAT, PLUS, OPTION  # noqa: E402
+
+LETTRES = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def motif_imbrique(profondeur):
+    """((a*b*)*c*)*... avec `profondeur` étoiles extérieures"""
+    motif = f"{LETTRES[0]}*"
+    for i in range(1, profondeur + 1):
+        motif = f"({motif}{LETTRES[i % len(LETTRES)]}*)*"
+    return motif
+
+
+def unions_etoiles(arbre):
+    """Nombre de positions parcourues par les unions Last -> First des étoiles"""
+    total = 0
+    resultats = {}  # nœud -> (nullable, nombre de positions dans Last)
+    for i in arbre.ordre_postfixe():
+        type_ = arbre.types[i]
+        if type_ == CHAR:
+            resultats[i] = (False, 1)
+        elif type_ == EPSILON:
+            resultats[i] = (True, 0)
+        elif type_ in (CONCAT, UNION):
+            null_g, last_g = resultats.pop(arbre.gauches[i])
+            null_d, last_d = resultats.pop(arbre.droits[i])
+            if type_ == CONCAT:
+                resultats[i] = (null_g and null_d, last_g + last_d if null_d else last_d)
+            else:
+                resultats[i] = (null_g or null_d, last_g + last_d)
+        else:
+            nullable, last = resultats.pop(arbre.gauches[i])
+            if type_ != OPTION:
+                total += last
+            resultats[i] = (type_ != PLUS or nullable, last)
+    return total
+
+
+def chronometrer(fonction, repetitions=5):
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main(profondeur_max=800):
+    print(f"{'profondeur':>10}{'positions':>11}{'unions':>10}{'unions SNF':>12}"
+          f"{'brut (ms)':>12}{'SNF (ms)':>12}")
+    profondeur = 25
+    while profondeur <= profondeur_max:
+        motif = motif_imbrique(profondeur)
+        arbre = analyser_regex(motif)
+        arbre_snf = forme_normale_etoile(arbre)
+        assert analyser_glushkov(arbre) == analyser_glushkov(arbre_snf)
+
+        brut = chronometrer(lambda: analyser_glushkov(analyser_regex(motif)))
+        snf = chronometrer(lambda: analyser_glushkov(forme_normale_etoile(analyser_regex(motif))))
+        print(f"{profondeur:>10}{profondeur + 1:>11}{unions_etoiles(arbre):>10}{unions_etoiles(arbre_snf):>12}"
+              f"{brut * 1000:>12.2f}{snf * 1000:>12.2f}")
+        profondeur *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:2]])
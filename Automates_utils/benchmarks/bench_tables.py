@@ -0,0 +1,113 @@
+# bench_tables.py - Tables compressées contre dictionnaires imbriqués
+#
+# Usage : cd Automates_utils && python3 benchmarks/bench_tables.py [etats] [symboles]
+#
+# Compare, sur un AFD aléatoire creux à grand alphabet, la mémoire et la vitesse
+# de recherche de transitions de Automate.transitions (dict de dict de listes)
+# et de TableCompressee, avec et sans réordonnancement en largeur.
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from automate import Automate  # noqa: E402
+from automate_compact import AutomateCompact  # noqa: E402
+from table_compressee import TableCompressee, reordonner_bfs  # noqa: E402
+
+
+def afd_aleatoire(nombre_etats, nombre_symboles, sortants=4, graine=0):
+    """AFD complet : quelques transitions spécifiques par état, le reste vers un état de repli"""
+    hasard = random.Random(graine)
+    alphabet = [f"s{i}" for i in range(nombre_symboles)]
+    etats = list(range(nombre_etats))
+    transitions = {}
+    for q in etats:
+        repli = hasard.randrange(nombre_etats)
+        ligne = {a: [repli] for a in alphabet}
+        for a in hasard.sample(alphabet, min(sortants, nombre_symboles)):
+            ligne[a] = [hasard.randrange(nombre_etats)]
+        transitions[q] = ligne
+    finaux = hasard.sample(etats, max(1, nombre_etats // 10))
+    return Automate(alphabet, etats, [0], finaux, transitions)
+
+
+def mesurer_memoire(construire):
+    tracemalloc.start()
+    objet = construire()
+    taille, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objet, taille
+
+
+def chronometrer(parcours, repetitions=3):
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        parcours()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main(nombre_etats=2000, nombre_symboles=256, longueur=200000):
+    automate = afd_aleatoire(nombre_etats, nombre_symboles)
+    hasard = random.Random(1)
+    mot = [hasard.choice(automate.alphabet) for _ in range(longueur)]
+
+    _, memoire_dicts = mesurer_memoire(lambda: afd_aleatoire(nombre_etats, nombre_symboles).transitions)
+
+    compact = AutomateCompact.depuis_automate(automate)
+    table = TableCompressee(compact)
+    table_bfs = TableCompressee(reordonner_bfs(compact))
+
+    def parcours_dicts():
+        q = automate.etats_initiaux[0]
+        transitions = automate.transitions
+        for a in mot:
+            q = transitions[q][a][0]
+        return q
+
+    def parcours_table(t):
+        def parcours():
+            q = t.initial
+            numeros = t.alphabet.numeros
+            transition = t.transition
+            for a in mot:
+                q = transition(q, numeros[a])
+            return q
+        return parcours
+
+    def parcours_table_pre_code(t):
+        # Mot déjà traduit en numéros de symboles, recherche en ligne
+        codes = [t.alphabet.numeros[a] for a in mot]
+        base, suivant, verif, defaut = t.base, t.suivant, t.verif, t.defaut
+        taille = len(verif)
+
+        def parcours():
+            q = t.initial
+            for a in codes:
+                k = base[q] + a
+                q = suivant[k] if k < taille and verif[k] == q else defaut[q]
+            return q
+        return parcours
+
+    resultats = [
+        ('dict de dict', memoire_dicts, chronometrer(parcours_dicts)),
+        ('table compressée', table.taille_octets(), chronometrer(parcours_table(table))),
+        ('table compressée + BFS', table_bfs.taille_octets(), chronometrer(parcours_table(table_bfs))),
+        ('table, symboles pré-codés', table.taille_octets(), chronometrer(parcours_table_pre_code(table))),
+    ]
+
+    print(f"AFD : {nombre_etats} états, {nombre_symboles} symboles, mot de {longueur} symboles")
+    print(f"Remplissage des tableaux d'exceptions : {table.taux_remplissage():.1%}")
+    # Mémoire des dictionnaires mesurée par tracemalloc, celle des tables par taille_octets()
+    print(f"{'représentation':<28}{'mémoire (octets)':>18}{'temps (s)':>12}{'ns/symbole':>12}")
+    for nom, memoire, duree in resultats:
+        print(f"{nom:<28}{memoire:>18}{duree:>12.4f}{duree / longueur * 1e9:>12.1f}")
+
+
+if __name__ == "__main__":
+    arguments = [int(x) for x in sys.argv[1:3]]
+    main(*arguments)
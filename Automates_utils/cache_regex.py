@@ -0,0 +1,204 @@
+# cache_regex.py - Cache des automates construits depuis une expression régulière
+#
+# La clé est (construction, forme normalisée de l'expression) : la forme
+# normalisée est l'écriture postfixe de l'arbre d'analyse, si bien que
+# "a+b", "a|b" et "a | b" partagent la même entrée. Les constructions ne
+# dépendent que de l'arbre, le résultat mis en cache est donc le même.
+#
+# Deux niveaux :
+#   - en mémoire, une LRU bornée en octets (taille du JSON des résultats) ;
+#   - sur disque (optionnel), un fichier JSON par entrée, qui survit aux
+#     redémarrages ; il n'est pas borné, le vider revient à supprimer le dossier.
+# Les résultats sont stockés sérialisés : chaque appel reçoit sa propre copie
+# et peut la modifier sans corrompre le cache. Les erreurs ne sont pas mises
+# en cache.
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from regex_parser import (analyser_regex, CHAR, EPSILON, UNION, CONCAT, STAR, PLUS, OPTION,
+                          REPETITION, INTERSECTION, COMPLEMENT, SYMBOLE_EPSILON)
+
+# À incrémenter quand une construction change de résultat : invalide le disque
+VERSION_CACHE = 3
+TAILLE_MAX_OCTETS = 64 * 1024 * 1024
+# Textes bruts dont la forme normalisée est gardée : évite de réanalyser
+# une expression soumise à l'identique
+NOMBRE_MAX_FORMES = 4096
+
+_OPERATEURS = {EPSILON: SYMBOLE_EPSILON, UNION: '|', CONCAT: '.', STAR: '*', PLUS: '+',
+               OPTION: '?', INTERSECTION: '&', COMPLEMENT: '~'}
+_RESERVES = ' |+&~.*?()[]{}\\' + SYMBOLE_EPSILON
+
+
+def forme_normalisee(regex):
+    """
+    Écriture postfixe de l'arbre de `regex` : ne dépend ni des espaces, ni
+    des parenthèses superflues, ni de l'écriture choisie pour l'union ou la
+    concaténation. ValueError si l'expression est invalide.
+    """
+    arbre = analyser_regex(regex)
+    morceaux = []
+    for i in arbre.ordre_postfixe():
+        type_ = arbre.types[i]
+        if type_ == CHAR:
+            lettre = arbre.valeurs[i]
+            morceaux.append('\\' + lettre if lettre in _RESERVES else lettre)
+        elif type_ == REPETITION:
+            minimum, maximum = arbre.valeurs[i]
+            morceaux.append(f"{{{minimum},{'' if maximum is None else maximum}}}")
+        else:
+            morceaux.append(_OPERATEURS[type_])
+    return ''.join(morceaux)
+
+
+class CacheRegex:
+    """
+    Cache LRU des constructions, borné à `taille_max` octets en mémoire,
+    doublé d'un dossier sur disque si `dossier` est donné.
+    """
+
+    def __init__(self, taille_max=TAILLE_MAX_OCTETS, dossier=None):
+        self.taille_max = taille_max
+        self.dossier = dossier
+        self._entrees = OrderedDict()  # clé -> JSON encodé
+        self._formes = OrderedDict()  # texte brut -> forme normalisée
+        self._octets = 0
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.hits_disque = 0
+        self.misses = 0
+        self.evictions = 0
+        if dossier is not None:
+            os.makedirs(dossier, exist_ok=True)
+
+    def obtenir(self, regex, construction, construire):
+        """
+        Résultat (sérialisable en JSON) de construire(regex) pour la
+        construction nommée `construction`, calculé au premier appel seulement.
+        """
+        cle = (construction, self._forme(regex))
+        with self._verrou:
+            donnees = self._entrees.get(cle)
+            if donnees is not None:
+                self._entrees.move_to_end(cle)
+                self.hits += 1
+                return json.loads(donnees)
+
+        donnees = self._lire_disque(cle)
+        if donnees is not None:
+            with self._verrou:
+                self.hits_disque += 1
+            self._memoriser(cle, donnees)
+            return json.loads(donnees)
+
+        resultat = construire(regex)
+        donnees = json.dumps(resultat, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        with self._verrou:
+            self.misses += 1
+        self._memoriser(cle, donnees)
+        self._ecrire_disque(cle, donnees)
+        return resultat
+
+    def _forme(self, regex):
+        with self._verrou:
+            forme = self._formes.get(regex)
+            if forme is not None:
+                self._formes.move_to_end(regex)
+                return forme
+        forme = forme_normalisee(regex)
+        with self._verrou:
+            self._formes[regex] = forme
+            if len(self._formes) > NOMBRE_MAX_FORMES:
+                self._formes.popitem(last=False)
+        return forme
+
+    def _memoriser(self, cle, donnees):
+        if len(donnees) > self.taille_max:
+            return
+        with self._verrou:
+            ancien = self._entrees.pop(cle, None)
+            if ancien is not None:
+                self._octets -= len(ancien)
+            self._entrees[cle] = donnees
+            self._octets += len(donnees)
+            while self._octets > self.taille_max:
+                _, retire = self._entrees.popitem(last=False)
+                self._octets -= len(retire)
+                self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Niveau disque
+    # ------------------------------------------------------------------
+
+    def _chemin(self, cle):
+        construction, forme = cle
+        empreinte = hashlib.sha256(f"{VERSION_CACHE}\0{construction}\0{forme}".encode('utf-8')).hexdigest()
+        return os.path.join(self.dossier, f"{construction}-{empreinte}.json")
+
+    def _lire_disque(self, cle):
+        if self.dossier is None:
+            return None
+        try:
+            with open(self._chemin(cle), 'rb') as fichier:
+                return fichier.read()
+        except OSError:
+            return None
+
+    def _ecrire_disque(self, cle, donnees):
+        """Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel"""
+        if self.dossier is None:
+            return
+        try:
+            descripteur, temporaire = tempfile.mkstemp(dir=self.dossier, suffix='.tmp')
+            with os.fdopen(descripteur, 'wb') as fichier:
+                fichier.write(donnees)
+            os.replace(temporaire, self._chemin(cle))
+        except OSError:
+            # Le disque n'est qu'un complément : une écriture ratée ne doit pas faire échouer la requête
+            pass
+
+    # ------------------------------------------------------------------
+
+    def vider(self):
+        """Vide le niveau mémoire et remet les compteurs à zéro (le disque est conservé)"""
+        with self._verrou:
+            self._entrees.clear()
+            self._formes.clear()
+            self._octets = 0
+            self.hits = self.hits_disque = self.misses = self.evictions = 0
+
+    def statistiques(self):
+        with self._verrou:
+            return {
+                'hits': self.hits,
+                'hits_disque': self.hits_disque,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entrees': len(self._entrees),
+                'octets': self._octets,
+                'taille_max': self.taille_max,
+                'dossier': self.dossier,
+            }
+
+
+_cache_partage = None
+_verrou_partage = threading.Lock()
+
+
+def cache_partage():
+    """
+    Cache commun du processus. Configuration par variables d'environnement :
+    AUTOMATES_CACHE_OCTETS (taille maximale en mémoire) et
+    AUTOMATES_CACHE_DOSSIER (active le niveau disque).
+    """
+    global _cache_partage
+    with _verrou_partage:
+        if _cache_partage is None:
+            _cache_partage = CacheRegex(
+                int(os.environ.get('AUTOMATES_CACHE_OCTETS', TAILLE_MAX_OCTETS)),
+                os.environ.get('AUTOMATES_CACHE_DOSSIER') or None)
+        return _cache_partage
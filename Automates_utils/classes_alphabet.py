@@ -0,0 +1,120 @@
+# classes_alphabet.py - Compression de l'alphabet en classes d'équivalence
+#
+# Deux symboles dont les colonnes de transitions sont identiques (même
+# destination depuis chaque état) sont indiscernables pour la déterminisation,
+# la minimisation, le produit ou la simulation : il suffit de traiter un
+# représentant par classe puis de recopier le résultat sur les autres membres.
+from automate_compact import AutomateCompact, TableNoms, SYMBOLES_EPSILON, _en_liste
+
+
+class _TableTraduction(dict):
+    """Table pour str.translate : un caractère inconnu devient la classe « inconnue »"""
+
+    __slots__ = ('inconnu',)
+
+    def __missing__(self, code):
+        return self.inconnu
+
+
+class ClassesAlphabet:
+    """
+    Partition de l'alphabet en classes de symboles à colonnes identiques.
+
+    Les classes sont numérotées dans l'ordre de première apparition dans
+    l'alphabet ; le représentant d'une classe est son premier membre.
+    Les symboles epsilon forment toujours leur propre classe.
+    """
+
+    __slots__ = ('classe', 'membres', 'representants', '_table')
+
+    def __init__(self, alphabet, arcs):
+        colonnes = {symbole: set() for symbole in alphabet}
+        for etat, symbole, destination in arcs:
+            colonne = colonnes.get(symbole)
+            if colonne is not None:
+                colonne.add((etat, destination))
+
+        self.classe = {}
+        self.membres = []
+        par_colonne = {}
+        for symbole, colonne in colonnes.items():
+            cle = (symbole,) if symbole in SYMBOLES_EPSILON else frozenset(colonne)
+            numero = par_colonne.get(cle)
+            if numero is None:
+                numero = par_colonne[cle] = len(self.membres)
+                self.membres.append([])
+            self.membres[numero].append(symbole)
+            self.classe[symbole] = numero
+        # Un symbole par classe, dans l'ordre des numéros de classe
+        self.representants = [membres[0] for membres in self.membres]
+        self._table = None
+
+    @classmethod
+    def depuis_automate(cls, automate):
+        """Classes d'un objet Automate (transitions imbriquées)"""
+        return cls(automate.alphabet, _arcs_imbriques(automate.transitions))
+
+    @classmethod
+    def communes(cls, *automates):
+        """Classes valables simultanément pour plusieurs automates (produit)"""
+        alphabet = []
+        for automate in automates:
+            alphabet.extend(a for a in automate.alphabet if a not in alphabet)
+        arcs = [((i, etat), symbole, destination)
+                for i, automate in enumerate(automates)
+                for etat, symbole, destination in _arcs_imbriques(automate.transitions)]
+        return cls(alphabet, arcs)
+
+    @property
+    def nombre_classes(self):
+        return len(self.membres)
+
+    def membres_de(self, symbole):
+        """Tous les symboles de la classe de `symbole`"""
+        return self.membres[self.classe[symbole]]
+
+    def taux_compression(self):
+        """Nombre de symboles par classe"""
+        return len(self.classe) / len(self.membres) if self.membres else 1.0
+
+    def table_traduction(self):
+        """
+        Table pour str.translate : chaque symbole d'un caractère devient le
+        caractère chr(numéro de classe), tout autre caractère chr(nombre_classes).
+        """
+        if self._table is None:
+            table = _TableTraduction(
+                (ord(symbole), chr(numero)) for symbole, numero in self.classe.items()
+                if isinstance(symbole, str) and len(symbole) == 1)
+            table.inconnu = chr(len(self.membres))
+            self._table = table
+        return self._table
+
+    def traduire(self, mot):
+        """Numéros de classe des symboles du mot ; nombre_classes pour un symbole inconnu"""
+        if isinstance(mot, str):
+            return [ord(c) for c in mot.translate(self.table_traduction())]
+        inconnu = len(self.membres)
+        return [self.classe.get(symbole, inconnu) for symbole in mot]
+
+    def restreindre(self, compact):
+        """
+        AutomateCompact sur les classes : le symbole numéro c est le
+        représentant de la classe c, les autres membres sont retirés.
+        """
+        alphabet = TableNoms(self.representants)
+        arcs = []
+        for q, a, cible in compact.arcs():
+            symbole = compact.alphabet[a]
+            numero = self.classe.get(symbole)
+            if numero is not None and self.membres[numero][0] == symbole:
+                arcs.append((q, numero, cible))
+        return AutomateCompact.depuis_arcs(compact.etats, alphabet,
+                                           compact.initiaux, compact.finaux, arcs)
+
+
+def _arcs_imbriques(transitions):
+    for etat, ligne in transitions.items():
+        for symbole, destinations in ligne.items():
+            for destination in _en_liste(destinations):
+                yield etat, symbole, destination
@@ -0,0 +1,322 @@
+# compteurs.py - Répétitions bornées E{m,n} sans recopie du sous-automate
+#
+# Un automate à compteurs est un automate de Thompson où chaque répétition
+# E{m,n} ne contient qu'un exemplaire de E, accompagné d'un compteur k :
+#
+#   entrée --ε [c_k := 1]--> E --ε [c_k < n : c_k += 1]--> E (boucle)
+#                            E --ε [c_k >= m : c_k := 0]--> sortie
+#
+# La simulation manipule des configurations (état, valeurs des compteurs) ;
+# le nombre d'états reste proportionnel à la taille de l'expression. La
+# recopie m..n fois n'a lieu que sur demande explicite (developper_repetitions,
+# determiniser), sous un budget de taille.
+#
+# reconnaitre_regex et afd_regex sont les points d'entrée des applications :
+# une expression avec répétition y passe par l'automate à compteurs, les
+# autres par les dérivées. Seules les constructions de Thompson et de
+# Glushkov, qui produisent un AFN explicite, développent les répétitions.
+from collections import deque
+
+import derivees
+from regex_parser import (ArbreRegex, analyser_regex, verifier_operateurs, CHAR, EPSILON,
+                          UNION, CONCAT, STAR, PLUS, OPTION, REPETITION, INTERSECTION, COMPLEMENT)
+
+# Nombre maximal de nœuds d'un arbre après développement des répétitions
+BUDGET_DEVELOPPEMENT = 10000
+# Nombre maximal d'états d'un AFD construit depuis un automate à compteurs
+BUDGET_DETERMINISATION = 10000
+
+# Actions portées par les transitions ε
+_INIT, _INCR, _SORTIE = 1, 2, 3
+
+
+class AutomateCompteurs:
+    """
+    Automate à compteurs d'une expression régulière.
+
+    arcs[q] est la liste des (symbole, destination, action, compteur) ; le
+    symbole None désigne une transition ε, l'action 0 l'absence d'action.
+    bornes[k] est le couple (m, n) de la répétition du compteur k.
+    """
+
+    __slots__ = ('arcs', 'initial', 'final', 'bornes', 'alphabet')
+
+    def __init__(self, arbre):
+        verifier_operateurs(arbre, "l'automate à compteurs")
+        self.arcs = []
+        self.bornes = []
+        alphabet = set()
+        fragments = {}  # nœud -> (état d'entrée, état de sortie)
+
+        for i in arbre.ordre_postfixe():
+            type_ = arbre.types[i]
+            if type_ in (CHAR, EPSILON):
+                entree, sortie = self._etat(), self._etat()
+                symbole = arbre.valeurs[i] if type_ == CHAR else None
+                if symbole is not None:
+                    alphabet.add(symbole)
+                self._arc(entree, symbole, sortie)
+            elif type_ in (CONCAT, UNION):
+                entree_g, sortie_g = fragments.pop(arbre.gauches[i])
+                entree_d, sortie_d = fragments.pop(arbre.droits[i])
+                if type_ == CONCAT:
+                    self._arc(sortie_g, None, entree_d)
+                    entree, sortie = entree_g, sortie_d
+                else:
+                    entree, sortie = self._etat(), self._etat()
+                    for e, s in ((entree_g, sortie_g), (entree_d, sortie_d)):
+                        self._arc(entree, None, e)
+                        self._arc(s, None, sortie)
+            else:
+                corps_entree, corps_sortie = fragments.pop(arbre.gauches[i])
+                entree, sortie = self._etat(), self._etat()
+                if type_ == REPETITION:
+                    minimum, maximum = arbre.valeurs[i]
+                    k = len(self.bornes)
+                    self.bornes.append((minimum, maximum))
+                    if maximum != 0:
+                        self._arc(entree, None, corps_entree, _INIT, k)
+                        self._arc(corps_sortie, None, corps_entree, _INCR, k)
+                        self._arc(corps_sortie, None, sortie, _SORTIE, k)
+                    if minimum == 0:
+                        self._arc(entree, None, sortie)
+                else:
+                    self._arc(entree, None, corps_entree)
+                    self._arc(corps_sortie, None, sortie)
+                    if type_ in (STAR, PLUS):
+                        self._arc(corps_sortie, None, corps_entree)
+                    if type_ in (STAR, OPTION):
+                        self._arc(entree, None, sortie)
+            fragments[i] = (entree, sortie)
+
+        self.initial, self.final = fragments.pop(arbre.racine)
+        self.alphabet = sorted(alphabet)
+
+    @classmethod
+    def depuis_regex(cls, regex):
+        return cls(analyser_regex(regex))
+
+    def _etat(self):
+        self.arcs.append([])
+        return len(self.arcs) - 1
+
+    def _arc(self, source, symbole, destination, action=0, compteur=-1):
+        self.arcs[source].append((symbole, destination, action, compteur))
+
+    @property
+    def nombre_etats(self):
+        return len(self.arcs)
+
+    def _cloture(self, configurations):
+        """Fermeture ε d'un ensemble de configurations (état, compteurs)"""
+        resultat = set(configurations)
+        pile = list(resultat)
+        while pile:
+            etat, compteurs = pile.pop()
+            for symbole, destination, action, k in self.arcs[etat]:
+                if symbole is not None:
+                    continue
+                if action:
+                    minimum, maximum = self.bornes[k]
+                    valeur = compteurs[k]
+                    if action == _INIT:
+                        valeur = 1
+                    elif action == _INCR:
+                        if maximum is None:
+                            # Au-delà de m, la valeur exacte n'importe plus
+                            valeur = min(valeur + 1, max(minimum, 1))
+                        elif valeur < maximum:
+                            valeur += 1
+                        else:
+                            continue
+                    elif valeur >= minimum:
+                        valeur = 0
+                    else:
+                        continue
+                    compteurs_suivants = compteurs[:k] + (valeur,) + compteurs[k + 1:]
+                else:
+                    compteurs_suivants = compteurs
+                configuration = (destination, compteurs_suivants)
+                if configuration not in resultat:
+                    resultat.add(configuration)
+                    pile.append(configuration)
+        return resultat
+
+    def _initiales(self):
+        return self._cloture([(self.initial, (0,) * len(self.bornes))])
+
+    def _lire(self, configurations, lettre):
+        return self._cloture([(destination, compteurs)
+                              for etat, compteurs in configurations
+                              for symbole, destination, _, _ in self.arcs[etat]
+                              if symbole == lettre])
+
+    def _acceptante(self, configurations):
+        return any(etat == self.final for etat, _ in configurations)
+
+    def accepte(self, mot):
+        """Reconnaissance d'un mot par simulation des configurations"""
+        configurations = self._initiales()
+        for lettre in mot:
+            configurations = self._lire(configurations, lettre)
+            if not configurations:
+                return False
+        return self._acceptante(configurations)
+
+    def determiniser(self, budget=BUDGET_DETERMINISATION):
+        """
+        AFD (format dictionnaire de l'interface) dont les états sont les
+        ensembles de configurations accessibles. ValueError au-delà de
+        `budget` états.
+        """
+        # Seules les configurations qui lisent une lettre ou acceptent distinguent deux états
+        significatifs = [q == self.final or any(symbole is not None for symbole, _, _, _ in arcs)
+                         for q, arcs in enumerate(self.arcs)]
+
+        def reduire(configurations):
+            return frozenset(c for c in configurations if significatifs[c[0]])
+
+        initial = reduire(self._initiales())
+        numeros = {initial: 0}
+        file = deque([initial])
+        transitions = {}
+        finaux = []
+        while file:
+            courant = file.popleft()
+            q = numeros[courant]
+            if self._acceptante(courant):
+                finaux.append(str(q))
+            for lettre in self.alphabet:
+                suivant = reduire(self._lire(courant, lettre))
+                if not suivant:
+                    continue
+                if suivant not in numeros:
+                    if len(numeros) >= budget:
+                        raise ValueError(f"L'AFD dépasse le budget de {budget} états")
+                    numeros[suivant] = len(numeros)
+                    file.append(suivant)
+                transitions[f"{q},{lettre}"] = [str(numeros[suivant])]
+        return {
+            'alphabet': list(self.alphabet),
+            'etats': [str(q) for q in range(len(numeros))],
+            'etats_initiaux': ['0'],
+            'etats_finaux': finaux,
+            'transitions': transitions
+        }
+
+
+def avec_compteurs(arbre):
+    """
+    Vrai si l'arbre a une répétition et que l'automate à compteurs le couvre
+    (ni intersection ni complément)
+    """
+    types = set(arbre.types)
+    return REPETITION in types and not types & {INTERSECTION, COMPLEMENT}
+
+
+def reconnaitre_regex(regex, mot):
+    """
+    Appartenance de `mot` au langage de `regex`, sans développer les
+    répétitions : simulation de l'automate à compteurs s'il y en a une,
+    dérivées sinon. ValueError si l'expression est invalide.
+    """
+    arbre = analyser_regex(regex)
+    if avec_compteurs(arbre):
+        return AutomateCompteurs(arbre).accepte(mot)
+    return derivees.accepte(regex, mot)
+
+
+def afd_regex(regex, budget=BUDGET_DETERMINISATION, alphabet_supplementaire=()):
+    """
+    AFD (format dictionnaire de l'interface) de `regex` : déterminisation de
+    l'automate à compteurs s'il y a une répétition, dérivées de Brzozowski
+    sinon. ValueError si l'expression est invalide ou si l'AFD dépasse
+    `budget` états.
+    """
+    arbre = analyser_regex(regex)
+    if not avec_compteurs(arbre):
+        return derivees.automate_brzozowski(regex, budget, alphabet_supplementaire)
+    afd = AutomateCompteurs(arbre).determiniser(budget)
+    # Lettres sans transition, utiles à un complément ultérieur
+    afd['alphabet'] = sorted(set(afd['alphabet']).union(alphabet_supplementaire))
+    return afd
+
+
+def developper_repetitions(arbre, budget=BUDGET_DEVELOPPEMENT):
+    """
+    Arbre sans nœud REPETITION : E{m,n} devient E...E(E(E)?)? et E{m,} devient
+    E...EE*. Retourne `arbre` lui-même s'il n'a pas de répétition ; ValueError
+    si l'arbre développé dépasserait `budget` nœuds.
+    """
+    if REPETITION not in arbre.types:
+        return arbre
+
+    ordre = arbre.ordre_postfixe()
+    tailles = {}
+    for i in ordre:
+        type_ = arbre.types[i]
+        taille = 1 + sum(tailles[e] for e in (arbre.gauches[i], arbre.droits[i]) if e >= 0)
+        if type_ == REPETITION:
+            minimum, maximum = arbre.valeurs[i]
+            copies = maximum if maximum is not None else minimum + 1
+            # copies du corps + concaténations et options/étoile qui les relient
+            taille = copies * (tailles[arbre.gauches[i]] + 2)
+        tailles[i] = taille
+    if tailles[arbre.racine] > budget:
+        raise ValueError(f"Développement des répétitions trop grand ({tailles[arbre.racine]} nœuds, "
+                         f"budget {budget}) : seuls les AFN de Thompson et de Glushkov recopient "
+                         f"E{{m,n}} ; l'AFD et la reconnaissance d'un mot passent par l'automate "
+                         f"à compteurs, sans recopie")
+
+    resultat = ArbreRegex(arbre.source)
+    nouveaux = {}
+    for i in ordre:
+        type_ = arbre.types[i]
+        debut, fin = arbre.debuts[i], arbre.fins[i]
+        gauche = nouveaux.get(arbre.gauches[i], -1)
+        droit = nouveaux.get(arbre.droits[i], -1)
+        if type_ != REPETITION:
+            nouveaux[i] = resultat.ajouter(type_, arbre.valeurs[i], gauche, droit, debut, fin)
+            continue
+
+        minimum, maximum = arbre.valeurs[i]
+        copies = [gauche]
+
+        def corps():
+            # Le premier usage reprend le sous-arbre déjà construit, les autres le recopient
+            return copies.pop() if copies else _copier(resultat, gauche)
+
+        # Partie optionnelle construite de l'intérieur vers l'extérieur
+        if maximum is None:
+            queue = resultat.ajouter(STAR, None, corps(), -1, debut, fin)
+        else:
+            queue = -1
+            for _ in range(maximum - minimum):
+                contenu = corps() if queue < 0 else \
+                    resultat.ajouter(CONCAT, None, corps(), queue, debut, fin)
+                queue = resultat.ajouter(OPTION, None, contenu, -1, debut, fin)
+        for _ in range(minimum):
+            queue = corps() if queue < 0 else resultat.ajouter(CONCAT, None, corps(), queue, debut, fin)
+        if queue < 0:
+            queue = resultat.ajouter(EPSILON, None, -1, -1, debut, fin)
+        nouveaux[i] = queue
+
+    resultat.racine = nouveaux[arbre.racine]
+    return resultat
+
+
+def _copier(arbre, racine):
+    """Recopie dans `arbre` le sous-arbre de `racine` ; retourne la nouvelle racine"""
+    noeuds = []
+    pile = [racine]
+    while pile:
+        i = pile.pop()
+        noeuds.append(i)
+        pile.extend(e for e in (arbre.gauches[i], arbre.droits[i]) if e >= 0)
+    nouveaux = {}
+    # Les enfants ont des numéros plus petits que leurs parents
+    for i in sorted(noeuds):
+        nouveaux[i] = arbre.ajouter(arbre.types[i], arbre.valeurs[i],
+                                    nouveaux.get(arbre.gauches[i], -1), nouveaux.get(arbre.droits[i], -1),
+                                    arbre.debuts[i], arbre.fins[i])
+    return nouveaux[racine]
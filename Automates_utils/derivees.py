@@ -0,0 +1,286 @@
+# derivees.py - Dérivées de Brzozowski et dérivées partielles d'Antimirov
+#
+# La dérivée d'un langage L par une lettre a est a⁻¹L = {w | aw ∈ L}.
+#   - Brzozowski : a⁻¹E est un terme ; les dérivées successives d'un terme
+#     normalisé (termes_regex) sont en nombre fini et forment directement un AFD.
+#   - Antimirov : a⁻¹E est un ensemble de termes (dérivées partielles) dont
+#     l'union vaut la dérivée ; leurs itérées forment un AFN d'au plus
+#     (nombre de lettres de E) + 1 états.
+# Chaque dérivée est mémorisée sur le terme, par lettre. Les calculs se font
+# avec une pile explicite : pas de limite de récursion sur les termes profonds.
+#
+# L'intersection et le complément se dérivent composante par composante
+# (a⁻¹(E&F) = a⁻¹E & a⁻¹F, a⁻¹~E = ~a⁻¹E) : aucun sous-automate n'est
+# déterminisé ni complété. Les automates construits ont pour alphabet les
+# lettres de l'expression, plus celles fournies par l'appelant : c'est sur
+# cet alphabet que le complément est pris (accepte() n'a pas cette limite).
+import itertools
+from collections import deque
+
+from termes_regex import (depuis_regex, alphabet, sous_termes, vide, mot_vide, concat, union, intersection,
+                          complement, repetition, VIDE, MOT_VIDE, SYMBOLE, T_CONCAT, T_UNION,
+                          T_ETOILE, T_REPETITION, T_INTER, T_COMPL)
+
+# Nombre maximal d'états des automates construits par dérivation
+BUDGET_ETATS = 10000
+
+
+def _terme(expression):
+    """Terme d'une expression donnée sous forme de texte ou déjà analysée"""
+    return depuis_regex(expression) if isinstance(expression, str) else expression
+
+
+def _reste(terme):
+    """Ce qui suit une itération du corps de E* ou de E{m,n}"""
+    if terme.type == T_ETOILE:
+        return terme
+    minimum, maximum = terme.valeur
+    return repetition(terme.enfants[0], max(minimum - 1, 0), None if maximum is None else maximum - 1)
+
+
+def _prerequis(terme):
+    """Sous-termes dont la dérivée est nécessaire pour dériver `terme`"""
+    if terme.type == T_CONCAT:
+        gauche, droite = terme.enfants
+        return (gauche, droite) if gauche.nullable else (gauche,)
+    if terme.type in (T_UNION, T_INTER, T_COMPL, T_ETOILE, T_REPETITION):
+        return terme.enfants
+    return ()
+
+
+def _calculer(terme, lettre, memo, combiner):
+    """Évaluation ascendante itérative de combiner(t, lettre) ; résultats dans t.<memo>"""
+    resultat = getattr(terme, memo).get(lettre)
+    if resultat is not None:
+        return resultat
+    pile = [(terme, False)]
+    while pile:
+        courant, prets = pile.pop()
+        table = getattr(courant, memo)
+        if lettre in table:
+            continue
+        if not prets:
+            manquants = [e for e in _prerequis(courant) if lettre not in getattr(e, memo)]
+            if manquants:
+                pile.append((courant, True))
+                pile.extend((e, False) for e in manquants)
+                continue
+        table[lettre] = combiner(courant, lettre)
+    return getattr(terme, memo)[lettre]
+
+
+# ----------------------------------------------------------------------
+# Brzozowski
+# ----------------------------------------------------------------------
+
+def _derivee(terme, lettre):
+    type_ = terme.type
+    if type_ == SYMBOLE:
+        return mot_vide() if terme.valeur == lettre else vide()
+    if type_ in (VIDE, MOT_VIDE):
+        return vide()
+    if type_ == T_UNION:
+        return union(*(e.derivees[lettre] for e in terme.enfants))
+    if type_ == T_INTER:
+        return intersection(*(e.derivees[lettre] for e in terme.enfants))
+    if type_ == T_COMPL:
+        return complement(terme.enfants[0].derivees[lettre])
+    if type_ == T_CONCAT:
+        gauche, droite = terme.enfants
+        resultat = concat(gauche.derivees[lettre], droite)
+        if gauche.nullable:
+            resultat = union(resultat, droite.derivees[lettre])
+        return resultat
+    # E* et E{m,n} : une itération commencée, puis le reste
+    return concat(terme.enfants[0].derivees[lettre], _reste(terme))
+
+
+def deriver(expression, lettre):
+    """Dérivée de Brzozowski (un terme)"""
+    return _calculer(_terme(expression), lettre, 'derivees', _derivee)
+
+
+def deriver_mot(expression, mot):
+    terme = _terme(expression)
+    for lettre in mot:
+        terme = deriver(terme, lettre)
+        if terme.type == VIDE:
+            break
+    return terme
+
+
+def accepte(expression, mot):
+    """Appartenance de `mot` au langage de l'expression, sans construire d'automate"""
+    return deriver_mot(expression, mot).nullable
+
+
+# ----------------------------------------------------------------------
+# Antimirov
+# ----------------------------------------------------------------------
+
+def _derivees_partielles(terme, lettre):
+    type_ = terme.type
+    if type_ == SYMBOLE:
+        return frozenset((mot_vide(),)) if terme.valeur == lettre else frozenset()
+    if type_ in (VIDE, MOT_VIDE):
+        return frozenset()
+    if type_ == T_UNION:
+        return frozenset().union(*(e.partielles[lettre] for e in terme.enfants))
+    if type_ == T_INTER:
+        # Une dérivée partielle par choix d'une dérivée partielle de chaque membre
+        combinaisons = (intersection(*choix) for choix in
+                        itertools.product(*(e.partielles[lettre] for e in terme.enfants)))
+        return frozenset(t for t in combinaisons if t.type != VIDE)
+    if type_ == T_COMPL:
+        # Le complément ne se distribue pas : on complète l'union des dérivées partielles
+        return frozenset((complement(union(*terme.enfants[0].partielles[lettre])),))
+    if type_ == T_CONCAT:
+        gauche, droite = terme.enfants
+        resultat = {concat(p, droite) for p in gauche.partielles[lettre]}
+        if gauche.nullable:
+            resultat.update(droite.partielles[lettre])
+        return frozenset(resultat)
+    reste = _reste(terme)
+    return frozenset(concat(p, reste) for p in terme.enfants[0].partielles[lettre])
+
+
+def derivees_partielles(expression, lettre):
+    """Dérivées partielles d'Antimirov (ensemble de termes)"""
+    return _calculer(_terme(expression), lettre, 'partielles', _derivees_partielles)
+
+
+# ----------------------------------------------------------------------
+# Automates
+# ----------------------------------------------------------------------
+
+def _explorer(initial, successeurs, budget, lettres_supplementaires):
+    """
+    Parcours en largeur des termes accessibles. successeurs(terme, lettre)
+    retourne les termes atteints ; retourne le dictionnaire de l'automate.
+    """
+    lettres = sorted(set(alphabet(initial)).union(lettres_supplementaires))
+    numeros = {initial: 0}
+    file = deque([initial])
+    transitions = {}
+    finaux = []
+    while file:
+        terme = file.popleft()
+        q = numeros[terme]
+        if terme.nullable:
+            finaux.append(str(q))
+        for lettre in lettres:
+            destinations = []
+            for suivant in successeurs(terme, lettre):
+                numero = numeros.get(suivant)
+                if numero is None:
+                    if len(numeros) >= budget:
+                        raise ValueError(f"L'automate dépasse le budget de {budget} états")
+                    numero = numeros[suivant] = len(numeros)
+                    file.append(suivant)
+                destinations.append(numero)
+            if destinations:
+                transitions[f"{q},{lettre}"] = [str(d) for d in sorted(destinations)]
+    return {
+        'alphabet': lettres,
+        'etats': [str(q) for q in range(len(numeros))],
+        'etats_initiaux': ['0'],
+        'etats_finaux': finaux,
+        'transitions': transitions
+    }
+
+
+def automate_brzozowski(expression, budget=BUDGET_ETATS, alphabet_supplementaire=()):
+    """AFD (partiel : pas d'état puits) des dérivées de Brzozowski"""
+    def successeurs(terme, lettre):
+        suivant = deriver(terme, lettre)
+        return () if suivant.type == VIDE else (suivant,)
+    return _explorer(_terme(expression), successeurs, budget, alphabet_supplementaire)
+
+
+def automate_antimirov(expression, budget=BUDGET_ETATS, alphabet_supplementaire=()):
+    """AFN des dérivées partielles d'Antimirov"""
+    return _explorer(_terme(expression), derivees_partielles, budget, alphabet_supplementaire)
+
+
+# ----------------------------------------------------------------------
+# Équivalence et inclusion
+# ----------------------------------------------------------------------
+
+def _lettres_comparaison(*termes):
+    """
+    Lettres des termes ; avec un complément, une lettre absente de toutes les
+    expressions peut distinguer les langages : on en ajoute une représentante.
+    """
+    lettres = set()
+    avec_complement = False
+    for terme in termes:
+        for t in sous_termes(terme):
+            if t.type == SYMBOLE:
+                lettres.add(t.valeur)
+            elif t.type == T_COMPL:
+                avec_complement = True
+    if avec_complement:
+        lettres.add(next(c for c in itertools.chain('#@$%', map(chr, itertools.count(0x2460)))
+                         if c not in lettres))
+    return sorted(lettres)
+
+
+def contre_exemple_equivalence(expression1, expression2, budget=BUDGET_ETATS):
+    """
+    Mot appartenant à un seul des deux langages, ou None s'ils sont égaux.
+
+    Algorithme de Hopcroft et Karp sur les paires de dérivées : les paires
+    déjà fusionnées (union-find) ne sont pas réexplorées, et le parcours
+    s'arrête à la première paire dont un seul terme est nullable.
+    """
+    premier, second = _terme(expression1), _terme(expression2)
+    lettres = _lettres_comparaison(premier, second)
+    parents = {}
+
+    def representant(terme):
+        racine = terme
+        while parents.get(racine, racine) is not racine:
+            racine = parents[racine]
+        while terme is not racine:
+            parents[terme], terme = racine, parents[terme]
+        return racine
+
+    parents[premier] = representant(second)
+    file = deque([(premier, second, None)])  # chemin : (lettre, chemin précédent)
+    paires = 0
+    while file:
+        gauche, droite, chemin = file.popleft()
+        if gauche.nullable != droite.nullable:
+            mot = []
+            while chemin is not None:
+                lettre, chemin = chemin
+                mot.append(lettre)
+            return ''.join(reversed(mot))
+        for lettre in lettres:
+            suivant_g, suivant_d = deriver(gauche, lettre), deriver(droite, lettre)
+            racine_g, racine_d = representant(suivant_g), representant(suivant_d)
+            if racine_g is not racine_d:
+                paires += 1
+                if paires > budget:
+                    raise ValueError(f"Comparaison interrompue après {budget} paires de dérivées")
+                parents[racine_g] = racine_d
+                file.append((suivant_g, suivant_d, (lettre, chemin)))
+    return None
+
+
+def contre_exemple_inclusion(expression1, expression2, budget=BUDGET_ETATS):
+    """
+    Mot de L1 absent de L2, ou None si L1 ⊆ L2 : L1 ⊆ L2 équivaut à
+    L1 ∪ L2 = L2, et un mot qui distingue ces deux langages est dans L1 \\ L2.
+    """
+    second = _terme(expression2)
+    return contre_exemple_equivalence(union(_terme(expression1), second), second, budget)
+
+
+def equivalentes(expression1, expression2):
+    return contre_exemple_equivalence(expression1, expression2) is None
+
+
+def incluse(expression1, expression2):
+    """L(expression1) ⊆ L(expression2)"""
+    return contre_exemple_inclusion(expression1, expression2) is None
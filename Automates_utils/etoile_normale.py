@@ -0,0 +1,77 @@
+# etoile_normale.py - Forme normale étoile (Brüggemann-Klein) d'un ArbreRegex
+#
+# Dans E*, seules comptent les transitions Last(E) -> First(E) ; les étoiles
+# et les ε imbriqués sous une étoile ne font qu'ajouter des unions redondantes
+# dans les ensembles de successeurs de Glushkov. La réécriture E• les retire
+# sans changer l'automate des positions (mêmes positions, mêmes successeurs) :
+#
+#   a• = a        (F+G)• = F• + G•        (FG)• = F•G•        (F*)• = (F°)*
+#   a° = a        (F+G)° = F° + G°        (F*)° = F°
+#   ε° = ∅        (FG)°  = F° + G° si F et G sont nullables, F•G• sinon
+#   (F?)• = F•?   (F?)° = F°
+from regex_parser import ArbreRegex, CHAR, EPSILON, UNION, CONCAT, STAR, PLUS, OPTION
+
+AUCUN = -1  # langage vide ∅
+
+
+def forme_normale_etoile(arbre):
+    """
+    Retourne E• pour l'ArbreRegex `arbre` (non modifié), sous forme d'un
+    nouvel ArbreRegex. Un seul parcours ascendant : chaque nœud produit ses
+    deux formes (•, °), partagées dans le nouvel arbre quand elles coïncident.
+    """
+    resultat = ArbreRegex(arbre.source)
+
+    def union(gauche, droite, debut, fin):
+        if gauche == AUCUN:
+            return droite
+        if droite == AUCUN:
+            return gauche
+        return resultat.ajouter(UNION, None, gauche, droite, debut, fin)
+
+    def etoile(corps, debut, fin):
+        # ∅* et ε* valent ε
+        if corps == AUCUN or resultat.types[corps] == EPSILON:
+            return resultat.ajouter(EPSILON, None, AUCUN, AUCUN, debut, fin)
+        return resultat.ajouter(STAR, None, corps, AUCUN, debut, fin)
+
+    formes = {}  # nœud -> (point, rond, nullable)
+    for i in arbre.ordre_postfixe():
+        type_ = arbre.types[i]
+        debut, fin = arbre.debuts[i], arbre.fins[i]
+
+        if type_ == CHAR:
+            feuille = resultat.ajouter(CHAR, arbre.valeurs[i], AUCUN, AUCUN, debut, fin)
+            formes[i] = (feuille, feuille, False)
+        elif type_ == EPSILON:
+            formes[i] = (resultat.ajouter(EPSILON, None, AUCUN, AUCUN, debut, fin), AUCUN, True)
+        elif type_ in (CONCAT, UNION):
+            point_g, rond_g, null_g = formes.pop(arbre.gauches[i])
+            point_d, rond_d, null_d = formes.pop(arbre.droits[i])
+            if type_ == UNION:
+                formes[i] = (union(point_g, point_d, debut, fin),
+                             union(rond_g, rond_d, debut, fin), null_g or null_d)
+            else:
+                point = resultat.ajouter(CONCAT, None, point_g, point_d, debut, fin)
+                rond = union(rond_g, rond_d, debut, fin) if null_g and null_d else point
+                formes[i] = (point, rond, null_g and null_d)
+        elif type_ == STAR:
+            _, rond, _ = formes.pop(arbre.gauches[i])
+            formes[i] = (etoile(rond, debut, fin), rond, True)
+        elif type_ == PLUS:
+            # F+ = F F* : si F est nullable, F+ = F* ; sinon F° = F•
+            _, rond, nullable = formes.pop(arbre.gauches[i])
+            if nullable:
+                formes[i] = (etoile(rond, debut, fin), rond, True)
+            else:
+                formes[i] = (resultat.ajouter(PLUS, None, rond, AUCUN, debut, fin), rond, False)
+        elif type_ == OPTION:
+            point, rond, nullable = formes.pop(arbre.gauches[i])
+            if not nullable:
+                point = resultat.ajouter(OPTION, None, point, AUCUN, debut, fin)
+            formes[i] = (point, rond, True)
+        else:
+            raise ValueError(f"Nœud inconnu: {type_}")
+
+    resultat.racine = formes[arbre.racine][0] if arbre.racine >= 0 else AUCUN
+    return resultat
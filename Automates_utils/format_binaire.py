@@ -0,0 +1,353 @@
+# format_binaire.py - Format binaire versionné des automates compilés
+#
+# Le fichier se charge par mmap sans analyse ni copie : les tableaux CSR sont
+# directement vus par numpy.frombuffer (ou memoryview.cast si NumPy est
+# absent), et plusieurs processus qui ouvrent le même fichier partagent les
+# mêmes pages mémoire.
+#
+# Disposition (entiers little-endian) :
+#   en-tête (64 octets)  magic 'AFDB', version, drapeaux, tailles, décalages
+#   table des symboles   nombre, décalages[nombre + 1], noms UTF-8
+#   table des états      idem
+#   tableaux int32       debuts[n_etats + 1], symboles[n_t], cibles[n_t],
+#                        initiaux[n_i], finaux[n_f]
+# Chaque section commence sur un multiple de 8 octets.
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from array import array
+
+from automate_compact import AutomateCompact, TableNoms, SYMBOLES_EPSILON
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b'AFDB'
+VERSION = 1
+EXTENSION = 'afb'
+# Projections gardées ouvertes par charger() (chacune tient un descripteur)
+NOMBRE_MAX_PROJECTIONS = 32
+
+DRAPEAU_DETERMINISTE = 1
+DRAPEAU_ETATS_ENTIERS = 2
+
+_ENTETE = struct.Struct('<4sHHIIIIIQQQ')
+TAILLE_ENTETE = 64
+
+
+def _aligner(taille, multiple=8):
+    return (taille + multiple - 1) // multiple * multiple
+
+
+def _octets_int32(valeurs):
+    tableau = array('i', valeurs)
+    if sys.byteorder == 'big':
+        tableau.byteswap()
+    return tableau.tobytes()
+
+
+def _encoder_table(noms):
+    """Table de noms : nombre, décalages cumulés puis noms UTF-8 concaténés"""
+    encodes = [str(nom).encode('utf-8') for nom in noms]
+    decalages = [0]
+    for nom in encodes:
+        decalages.append(decalages[-1] + len(nom))
+    contenu = struct.pack('<I', len(encodes)) + _octets_int32(decalages) + b''.join(encodes)
+    return contenu + b'\0' * (_aligner(len(contenu)) - len(contenu))
+
+
+def encoder(compact):
+    """Sérialise un AutomateCompact ; retourne les octets du fichier"""
+    drapeaux = 0
+    if compact.est_deterministe():
+        drapeaux |= DRAPEAU_DETERMINISTE
+    if compact.etats.noms and all(isinstance(nom, int) for nom in compact.etats.noms):
+        drapeaux |= DRAPEAU_ETATS_ENTIERS
+
+    table_symboles = _encoder_table(compact.alphabet.noms)
+    table_etats = _encoder_table(compact.etats.noms)
+    tableaux = b''.join(_octets_int32(t) for t in (
+        compact.debuts, compact.symboles, compact.cibles, compact.initiaux, compact.finaux))
+
+    decalage_symboles = TAILLE_ENTETE
+    decalage_etats = decalage_symboles + len(table_symboles)
+    decalage_tableaux = decalage_etats + len(table_etats)
+
+    entete = _ENTETE.pack(
+        MAGIC, VERSION, drapeaux,
+        compact.nombre_etats, len(compact.alphabet), compact.nombre_transitions,
+        len(compact.initiaux), len(compact.finaux),
+        decalage_symboles, decalage_etats, decalage_tableaux)
+    entete += b'\0' * (TAILLE_ENTETE - len(entete))
+    return entete + table_symboles + table_etats + tableaux
+
+
+def ecrire(compact, chemin):
+    """Écrit l'automate compilé dans un fichier"""
+    with open(chemin, 'wb') as fichier:
+        fichier.write(encoder(compact))
+
+
+class _TableNomsBinaire:
+    """Table de noms lue à la demande dans le tampon, sans tout décoder"""
+
+    __slots__ = ('_tampon', '_decalages', '_debut', '_entiers', '_numeros')
+
+    def __init__(self, tampon, position, entiers=False):
+        if position < TAILLE_ENTETE or position + 4 > len(tampon):
+            raise ValueError("Table de noms hors du fichier")
+        (nombre,) = struct.unpack_from('<I', tampon, position)
+        self._decalages = _vue_int32(tampon, position + 4, nombre + 1)
+        self._debut = position + 4 + 4 * (nombre + 1)
+        if (int(self._decalages[0]) != 0 or not _croissant(self._decalages)
+                or self._debut + int(self._decalages[nombre]) > len(tampon)):
+            raise ValueError("Table de noms corrompue")
+        self._tampon = tampon
+        self._entiers = entiers
+        self._numeros = None
+
+    def __len__(self):
+        return len(self._decalages) - 1
+
+    def __getitem__(self, numero):
+        debut = self._debut + int(self._decalages[numero])
+        fin = self._debut + int(self._decalages[numero + 1])
+        nom = bytes(self._tampon[debut:fin]).decode('utf-8')
+        return int(nom) if self._entiers else nom
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def get(self, nom, defaut=None):
+        if self._numeros is None:
+            self._numeros = {n: i for i, n in enumerate(self)}
+        return self._numeros.get(nom, defaut)
+
+
+def _vue_int32(tampon, position, nombre):
+    """
+    Vue sans copie sur `nombre` entiers int32 à partir de `position` ;
+    ValueError si elle dépasse du tampon
+    """
+    if position < 0 or position + 4 * nombre > len(tampon):
+        raise ValueError("Fichier tronqué")
+    if np is not None:
+        return np.frombuffer(tampon, dtype='<i4', count=nombre, offset=position)
+    vue = memoryview(tampon)[position:position + 4 * nombre].cast('i')
+    if sys.byteorder == 'big':
+        # Seul cas où une copie est nécessaire
+        copie = array('i', vue.tobytes())
+        copie.byteswap()
+        return copie
+    return vue
+
+
+def _dans(vue, borne):
+    """Toutes les valeurs de la vue sont dans [0, borne)"""
+    if len(vue) == 0:
+        return True
+    if np is not None and isinstance(vue, np.ndarray):
+        return bool(vue.min() >= 0 and vue.max() < borne)
+    return min(vue) >= 0 and max(vue) < borne
+
+
+def _croissant(vue):
+    if np is not None and isinstance(vue, np.ndarray):
+        return bool(np.all(vue[1:] >= vue[:-1]))
+    return all(a <= b for a, b in zip(vue, vue[1:]))
+
+
+class AutomateBinaire:
+    """
+    Automate compilé projeté en mémoire.
+
+    Les tableaux CSR (debuts, symboles, cibles, initiaux, finaux) ont la même
+    signification que dans AutomateCompact mais sont des vues en lecture seule
+    sur le fichier. Les noms ne sont décodés qu'à la demande. Les décalages
+    et les numéros sont vérifiés à l'ouverture : un fichier corrompu lève
+    ValueError, jamais une erreur plus loin dans un parcours.
+    """
+
+    __slots__ = ('chemin', 'version', 'drapeaux', '_fichier', '_tampon',
+                 'alphabet', 'etats', 'debuts', 'symboles', 'cibles', 'initiaux', 'finaux')
+
+    def __init__(self, tampon, chemin=None, fichier=None):
+        self.chemin = chemin
+        self._fichier = fichier
+        self._tampon = tampon
+
+        if len(tampon) < TAILLE_ENTETE:
+            raise ValueError("Fichier trop court pour un automate compilé")
+        (magic, version, drapeaux, n_etats, n_symboles, n_transitions, n_initiaux, n_finaux,
+         decalage_symboles, decalage_etats, decalage_tableaux) = _ENTETE.unpack_from(tampon, 0)
+        if magic != MAGIC:
+            raise ValueError("Ce fichier n'est pas un automate compilé (signature invalide)")
+        if version > VERSION:
+            raise ValueError(f"Version de format non supportée: {version} (maximum {VERSION})")
+
+        self.version = version
+        self.drapeaux = drapeaux
+        self.alphabet = _TableNomsBinaire(tampon, decalage_symboles)
+        self.etats = _TableNomsBinaire(tampon, decalage_etats, bool(drapeaux & DRAPEAU_ETATS_ENTIERS))
+        if len(self.alphabet) != n_symboles or len(self.etats) != n_etats:
+            raise ValueError("Tables de noms incohérentes avec l'en-tête")
+
+        position = decalage_tableaux
+        if position < TAILLE_ENTETE:
+            raise ValueError("Tableaux hors du fichier")
+        tailles = (n_etats + 1, n_transitions, n_transitions, n_initiaux, n_finaux)
+        vues = []
+        for taille in tailles:
+            vues.append(_vue_int32(tampon, position, taille))
+            position += 4 * taille
+        self.debuts, self.symboles, self.cibles, self.initiaux, self.finaux = vues
+
+        # Un parcours lit debuts[q]..debuts[q + 1] puis symboles, cibles
+        if (int(self.debuts[0]) != 0 or int(self.debuts[n_etats]) != n_transitions
+                or not _croissant(self.debuts)):
+            raise ValueError("Tableau des débuts de transitions corrompu")
+        if not _dans(self.symboles, n_symboles):
+            raise ValueError("Symbole de transition hors de l'alphabet")
+        if not (_dans(self.cibles, n_etats) and _dans(self.initiaux, n_etats) and _dans(self.finaux, n_etats)):
+            raise ValueError("Numéro d'état hors de la table des états")
+
+    @classmethod
+    def ouvrir(cls, chemin):
+        """Projette le fichier en mémoire (lecture seule)"""
+        fichier = open(chemin, 'rb')
+        try:
+            tampon = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Fichier vide : mmap refuse une longueur nulle
+            fichier.close()
+            raise ValueError("Fichier vide")
+        return cls(tampon, chemin=chemin, fichier=fichier)
+
+    def fermer(self):
+        """Libère la projection ; les vues sur les tableaux deviennent invalides"""
+        # Les vues doivent disparaître avant la fermeture de la projection
+        for nom in ('alphabet', 'etats', 'debuts', 'symboles', 'cibles', 'initiaux', 'finaux'):
+            setattr(self, nom, None)
+        if isinstance(self._tampon, mmap.mmap):
+            try:
+                self._tampon.close()
+            except BufferError:
+                # Une vue est encore tenue ailleurs : la projection sera
+                # libérée avec elle
+                pass
+        if self._fichier is not None:
+            self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    @property
+    def nombre_etats(self):
+        return len(self.debuts) - 1
+
+    @property
+    def nombre_transitions(self):
+        return len(self.cibles)
+
+    @property
+    def est_deterministe(self):
+        return bool(self.drapeaux & DRAPEAU_DETERMINISTE)
+
+    def destinations(self, q, a):
+        """Cibles des transitions q --a--> (segment trié par symbole)"""
+        debut, fin = int(self.debuts[q]), int(self.debuts[q + 1])
+        symboles = self.symboles
+        while debut < fin and symboles[debut] < a:
+            debut += 1
+        resultat = []
+        while debut < fin and symboles[debut] == a:
+            resultat.append(int(self.cibles[debut]))
+            debut += 1
+        return resultat
+
+    def accepte(self, mot):
+        """Reconnaissance d'un mot directement sur les tableaux projetés"""
+        courants = {int(q) for q in self.initiaux}
+        for symbole in mot:
+            a = self.alphabet.get(symbole)
+            if a is None:
+                return False
+            courants = {cible for q in courants for cible in self.destinations(q, a)}
+            if not courants:
+                return False
+        finaux = {int(q) for q in self.finaux}
+        return not courants.isdisjoint(finaux)
+
+    def vers_format_webapp(self, nom=''):
+        """
+        Format de l'application principale, écrit directement depuis les
+        tableaux projetés (sans passer par une copie AutomateCompact)
+        """
+        noms = [str(n) for n in self.etats]
+        initiaux = {int(q) for q in self.initiaux}
+        finaux = {int(q) for q in self.finaux}
+        alphabet = list(self.alphabet)
+        debuts, symboles, cibles = self.debuts, self.symboles, self.cibles
+        return {
+            'name': nom,
+            'states': [{'name': noms[q], 'initial': q in initiaux, 'final': q in finaux}
+                       for q in range(len(noms))],
+            'alphabet': [a for a in alphabet if a not in SYMBOLES_EPSILON],
+            'transitions': [{'from': noms[q], 'to': noms[int(cibles[k])], 'symbol': alphabet[int(symboles[k])]}
+                            for q in range(len(noms)) for k in range(int(debuts[q]), int(debuts[q + 1]))]
+        }
+
+    def vers_compact(self):
+        """Copie modifiable (AutomateCompact) pour les algorithmes"""
+        return AutomateCompact(
+            TableNoms(self.etats), TableNoms(self.alphabet),
+            array('i', (int(q) for q in self.initiaux)),
+            array('i', (int(q) for q in self.finaux)),
+            array('i', (int(x) for x in self.debuts)),
+            array('i', (int(x) for x in self.symboles)),
+            array('i', (int(x) for x in self.cibles)))
+
+
+def decoder(octets):
+    """Lit un automate compilé depuis des octets en mémoire"""
+    return AutomateBinaire(octets)
+
+
+_projections = OrderedDict()  # chemin -> (date, automate), LRU
+_verrou_projections = threading.Lock()
+
+
+def charger(chemin):
+    """
+    Ouvre un automate compilé, une seule fois par processus tant que le
+    fichier n'a pas changé sur le disque. Au plus NOMBRE_MAX_PROJECTIONS
+    fichiers restent projetés : le moins récemment chargé est fermé. Pour
+    une lecture unique, AutomateBinaire.ouvrir dans un bloc with suffit.
+    """
+    chemin = os.path.abspath(chemin)
+    date = os.stat(chemin).st_mtime_ns
+    with _verrou_projections:
+        ouvert = _projections.get(chemin)
+        if ouvert is not None and ouvert[0] == date:
+            _projections.move_to_end(chemin)
+            return ouvert[1]
+    automate = AutomateBinaire.ouvrir(chemin)
+    fermes = []
+    with _verrou_projections:
+        ancien = _projections.pop(chemin, None)
+        if ancien is not None:
+            fermes.append(ancien[1])
+        _projections[chemin] = (date, automate)
+        while len(_projections) > NOMBRE_MAX_PROJECTIONS:
+            fermes.append(_projections.popitem(last=False)[1][1])
+    for ferme in fermes:
+        ferme.fermer()
+    return automate
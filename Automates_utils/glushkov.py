@@ -1,5 +1,9 @@
 # glushkov_simple.py - Algorithme de Glushkov simplifié avec tableau de successeurs
-from regex_parser import parse_regex
+from regex_parser import (analyser_regex, verifier_operateurs, CHAR, EPSILON, UNION, CONCAT, STAR, PLUS, OPTION,
+                          SYMBOLE_EPSILON)
+from etoile_normale import forme_normale_etoile
+from compteurs import developper_repetitions
+from simplification_regex import simplifier
 
 class Automaton:
     def __init__(self):
@@ -32,204 +36,134 @@ class Automaton:
             'transitions': transitions_dict
         }
 
-def lineariser_regex(regex_str):
-    """
-    Étape 1: Linéariser toutes les lettres
-    Ex: a(a+b)b = a1(a2+b3)b4
+def _bits(ensemble):
+    """Positions présentes dans un ensemble de bits, par ordre croissant"""
+    while ensemble:
+        bas = ensemble & -ensemble
+        yield bas.bit_length() - 1
+        ensemble ^= bas
+
+def _vers_ensemble(bits):
+    return set(_bits(bits))
+
+def analyser_glushkov(arbre):
     """
-    ast = parse_regex(regex_str)
+    Un seul parcours ascendant de l'ArbreRegex : numérote les lettres de
+    gauche à droite et calcule une fois par nœud nullable, First et Last.
+    First, Last et les successeurs (Follow) sont des entiers utilisés comme
+    ensembles de bits : le bit p représente la position p.
     
-    # Dictionnaire position -> lettre originale
+    Retourne (positions, premiers, derniers, nullable, successeurs) où
+    successeurs[p] est l'ensemble de bits des successeurs de la position p.
+    """
     positions = {}
-    pos_counter = 1
+    successeurs = [0]
+    resultats = {}  # nœud -> (nullable, first, last) des sous-arbres déjà traités
+    types, gauches, droits = arbre.types, arbre.gauches, arbre.droits
     
-    def parcourir_et_numeroter(node):
-        nonlocal pos_counter
-        if node.kind == 'char':
-            node.pos = pos_counter
-            positions[pos_counter] = node.value
-            pos_counter += 1
-        elif hasattr(node, 'left') and node.left:
-            parcourir_et_numeroter(node.left)
-        if hasattr(node, 'right') and node.right:
-            parcourir_et_numeroter(node.right)
+    for i in arbre.ordre_postfixe():
+        type_ = types[i]
+        
+        if type_ == CHAR:
+            pos = len(successeurs)
+            positions[pos] = arbre.valeurs[i]
+            successeurs.append(0)
+            bit = 1 << pos
+            resultats[i] = (False, bit, bit)
+        elif type_ == EPSILON:
+            resultats[i] = (True, 0, 0)
+        elif type_ == CONCAT:
+            null_g, first_g, last_g = resultats.pop(gauches[i])
+            null_d, first_d, last_d = resultats.pop(droits[i])
+            # Pour AB: les derniers de A peuvent aller vers les premiers de B
+            for pos in _bits(last_g):
+                successeurs[pos] |= first_d
+            resultats[i] = (
+                null_g and null_d,
+                first_g | first_d if null_g else first_g,
+                last_g | last_d if null_d else last_d)
+        elif type_ == UNION:
+            null_g, first_g, last_g = resultats.pop(gauches[i])
+            null_d, first_d, last_d = resultats.pop(droits[i])
+            resultats[i] = (null_g or null_d, first_g | first_d, last_g | last_d)
+        elif type_ in (STAR, PLUS):
+            nullable, first, last = resultats.pop(gauches[i])
+            # Pour A* et A+: les derniers peuvent revenir aux premiers
+            for pos in _bits(last):
+                successeurs[pos] |= first
+            resultats[i] = (type_ == STAR or nullable, first, last)
+        elif type_ == OPTION:
+            _, first, last = resultats.pop(gauches[i])
+            resultats[i] = (True, first, last)
+        else:
+            raise ValueError(f"Nœud inconnu: {type_}")
     
-    parcourir_et_numeroter(ast)
-    return ast, positions
+    nullable, premiers, derniers = resultats.pop(arbre.racine)
+    return positions, premiers, derniers, nullable, successeurs
+
+_PRIORITES = {UNION: 1, CONCAT: 2}
+_RESERVES = ' |+&~.*?()[]{}\\' + SYMBOLE_EPSILON
+
+
+def ecrire_linearisation(arbre):
+    """
+    Écriture de l'arbre (celui dont analyser_glushkov numérote les lettres)
+    avec le numéro de position après chaque lettre : a(a+b)b -> a1(a2+b3)b4
+    """
+    textes = {}
+    priorites = {}
+    compteur = 0
+    types, gauches, droits = arbre.types, arbre.gauches, arbre.droits
+
+    def entoure(enfant, priorite):
+        texte = textes.pop(enfant)
+        return f"({texte})" if priorites.pop(enfant) < priorite else texte
+
+    for i in arbre.ordre_postfixe():
+        type_ = types[i]
+        priorite = _PRIORITES.get(type_, 3)
+        if type_ == CHAR:
+            # Même numérotation qu'analyser_glushkov : lettres dans l'ordre postfixe
+            compteur += 1
+            lettre = arbre.valeurs[i]
+            textes[i] = ('\\' + lettre if lettre in _RESERVES else lettre) + str(compteur)
+        elif type_ == EPSILON:
+            textes[i] = SYMBOLE_EPSILON
+        elif type_ in (CONCAT, UNION):
+            gauche, droit = entoure(gauches[i], priorite), entoure(droits[i], priorite)
+            textes[i] = gauche + droit if type_ == CONCAT else f"{gauche}+{droit}"
+        else:
+            operateur = {STAR: '*', PLUS: '+', OPTION: '?'}[type_]
+            textes[i] = entoure(gauches[i], priorite) + operateur
+        priorites[i] = priorite
+    return textes[arbre.racine]
+
+
+def lineariser_regex(regex_str):
+    """
+    Étape 1: Linéariser toutes les lettres
+    Ex: a(a+b)b = a1(a2+b3)b4
+    """
+    arbre = analyser_regex(regex_str)
+    positions = analyser_glushkov(arbre)[0]
+    return arbre, positions
 
-def calculer_premiers_derniers(ast):
+def calculer_premiers_derniers(arbre):
     """
     Calcule les ensembles First et Last pour déterminer 
     les états initiaux et finaux potentiels
     """
-    def is_nullable(node):
-        if node.kind == 'char':
-            return False
-        elif node.kind == 'union':
-            return is_nullable(node.left) or is_nullable(node.right)
-        elif node.kind == 'concat':
-            return is_nullable(node.left) and is_nullable(node.right)
-        elif node.kind == 'star':
-            return True
-        elif node.kind == 'plus':
-            return False
-        return False
-    
-    def first_pos(node):
-        if node.kind == 'char':
-            return {node.pos}
-        elif node.kind == 'union':
-            return first_pos(node.left) | first_pos(node.right)
-        elif node.kind == 'concat':
-            if is_nullable(node.left):
-                return first_pos(node.left) | first_pos(node.right)
-            else:
-                return first_pos(node.left)
-        elif node.kind in ['star', 'plus']:
-            return first_pos(node.left)
-        return set()
-    
-    def last_pos(node):
-        if node.kind == 'char':
-            return {node.pos}
-        elif node.kind == 'union':
-            return last_pos(node.left) | last_pos(node.right)
-        elif node.kind == 'concat':
-            if is_nullable(node.right):
-                return last_pos(node.left) | last_pos(node.right)
-            else:
-                return last_pos(node.right)
-        elif node.kind in ['star', 'plus']:
-            return last_pos(node.left)
-        return set()
-    
-    return first_pos(ast), last_pos(ast), is_nullable(ast)
+    _, premiers, derniers, nullable, _ = analyser_glushkov(arbre)
+    return _vers_ensemble(premiers), _vers_ensemble(derniers), nullable
 
-def creer_tableau_successeurs(ast, positions):
+def creer_tableau_successeurs(arbre, positions):
     """
     Créé le tableau de successeurs pour chaque position
     """
-    # Initialiser le tableau de successeurs
-    successeurs = {pos: set() for pos in positions.keys()}
-    
-    def calculer_successeurs(node):
-        if node.kind == 'concat':
-            # Pour AB: les derniers de A peuvent aller vers les premiers de B
-            def last_pos(n):
-                if n.kind == 'char':
-                    return {n.pos}
-                elif n.kind == 'union':
-                    return last_pos(n.left) | last_pos(n.right)
-                elif n.kind == 'concat':
-                    right_nullable = is_nullable(n.right)
-                    if right_nullable:
-                        return last_pos(n.left) | last_pos(n.right)
-                    else:
-                        return last_pos(n.right)
-                elif n.kind in ['star', 'plus']:
-                    return last_pos(n.left)
-                return set()
-            
-            def first_pos(n):
-                if n.kind == 'char':
-                    return {n.pos}
-                elif n.kind == 'union':
-                    return first_pos(n.left) | first_pos(n.right)
-                elif n.kind == 'concat':
-                    left_nullable = is_nullable(n.left)
-                    if left_nullable:
-                        return first_pos(n.left) | first_pos(n.right)
-                    else:
-                        return first_pos(n.left)
-                elif n.kind in ['star', 'plus']:
-                    return first_pos(n.left)
-                return set()
-            
-            def is_nullable(n):
-                if n.kind == 'char':
-                    return False
-                elif n.kind == 'union':
-                    return is_nullable(n.left) or is_nullable(n.right)
-                elif n.kind == 'concat':
-                    return is_nullable(n.left) and is_nullable(n.right)
-                elif n.kind == 'star':
-                    return True
-                elif n.kind == 'plus':
-                    return False
-                return False
-            
-            derniers_gauche = last_pos(node.left)
-            premiers_droite = first_pos(node.right)
-            
-            for pos in derniers_gauche:
-                successeurs[pos] |= premiers_droite
-            
-            # Traiter récursivement
-            calculer_successeurs(node.left)
-            calculer_successeurs(node.right)
-            
-        elif node.kind in ['star', 'plus']:
-            # Pour A* et A+: les derniers peuvent revenir aux premiers
-            def last_pos(n):
-                if n.kind == 'char':
-                    return {n.pos}
-                elif n.kind == 'union':
-                    return last_pos(n.left) | last_pos(n.right)
-                elif n.kind == 'concat':
-                    right_nullable = is_nullable(n.right)
-                    if right_nullable:
-                        return last_pos(n.left) | last_pos(n.right)
-                    else:
-                        return last_pos(n.right)
-                elif n.kind in ['star', 'plus']:
-                    return last_pos(n.left)
-                return set()
-            
-            def first_pos(n):
-                if n.kind == 'char':
-                    return {n.pos}
-                elif n.kind == 'union':
-                    return first_pos(n.left) | first_pos(n.right)
-                elif n.kind == 'concat':
-                    left_nullable = is_nullable(n.left)
-                    if left_nullable:
-                        return first_pos(n.left) | first_pos(n.right)
-                    else:
-                        return first_pos(n.left)
-                elif n.kind in ['star', 'plus']:
-                    return first_pos(n.left)
-                return set()
-            
-            def is_nullable(n):
-                if n.kind == 'char':
-                    return False
-                elif n.kind == 'union':
-                    return is_nullable(n.left) or is_nullable(n.right)
-                elif n.kind == 'concat':
-                    return is_nullable(n.left) and is_nullable(n.right)
-                elif n.kind == 'star':
-                    return True
-                elif n.kind == 'plus':
-                    return False
-                return False
-            
-            derniers = last_pos(node.left)
-            premiers = first_pos(node.left)
-            
-            for pos in derniers:
-                successeurs[pos] |= premiers
-            
-            calculer_successeurs(node.left)
-            
-        elif node.kind == 'union':
-            # Pour A|B: traiter les deux branches
-            calculer_successeurs(node.left)
-            calculer_successeurs(node.right)
-    
-    calculer_successeurs(ast)
-    return successeurs
+    successeurs = analyser_glushkov(arbre)[4]
+    return {pos: _vers_ensemble(successeurs[pos]) for pos in positions}
 
-def construire_automate_glushkov(regex_str):
+def construire_automate_glushkov(regex_str, verbeux=False):
     """
     Algorithme de Glushkov simplifié:
     1. Linéariser toutes les lettres
@@ -237,39 +171,37 @@ def construire_automate_glushkov(regex_str):
     3. Choisir états initiaux et finaux
     4. Pour chaque lettre, rechercher ses successeurs
     5. Construire les transitions
+    
+    Avec verbeux=True, chaque étape est affichée sur la sortie standard.
     """
-    print(f"=== Construction Glushkov pour: {regex_str} ===")
+    log = print if verbeux else (lambda *args, **kwargs: None)
+    log(f"=== Construction Glushkov pour: {regex_str} ===")
     
     try:
-        # Étape 1: Linéarisation
-        ast, positions = lineariser_regex(regex_str)
-        print(f"\n1. Linéarisation:")
-        linearisation_str = regex_str
-        for pos in sorted(positions.keys()):
-            linearisation_str = linearisation_str.replace(positions[pos], f"{positions[pos]}{pos}", 1)
-        print(f"   {regex_str} = {linearisation_str}")
-        
-        for pos, lettre in sorted(positions.items()):
-            print(f"   Position {pos}: {lettre}")
+        # Étapes 1 à 3 en un seul parcours de l'arbre, simplifié puis mis en
+        # forme normale étoile pour éviter les unions redondantes des étoiles imbriquées
+        arbre = analyser_regex(regex_str)
+        verifier_operateurs(arbre, "la construction de Glushkov")
+        arbre = forme_normale_etoile(developper_repetitions(simplifier(arbre)))
+        positions, premiers, derniers, nullable, successeurs = analyser_glushkov(arbre)
         
-        # Étape 2: Calculer premiers et derniers
-        premiers, derniers, nullable = calculer_premiers_derniers(ast)
-        print(f"\n2. États susceptibles:")
-        print(f"   États initiaux potentiels (First): {sorted(premiers)}")
-        print(f"   États finaux potentiels (Last): {sorted(derniers)}")
-        print(f"   Expression nullable: {nullable}")
-        
-        # Étape 3: Créer tableau de successeurs
-        successeurs = creer_tableau_successeurs(ast, positions)
-        print(f"\n3. Tableau de successeurs:")
-        for pos in sorted(positions.keys()):
-            lettre = positions[pos]
-            succ = sorted(successeurs[pos])
-            if succ:
-                succ_str = [f"{positions[s]}{s}" for s in succ]
-                print(f"   {lettre}{pos} -> {succ_str}")
-            else:
-                print(f"   {lettre}{pos} -> []")
+        if verbeux:
+            # Les positions sont celles de l'expression simplifiée (répétitions
+            # développées, forme normale étoile) : c'est elle qui est linéarisée
+            log(f"\n1. Linéarisation (de l'expression simplifiée):")
+            log(f"   {regex_str} ~> {ecrire_linearisation(arbre)}")
+            for pos, lettre in sorted(positions.items()):
+                log(f"   Position {pos}: {lettre}")
+            
+            log(f"\n2. États susceptibles:")
+            log(f"   États initiaux potentiels (First): {list(_bits(premiers))}")
+            log(f"   États finaux potentiels (Last): {list(_bits(derniers))}")
+            log(f"   Expression nullable: {nullable}")
+            
+            log(f"\n3. Tableau de successeurs:")
+            for pos in sorted(positions.keys()):
+                succ_str = [f"{positions[s]}{s}" for s in _bits(successeurs[pos])]
+                log(f"   {positions[pos]}{pos} -> {succ_str}")
         
         # Étape 4: Construction de l'automate
         automate = Automaton()
@@ -278,56 +210,44 @@ def construire_automate_glushkov(regex_str):
         automate.states = set(positions.keys())
         
         # États finaux: positions dans Last + 0 si nullable
-        automate.final_states = derniers.copy()
+        automate.final_states = _vers_ensemble(derniers)
         if nullable:
             automate.final_states.add(0)
         
-        print(f"\n4. Construction de l'automate:")
-        print(f"   États: {{0, {', '.join(map(str, sorted(positions.keys())))}}}")
-        print(f"   État initial: 0")
-        print(f"   États finaux: {{{', '.join(map(str, sorted(automate.final_states)))}}}")
+        log(f"\n4. Construction de l'automate:")
+        log(f"   États: {{0, {', '.join(map(str, sorted(positions.keys())))}}}")
+        log(f"   État initial: 0")
+        log(f"   États finaux: {{{', '.join(map(str, sorted(automate.final_states)))}}}")
         
         # Transitions depuis l'état initial 0
-        print(f"\n5. Transitions:")
-        print(f"   Depuis l'état 0:")
-        for pos in sorted(premiers):
+        log(f"\n5. Transitions:")
+        log(f"   Depuis l'état 0:")
+        for pos in _bits(premiers):
             lettre = positions[pos]
             automate.add_transition(0, lettre, pos)
-            print(f"     0 --{lettre}--> {pos}")
+            log(f"     0 --{lettre}--> {pos}")
         
         # Transitions entre positions selon successeurs
         for pos in sorted(positions.keys()):
-            lettre_actuelle = positions[pos]
             if successeurs[pos]:
-                print(f"   Depuis l'état {pos} ({lettre_actuelle}{pos}):")
-                for succ_pos in sorted(successeurs[pos]):
+                log(f"   Depuis l'état {pos} ({positions[pos]}{pos}):")
+                for succ_pos in _bits(successeurs[pos]):
                     lettre_succ = positions[succ_pos]
                     automate.add_transition(pos, lettre_succ, succ_pos)
-                    print(f"     {pos} --{lettre_succ}--> {succ_pos}")
-        
-        # Vérification pour a(a+b)b
-        if regex_str == "a(a+b)b":
-            print(f"\n6. Vérification pour a(a+b)b:")
-            print(f"   ✓ Linéarisation: a1(a2+b3)b4")
-            print(f"   ✓ 5 états: {{0, 1, 2, 3, 4}}")
-            print(f"   ✓ État initial: 0")
-            print(f"   ✓ État final: 4")
-            print(f"   ✓ Transitions attendues:")
-            print(f"     0 --a--> 1  (vers a1)")
-            print(f"     1 --a--> 2  (a1 vers a2)")
-            print(f"     1 --b--> 3  (a1 vers b3)")
-            print(f"     2 --b--> 4  (a2 vers b4)")
-            print(f"     3 --b--> 4  (b3 vers b4)")
+                    log(f"     {pos} --{lettre_succ}--> {succ_pos}")
         
         result = {
             'succes': True,
             'message': f'Automate de Glushkov construit pour "{regex_str}"',
             'automate': automate.to_dict(),
+            'positions': {str(pos): lettre for pos, lettre in sorted(positions.items())},
             'debug': {
+                # Positions de l'expression simplifiée, pas du texte saisi
+                'linearized_expression': ecrire_linearisation(arbre),
                 'linearized': {f"pos_{k}": f"{v}_{k}" for k, v in positions.items()},
-                'successeurs': {f"pos_{k}": [f"pos_{p}" for p in sorted(v)] for k, v in successeurs.items()},
-                'first_states': sorted(list(premiers)),
-                'last_states': sorted(list(derniers)),
+                'successeurs': {f"pos_{k}": [f"pos_{p}" for p in _bits(successeurs[k])] for k in positions},
+                'first_states': list(_bits(premiers)),
+                'last_states': list(_bits(derniers)),
                 'nullable': nullable
             },
             'regex': regex_str
@@ -341,10 +261,22 @@ def construire_automate_glushkov(regex_str):
             'erreur': f'Erreur lors de la construction : {str(e)}'
         }
 
+def construire_glushkov(regex_str):
+    """
+    Automate de Glushkov et positions, sans le texte propre à la requête :
+    c'est la forme mise en cache sous le nom 'glushkov', commune aux deux
+    applications. ValueError si l'expression est invalide.
+    """
+    resultat = construire_automate_glushkov(regex_str)
+    if not resultat['succes']:
+        raise ValueError(resultat['erreur'])
+    return {'automate': resultat['automate'], 'positions': resultat['positions']}
+
+
 # Test avec l'exemple
 if __name__ == "__main__":
     # Test principal
-    result = construire_automate_glushkov("a(a+b)b")
+    result = construire_automate_glushkov("a(a+b)b", verbeux=True)
     
     if result['succes']:
         print(f"\n" + "="*50)
@@ -0,0 +1,95 @@
+# index_graphe.py - Index d'adjacence (avant et arrière) pour l'analyse des états
+from array import array
+from collections import deque
+
+
+class IndexGraphe:
+    """
+    Adjacence compacte (CSR) d'un automate, dans les deux sens.
+
+    L'adjacence avant est celle de l'AutomateCompact : les successeurs de
+    l'état i sont cibles[debuts[i]:debuts[i + 1]]. L'adjacence arrière
+    (prédécesseurs) est construite une fois par tri par comptage. Les résultats
+    des parcours sont mémorisés : l'index doit être reconstruit si l'automate change.
+    """
+
+    def __init__(self, compact):
+        self.noms = compact.etats.noms
+        self.numeros = compact.etats.numeros
+        self.debuts = compact.debuts
+        self.cibles = compact.cibles
+        self.debuts_inverses, self.sources = self._inverser(len(self.noms), self.debuts, self.cibles)
+        self._parcours = {}
+
+    @staticmethod
+    def _inverser(n, debuts, cibles):
+        """Tri par comptage des arcs selon leur cible"""
+        debuts_inverses = array('i', bytes(4 * (n + 1)))
+        for cible in cibles:
+            debuts_inverses[cible + 1] += 1
+        for i in range(n):
+            debuts_inverses[i + 1] += debuts_inverses[i]
+
+        sources = array('i', bytes(4 * len(cibles)))
+        position = array('i', debuts_inverses[:n])
+        for source in range(n):
+            for k in range(debuts[source], debuts[source + 1]):
+                cible = cibles[k]
+                sources[position[cible]] = source
+                position[cible] += 1
+        return debuts_inverses, sources
+
+    @property
+    def nombre_etats(self):
+        return len(self.noms)
+
+    def _parcourir(self, departs, debuts, voisins):
+        """Parcours en largeur ; retourne le marquage des états atteints"""
+        atteints = bytearray(len(self.noms))
+        file = deque()
+        for etat in departs:
+            i = self.numeros.get(etat)
+            if i is not None and not atteints[i]:
+                atteints[i] = 1
+                file.append(i)
+
+        while file:
+            i = file.popleft()
+            for k in range(debuts[i], debuts[i + 1]):
+                j = voisins[k]
+                if not atteints[j]:
+                    atteints[j] = 1
+                    file.append(j)
+        return atteints
+
+    def _marquage(self, sens, departs):
+        cle = (sens, tuple(departs))
+        if cle not in self._parcours:
+            if sens == 'avant':
+                self._parcours[cle] = self._parcourir(departs, self.debuts, self.cibles)
+            else:
+                self._parcours[cle] = self._parcourir(departs, self.debuts_inverses, self.sources)
+        return self._parcours[cle]
+
+    def _selectionner(self, marquage, valeur=1):
+        return [nom for nom, marque in zip(self.noms, marquage) if marque == valeur]
+
+    def accessibles(self, etats_initiaux):
+        """États atteignables depuis les états initiaux"""
+        return self._selectionner(self._marquage('avant', etats_initiaux))
+
+    def coaccessibles(self, etats_finaux):
+        """États depuis lesquels un état final est atteignable"""
+        return self._selectionner(self._marquage('arriere', etats_finaux))
+
+    def utiles(self, etats_initiaux, etats_finaux):
+        """États à la fois accessibles et coaccessibles"""
+        avant = self._marquage('avant', etats_initiaux)
+        arriere = self._marquage('arriere', etats_finaux)
+        return [nom for nom, a, c in zip(self.noms, avant, arriere) if a and c]
+
+    def inutiles(self, etats_initiaux, etats_finaux):
+        """États qui ne sont pas à la fois accessibles et coaccessibles"""
+        avant = self._marquage('avant', etats_initiaux)
+        arriere = self._marquage('arriere', etats_finaux)
+        return [nom for nom, a, c in zip(self.noms, avant, arriere) if not (a and c)]
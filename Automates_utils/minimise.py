@@ -1,6 +1,8 @@
 # minimise.py - Minimisation d'automates finis déterministes
 from collections import defaultdict, deque
 
+from classes_alphabet import ClassesAlphabet
+
 class MinimisationAutomate:
     """Classe pour la minimisation d'automates finis déterministes"""
     
@@ -31,6 +33,10 @@ class MinimisationAutomate:
                     etat, symbole = parts
                     # AFD: une seule destination
                     self.delta[(etat, symbole)] = destinations[0]
+        
+        # Symboles à colonnes identiques : un représentant par classe suffit
+        self.classes = ClassesAlphabet(
+            self.alphabet, ((etat, symbole, dest) for (etat, symbole), dest in self.delta.items()))
     
     def supprimer_etats_inaccessibles(self):
         """Supprime les états inaccessibles depuis les états initiaux"""
@@ -46,7 +52,7 @@ class MinimisationAutomate:
             etat_courant = file.popleft()
             
             # Explorer toutes les transitions depuis cet état
-            for symbole in self.alphabet:
+            for symbole in self.classes.representants:
                 if (etat_courant, symbole) in self.delta:
                     etat_suivant = self.delta[(etat_courant, symbole)]
                     if etat_suivant not in accessibles and etat_suivant in self.etats:
@@ -104,7 +110,7 @@ class MinimisationAutomate:
                     
                     if not distinguable.get(cle, False):
                         # Vérifier si les états sont distinguables par leurs transitions
-                        for symbole in self.alphabet:
+                        for symbole in self.classes.representants:
                             dest1 = self.delta.get((etat1, symbole))
                             dest2 = self.delta.get((etat2, symbole))
                             
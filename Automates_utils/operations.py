@@ -1,5 +1,6 @@
 # operations.py - Classe pour les opérations sur les automates
 from automate import Automate
+from classes_alphabet import ClassesAlphabet
 
 class OperationsAutomate:
     """Classe contenant toutes les opérations sur les automates"""
@@ -35,63 +36,21 @@ class OperationsAutomate:
     
     def trouver_etats_accessibles(self):
         """Trouve tous les états accessibles depuis les états initiaux"""
-        accessibles = set(self.automate.etats_initiaux)
-        a_visiter = list(self.automate.etats_initiaux)
-        
-        while a_visiter:
-            etat_courant = a_visiter.pop()
-            
-            if etat_courant in self.automate.transitions:
-                for symbole in self.automate.transitions[etat_courant]:
-                    destinations = self.automate.transitions[etat_courant][symbole]
-                    if isinstance(destinations, list):
-                        for dest in destinations:
-                            if dest not in accessibles:
-                                accessibles.add(dest)
-                                a_visiter.append(dest)
-                    else:
-                        if destinations not in accessibles:
-                            accessibles.add(destinations)
-                            a_visiter.append(destinations)
-        
-        return list(accessibles)
+        return self.automate.index_graphe().accessibles(self.automate.etats_initiaux)
     
     def trouver_etats_coaccessibles(self):
         """Trouve tous les états coaccessibles (qui peuvent atteindre un état final)"""
-        coaccessibles = set(self.automate.etats_finaux)
-        change = True
-        
-        while change:
-            change = False
-            for etat in self.automate.etats:
-                if etat not in coaccessibles:
-                    if etat in self.automate.transitions:
-                        for symbole in self.automate.transitions[etat]:
-                            destinations = self.automate.transitions[etat][symbole]
-                            if isinstance(destinations, list):
-                                if any(dest in coaccessibles for dest in destinations):
-                                    coaccessibles.add(etat)
-                                    change = True
-                                    break
-                            else:
-                                if destinations in coaccessibles:
-                                    coaccessibles.add(etat)
-                                    change = True
-                                    break
-        
-        return list(coaccessibles)
+        return self.automate.index_graphe().coaccessibles(self.automate.etats_finaux)
     
     def trouver_etats_utiles(self):
         """Trouve les états à la fois accessibles et coaccessibles"""
-        accessibles = set(self.trouver_etats_accessibles())
-        coaccessibles = set(self.trouver_etats_coaccessibles())
-        return list(accessibles.intersection(coaccessibles))
+        return self.automate.index_graphe().utiles(self.automate.etats_initiaux,
+                                                   self.automate.etats_finaux)
     
     def trouver_etats_inutiles(self):
-        """Trouve les états inutiles (ni accessibles ni coaccessibles)"""
-        utiles = set(self.trouver_etats_utiles())
-        tous_etats = set(self.automate.etats)
-        return list(tous_etats.difference(utiles))
+        """Trouve les états inutiles (non accessibles ou non coaccessibles)"""
+        return self.automate.index_graphe().inutiles(self.automate.etats_initiaux,
+                                                     self.automate.etats_finaux)
     
     def est_emonde(self):
         """Vérifie si l'automate est émondé (sans états inutiles)"""
@@ -99,6 +58,8 @@ class OperationsAutomate:
     
     def determiniser(self):
         """Déterminise l'automate en utilisant la construction par sous-ensembles"""
+        # Un seul symbole par classe de symboles à colonnes identiques
+        classes = ClassesAlphabet.depuis_automate(self.automate)
         nouveaux_etats = []
         nouvelles_transitions = {}
         correspondance_etats = {}
@@ -116,7 +77,7 @@ class OperationsAutomate:
             courant = file_attente.pop(0)
             nouvelles_transitions[courant['id']] = {}
             
-            for symbole in self.automate.alphabet:
+            for symbole in classes.representants:
                 etats_suivants = set()
                 
                 for etat in courant['etats']:
@@ -140,7 +101,8 @@ class OperationsAutomate:
                         })
                         prochain_id_etat += 1
                     
-                    nouvelles_transitions[courant['id']][symbole] = [correspondance_etats[ensemble_suivant]]
+                    for membre in classes.membres_de(symbole):
+                        nouvelles_transitions[courant['id']][membre] = [correspondance_etats[ensemble_suivant]]
         
         # Nouveaux états finaux
         nouveaux_etats_finaux = []
@@ -169,7 +131,7 @@ class OperationsAutomate:
         if not self.est_deterministe():
             automate_det = self.determiniser()
         
-        ops_det = OperationsAutomate(automate_det)
+        classes = ClassesAlphabet.depuis_automate(automate_det)
         
         # Partitionnement initial : états finaux et non-finaux
         etats_finaux = set(automate_det.etats_finaux)
@@ -192,7 +154,7 @@ class OperationsAutomate:
                 
                 for etat in partition:
                     signature = []
-                    for symbole in automate_det.alphabet:
+                    for symbole in classes.representants:
                         if (etat in automate_det.transitions and 
                             symbole in automate_det.transitions[etat]):
                             destination = automate_det.transitions[etat][symbole]
@@ -0,0 +1,281 @@
+# reecriture_regex.py - Simplification d'expressions par réécriture de termes
+#
+# L'expression est analysée une fois en terme partagé (termes_regex), réécrite
+# de bas en haut, puis écrite une fois. Chaque nœud est réécrit après ses
+# enfants et le résultat est mémorisé sur le terme : un sous-terme partagé, ou
+# revu d'un appel à l'autre (substitutions successives du solveur
+# d'équations), n'est réécrit qu'une fois.
+#
+# Règles (en plus de la normalisation des constructeurs : ∅ et ε, union
+# associative, commutative et idempotente, (E*)* = E*) :
+#
+#   (ε+E)* = E*        (E*+F)* = (E+F)*        (E*F*)* = (E+F)*    (EE*)* = E*
+#   E*E* = E*          E*(ε+E) = (ε+E)E* = E*
+#   ε+E = E si E contient ε                    ε+EE* = ε+E*E = E*
+#   F+E* = E* si F = E ou F membre de E
+#   AB+AC+A = A(B+C+ε)  (préfixes communs factorisés)
+#
+# Avec `variables` (motif des symboles de plusieurs lettres, par exemple
+# r'X\d+' pour les inconnues d'un système d'équations), les concaténations
+# sont en plus distribuées sur les unions qui contiennent une variable :
+# A(B+CX1) = AB+ACX1. Les variables restent alors en facteur à droite des
+# termes de premier niveau, et ces termes ne sont pas refactorisés.
+#
+# Chaque règle s'applique au moment où le nœud est reconstruit, sur des
+# enfants déjà réduits : le résultat ne dépend que du terme, pas de la
+# manière dont l'expression a été écrite. Aucun parcours n'est récursif.
+import re
+import weakref
+
+from regex_parser import analyser_regex
+from termes_regex import (depuis_arbre, facteurs, texte, vide, mot_vide, concat_liste, union, intersection,
+                          complement, etoile, repetition, VIDE, MOT_VIDE, SYMBOLE, T_CONCAT, T_UNION,
+                          T_ETOILE, T_REPETITION, T_INTER, T_COMPL)
+
+
+class _Contexte:
+    """Motif des variables et mémo « contient une variable » (None : pas de variables)"""
+
+    def __init__(self, variables):
+        self.cle = variables
+        self.motif = re.compile(variables) if variables is not None else None
+        self._avec_variables = weakref.WeakKeyDictionary()
+
+    def avec_variables(self, terme):
+        if self.motif is None:
+            return False
+        memo = self._avec_variables
+        pile = [terme]
+        while pile:
+            courant = pile[-1]
+            if courant in memo:
+                pile.pop()
+                continue
+            manquants = [e for e in courant.enfants if e not in memo]
+            if manquants:
+                pile.extend(manquants)
+                continue
+            pile.pop()
+            if courant.type == SYMBOLE:
+                memo[courant] = self.motif.fullmatch(courant.valeur) is not None
+            else:
+                memo[courant] = any(memo[e] for e in courant.enfants)
+        return memo[terme]
+
+
+_contextes = {}
+
+
+def _contexte(variables):
+    contexte = _contextes.get(variables)
+    if contexte is None:
+        contexte = _contextes.setdefault(variables, _Contexte(variables))
+    return contexte
+
+
+# ----------------------------------------------------------------------
+# Formes reconnues
+# ----------------------------------------------------------------------
+
+def _est_option_de(terme, corps):
+    """terme = ε+corps"""
+    if terme.type != T_UNION or mot_vide() not in terme.enfants:
+        return False
+    return union(*(m for m in terme.enfants if m.type != MOT_VIDE)) is corps
+
+
+def _etoile_de_plus(terme):
+    """E* si terme = EE* ou E*E, None sinon"""
+    suite = facteurs(terme)
+    if len(suite) < 2:
+        return None
+    dernier, premier = suite[-1], suite[0]
+    if dernier.type == T_ETOILE and facteurs(dernier.enfants[0]) == suite[:-1]:
+        return dernier
+    if premier.type == T_ETOILE and facteurs(premier.enfants[0]) == suite[1:]:
+        return premier
+    return None
+
+
+# ----------------------------------------------------------------------
+# Constructeurs réduits (enfants déjà réécrits)
+# ----------------------------------------------------------------------
+
+def _reduire_union(membres):
+    """Union avec absorption : ε+EE* = E*, ε dans un membre nullable, F dans E*"""
+    ensemble = union(*membres)
+    if ensemble.type != T_UNION:
+        return ensemble
+    membres = list(ensemble.enfants)
+    if ensemble.nullable:
+        membres = [_etoile_de_plus(m) or m for m in membres]
+    absorbes = set()
+    for m in membres:
+        if m.type == T_ETOILE:
+            corps = m.enfants[0]
+            absorbes.add(corps)
+            if corps.type == T_UNION:
+                absorbes.update(corps.enfants)
+    membres = [m for m in membres if m not in absorbes]
+    if any(m.nullable and m.type != MOT_VIDE for m in membres):
+        membres = [m for m in membres if m.type != MOT_VIDE]
+    return union(*membres)
+
+
+def _tete(terme):
+    return terme.enfants[0] if terme.type == T_CONCAT else terme
+
+
+def _factoriser(membres):
+    """
+    Union des membres, préfixes communs factorisés : les membres sont
+    groupés par premier facteur, et chaque groupe de plusieurs membres
+    devient facteur.(union des suites), factorisée à son tour. Un membre seul
+    dans son groupe est gardé tel quel.
+    """
+    taches = [membres]  # unions à factoriser, les filles après leur mère
+    morceaux = []  # par tâche : membres gardés et (facteur, tâche fille)
+    i = 0
+    while i < len(taches):
+        groupes = {}
+        for m in taches[i]:
+            groupes.setdefault(_tete(m), []).append(m)
+        liste = []
+        for tete, groupe in groupes.items():
+            if len(groupe) == 1:
+                liste.append(groupe[0])
+            else:
+                liste.append((tete, len(taches)))
+                taches.append([m.enfants[1] if m.type == T_CONCAT else mot_vide() for m in groupe])
+        morceaux.append(liste)
+        i += 1
+
+    resultats = [None] * len(taches)
+    for i in range(len(taches) - 1, -1, -1):
+        resultats[i] = _reduire_union([_concat([m[0], resultats[m[1]]]) if isinstance(m, tuple) else m
+                                       for m in morceaux[i]])
+    return resultats[0]
+
+
+def _union(membres, contexte):
+    ensemble = _reduire_union(membres)
+    if ensemble.type != T_UNION:
+        return ensemble
+    fixes = [m for m in ensemble.enfants if contexte.avec_variables(m)]
+    a_factoriser = [m for m in ensemble.enfants if not contexte.avec_variables(m)]
+    if len({_tete(m) for m in a_factoriser}) == len(a_factoriser):
+        return ensemble  # aucun préfixe commun
+    return union(_factoriser(a_factoriser), *fixes)
+
+
+def _concat(suite, contexte=None):
+    """Concaténation : E*E* = E*, E*(ε+E) = (ε+E)E* = E* ; distribution sur les unions à variables"""
+    if contexte is not None and any(f.type == T_UNION and contexte.avec_variables(f) for f in suite):
+        produits = [[]]
+        for f in suite:
+            if f.type == T_UNION and contexte.avec_variables(f):
+                produits = [p + facteurs(m) for p in produits for m in f.enfants]
+            else:
+                for p in produits:
+                    p.append(f)
+        return _union([_concat(p) for p in produits], contexte)
+
+    resultat = []
+    for f in suite:
+        if f.type == VIDE:
+            return vide()
+        for g in facteurs(f):
+            if g.type == T_ETOILE:
+                corps = g.enfants[0]
+                while resultat and _est_option_de(resultat[-1], corps):
+                    resultat.pop()
+                if resultat and resultat[-1] is g:
+                    continue
+            elif resultat and resultat[-1].type == T_ETOILE and _est_option_de(g, resultat[-1].enfants[0]):
+                continue
+            resultat.append(g)
+    return concat_liste(resultat)
+
+
+def _etoile(corps, contexte):
+    """(ε+E)* = E*, (E*+F)* = (E+F)*, (E*F*)* = (E+F)*, (EE*)* = E*"""
+    membres = []
+    for m in (corps.enfants if corps.type == T_UNION else (corps,)):
+        if m.type == MOT_VIDE:
+            continue
+        m = _etoile_de_plus(m) or m
+        suite = facteurs(m)
+        if all(f.type == T_ETOILE for f in suite):
+            membres.extend(f.enfants[0] for f in suite)
+        else:
+            membres.append(m)
+    return etoile(_union(membres, contexte))
+
+
+def _reecrire(terme, contexte):
+    """Réécriture d'un nœud dont les enfants sont déjà réécrits"""
+    cle = contexte.cle
+    type_ = terme.type
+    if type_ == SYMBOLE:
+        # '∅' est l'écriture du langage vide par texte() : on la relit comme telle
+        return vide() if terme.valeur == '∅' else terme
+    if type_ in (VIDE, MOT_VIDE):
+        return terme
+    enfants = [e.reecritures[cle] for e in terme.enfants]
+    if type_ == T_UNION:
+        return _union(enfants, contexte)
+    if type_ == T_CONCAT:
+        return _concat(enfants, contexte)
+    if type_ == T_ETOILE:
+        return _etoile(enfants[0], contexte)
+    if type_ == T_REPETITION:
+        return repetition(enfants[0], *terme.valeur)
+    if type_ == T_INTER:
+        return intersection(*enfants)
+    if type_ == T_COMPL:
+        return complement(enfants[0])
+    raise ValueError(f"Terme inconnu: {type_}")
+
+
+# ----------------------------------------------------------------------
+
+def simplifier_terme(terme, variables=None):
+    """
+    Terme simplifié équivalent (mémorisé sur chaque sous-terme) ; `variables`
+    est le motif des symboles à traiter comme des inconnues.
+    """
+    contexte = _contexte(variables)
+    cle = contexte.cle
+    pile = [(terme, False)]
+    while pile:
+        courant, prets = pile.pop()
+        if cle in courant.reecritures:
+            continue
+        if not prets:
+            manquants = [e for e in courant.enfants if cle not in e.reecritures]
+            if manquants:
+                pile.append((courant, True))
+                pile.extend((e, False) for e in manquants)
+                continue
+        resultat = _reecrire(courant, contexte)
+        courant.reecritures[cle] = resultat
+        # Le résultat est déjà en forme réduite
+        resultat.reecritures.setdefault(cle, resultat)
+    return terme.reecritures[cle]
+
+
+def depuis_texte(expression, variables=None):
+    """Terme simplifié d'une expression ; vide : ε. ValueError si l'expression est invalide"""
+    if not expression or not expression.strip():
+        return mot_vide()
+    motif = re.compile(variables) if variables is not None else None
+    return simplifier_terme(depuis_arbre(analyser_regex(expression, motif)), variables)
+
+
+def simplifier_texte(expression, variables=None, separateur=' + '):
+    """
+    Expression simplifiée, écrite dans la syntaxe de regex_parser ; l'union
+    de premier niveau est séparée par `separateur`. Une expression vide vaut
+    ε. ValueError si l'expression est invalide.
+    """
+    return texte(depuis_texte(expression, variables), separateur)
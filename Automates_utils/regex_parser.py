@@ -1,63 +1,341 @@
-# regex_parser.py
+# regex_parser.py - Analyseur commun des expressions régulières
+#
+# Syntaxe acceptée :
+#   a, 0, _ ...     symbole (tout caractère non réservé)
+#   \c              le caractère réservé c pris littéralement
+#   ε               mot vide ; () aussi
+#   [abc] [a-z0-9]  classe de caractères (union de ses symboles)
+#   E|F  E+F        union ('+' est l'union, comme dans l'interface)
+#   E&F             intersection
+#   EF  E.F         concaténation
+#   ~E              complément (par rapport à Σ*)
+#   E*  E?          étoile, option
+#   E{m} E{m,} E{m,n} E{,n}  répétition bornée (voir compteurs.py)
+#   (E)             groupement
+# Les espaces sont ignorés. Priorités croissantes : union, intersection,
+# concaténation, complément, opérateurs postfixes.
+#
+# & et ~ ne sont compilés que par les dérivées (derivees.py) : les autres
+# constructions les refusent (verifier_operateurs).
+#
+# L'analyse est itérative (aucune limite de récursion) et produit un arbre
+# stocké dans des tableaux parallèles : un nœud est créé après ses enfants,
+# donc parcourir les indices dans l'ordre croissant est un parcours postfixe.
+from array import array
+
+# Types de nœuds
+CHAR = 0
+EPSILON = 1
+UNION = 2
+CONCAT = 3
+STAR = 4
+PLUS = 5
+OPTION = 6
+REPETITION = 7  # valeur (m, n), n = None si non bornée
+INTERSECTION = 8
+COMPLEMENT = 9
+
+NOMS_TYPES = ('char', 'epsilon', 'union', 'concat', 'star', 'plus', 'option', 'repetition',
+              'intersection', 'complement')
+TYPES_PAR_NOM = {nom: numero for numero, nom in enumerate(NOMS_TYPES)}
+
+SYMBOLE_EPSILON = 'ε'
+_PRIORITES = {'|': 1, '&': 2, '.': 3, '~': 4}
+_BINAIRES = {'|': UNION, '&': INTERSECTION, '.': CONCAT}
+
+
 class RegexNode:
-    def __init__(self, kind, value=None, left=None, right=None):
-        self.kind = kind  # 'char', 'concat', 'union', 'star'
+    def __init__(self, kind, value=None, left=None, right=None, debut=None, fin=None):
+        self.kind = kind  # un des NOMS_TYPES
         self.value = value
         self.left = left
         self.right = right
+        self.debut = debut  # position dans le texte source (fin exclue)
+        self.fin = fin
 
-def parse_regex(regex):
-    def precedence(op):
-        return {'|': 1, '.': 2, '*': 3}.get(op, 0)
-
-    def to_postfix(regex):
-        output = []
-        stack = []
-        prev = None
-        for char in regex:
-            if char.isalnum():
-                if prev and (prev.isalnum() or prev == '*' or prev == ')'):
-                    while stack and precedence('.') <= precedence(stack[-1]):
-                        output.append(stack.pop())
-                    stack.append('.')
-                output.append(char)
-            elif char == '(':
-                if prev and (prev.isalnum() or prev == '*' or prev == ')'):
-                    while stack and precedence('.') <= precedence(stack[-1]):
-                        output.append(stack.pop())
-                    stack.append('.')
-                stack.append(char)
-            elif char == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
-                stack.pop()
-            elif char in ['*', '|']:
-                while stack and precedence(char) <= precedence(stack[-1]):
-                    output.append(stack.pop())
-                stack.append(char)
-            prev = char
-        while stack:
-            output.append(stack.pop())
-        return output
-
-    def postfix_to_ast(postfix):
-        stack = []
-        for token in postfix:
-            if token.isalnum():
-                stack.append(RegexNode('char', token))
-            elif token == '*':
-                a = stack.pop()
-                stack.append(RegexNode('star', left=a))
-            elif token == '.':
-                b = stack.pop()
-                a = stack.pop()
-                stack.append(RegexNode('concat', left=a, right=b))
-            elif token == '|':
-                b = stack.pop()
-                a = stack.pop()
-                stack.append(RegexNode('union', left=a, right=b))
-        return stack[0]
-
-    postfix = to_postfix(regex)
-    return postfix_to_ast(postfix)
 
+class ArbreRegex:
+    """
+    Arbre syntaxique compact : le nœud i est décrit par types[i], valeurs[i],
+    gauches[i], droits[i] (-1 si absent) et l'intervalle source [debuts[i], fins[i]).
+    """
+
+    __slots__ = ('source', 'types', 'valeurs', 'gauches', 'droits', 'debuts', 'fins', 'racine')
+
+    def __init__(self, source=''):
+        self.source = source
+        self.types = array('b')
+        self.valeurs = []
+        self.gauches = array('i')
+        self.droits = array('i')
+        self.debuts = array('i')
+        self.fins = array('i')
+        self.racine = -1
+
+    def ajouter(self, type_, valeur=None, gauche=-1, droit=-1, debut=0, fin=0):
+        """Ajoute un nœud (ses enfants doivent déjà exister) ; retourne son numéro"""
+        self.types.append(type_)
+        self.valeurs.append(valeur)
+        self.gauches.append(gauche)
+        self.droits.append(droit)
+        self.debuts.append(debut)
+        self.fins.append(fin)
+        return len(self.types) - 1
+
+    def __len__(self):
+        return len(self.types)
+
+    def texte(self, i):
+        """Fragment du texte source couvert par le nœud i"""
+        return self.source[self.debuts[i]:self.fins[i]]
+
+    def nombre_symboles(self):
+        return sum(1 for t in self.types if t == CHAR)
+
+    def ordre_postfixe(self):
+        """
+        Numéros des nœuds accessibles depuis la racine, enfants avant parents.
+        Les réécritures (forme normale étoile...) peuvent laisser des nœuds
+        inutilisés dans les tableaux ; ils sont ignorés ici.
+        """
+        if self.racine < 0:
+            return []
+        atteints = bytearray(len(self.types))
+        atteints[self.racine] = 1
+        for i in range(self.racine, -1, -1):
+            if atteints[i]:
+                if self.gauches[i] >= 0:
+                    atteints[self.gauches[i]] = 1
+                if self.droits[i] >= 0:
+                    atteints[self.droits[i]] = 1
+        return [i for i in range(self.racine + 1) if atteints[i]]
+
+    def vers_noeuds(self):
+        """Arbre de RegexNode équivalent (construit sans récursion)"""
+        noeuds = []
+        for i in range(len(self.types)):
+            gauche, droit = self.gauches[i], self.droits[i]
+            noeuds.append(RegexNode(
+                NOMS_TYPES[self.types[i]], self.valeurs[i],
+                noeuds[gauche] if gauche >= 0 else None,
+                noeuds[droit] if droit >= 0 else None,
+                self.debuts[i], self.fins[i]))
+        return noeuds[self.racine] if noeuds else None
+
+    @classmethod
+    def depuis_noeuds(cls, racine, source=''):
+        """Arbre compact à partir d'un arbre de RegexNode"""
+        arbre = cls(source)
+        numeros = {}
+        pile = [(racine, False)]
+        while pile:
+            node, enfants_traites = pile.pop()
+            enfants = [n for n in (node.left, node.right) if n is not None]
+            if enfants and not enfants_traites:
+                pile.append((node, True))
+                pile.extend((n, False) for n in reversed(enfants))
+                continue
+            numeros[id(node)] = arbre.ajouter(
+                TYPES_PAR_NOM[node.kind], node.value,
+                numeros[id(node.left)] if node.left is not None else -1,
+                numeros[id(node.right)] if node.right is not None else -1,
+                node.debut or 0, node.fin or 0)
+        arbre.racine = len(arbre) - 1
+        return arbre
+
+
+def verifier_operateurs(arbre, construction):
+    """ValueError si l'arbre utilise & ou ~, que seule la dérivation sait compiler"""
+    for type_, symbole in ((INTERSECTION, '&'), (COMPLEMENT, '~')):
+        if type_ in arbre.types:
+            raise ValueError(f"L'opérateur '{symbole}' n'est pas pris en charge par {construction} : "
+                             f"utilisez la construction par dérivées")
+
+
+def _erreur(message, position):
+    raise ValueError(f"{message} (position {position + 1})")
+
+
+def analyser_regex(regex, symboles=None):
+    """
+    Analyse l'expression et retourne son ArbreRegex ; ValueError si elle est
+    invalide. `symboles` (motif re compilé, optionnel) reconnaît des symboles
+    de plusieurs caractères, par exemple les variables X1, X12 d'un système
+    d'équations : là où il correspond, tout le texte reconnu forme un symbole.
+    """
+    arbre = ArbreRegex(regex)
+    operandes = []
+    operateurs = []  # (opérateur, position) ; '(' sert de marqueur de groupe
+    operande_precedent = False
+
+    def reduire():
+        operateur, position = operateurs.pop()
+        droit = operandes.pop()
+        if operateur == '~':
+            operandes.append(arbre.ajouter(COMPLEMENT, None, droit, -1, position, arbre.fins[droit]))
+            return
+        gauche = operandes.pop()
+        operandes.append(arbre.ajouter(
+            _BINAIRES[operateur], None, gauche, droit,
+            arbre.debuts[gauche], arbre.fins[droit]))
+
+    def empiler_binaire(operateur, position):
+        priorite = _PRIORITES[operateur]
+        while operateurs and operateurs[-1][0] != '(' and _PRIORITES[operateurs[-1][0]] >= priorite:
+            reduire()
+        operateurs.append((operateur, position))
+
+    i = 0
+    n = len(regex)
+    while i < n:
+        c = regex[i]
+
+        if c.isspace():
+            i += 1
+            continue
+
+        if c in '|+.&':
+            if not operande_precedent:
+                _erreur(f"Opérande manquant avant '{c}'", i)
+            empiler_binaire('|' if c == '+' else c, i)
+            operande_precedent = False
+
+        elif c == '~':
+            # Préfixe : attend son opérande, réduit avant tout opérateur binaire
+            if operande_precedent:
+                empiler_binaire('.', i)
+            operateurs.append(('~', i))
+            operande_precedent = False
+
+        elif c in '*?':
+            if not operande_precedent:
+                _erreur(f"Opérande manquant avant '{c}'", i)
+            sous_arbre = operandes[-1]
+            operandes[-1] = arbre.ajouter(STAR if c == '*' else OPTION, None, sous_arbre, -1,
+                                          arbre.debuts[sous_arbre], i + 1)
+
+        elif c == '{':
+            if not operande_precedent:
+                _erreur("Opérande manquant avant '{'", i)
+            fin = regex.find('}', i + 1)
+            if fin < 0:
+                _erreur("Accolade ouvrante non fermée", i)
+            sous_arbre = operandes[-1]
+            operandes[-1] = arbre.ajouter(REPETITION, _bornes(regex[i + 1:fin], i), sous_arbre, -1,
+                                          arbre.debuts[sous_arbre], fin + 1)
+            i = fin
+
+        elif c == '(':
+            if operande_precedent:
+                empiler_binaire('.', i)
+            operateurs.append(('(', i))
+            operande_precedent = False
+
+        elif c == ')':
+            if not operande_precedent:
+                if operateurs and operateurs[-1][0] == '(':
+                    # Groupe vide : mot vide
+                    operandes.append(arbre.ajouter(EPSILON, None, -1, -1, i, i))
+                else:
+                    _erreur("Opérande manquant avant ')'", i)
+            while operateurs and operateurs[-1][0] != '(':
+                reduire()
+            if not operateurs:
+                _erreur("Parenthèse fermante sans parenthèse ouvrante", i)
+            _, ouverture = operateurs.pop()
+            arbre.debuts[operandes[-1]] = ouverture
+            arbre.fins[operandes[-1]] = i + 1
+            operande_precedent = True
+
+        else:
+            if operande_precedent:
+                empiler_binaire('.', i)
+            if c == '[':
+                i = _classe(regex, i, arbre, operandes)
+            elif c == '\\':
+                if i + 1 >= n:
+                    _erreur("Caractère d'échappement en fin d'expression", i)
+                operandes.append(arbre.ajouter(CHAR, regex[i + 1], -1, -1, i, i + 2))
+                i += 1
+            elif c in ']}':
+                _erreur(f"'{c}' sans ouvrant correspondant", i)
+            elif c == SYMBOLE_EPSILON:
+                operandes.append(arbre.ajouter(EPSILON, None, -1, -1, i, i + 1))
+            elif symboles is not None and (long_symbole := symboles.match(regex, i)) and long_symbole.end() > i:
+                operandes.append(arbre.ajouter(CHAR, long_symbole.group(), -1, -1, i, long_symbole.end()))
+                i = long_symbole.end() - 1
+            else:
+                operandes.append(arbre.ajouter(CHAR, c, -1, -1, i, i + 1))
+            operande_precedent = True
+
+        i += 1
+
+    if not operande_precedent:
+        if operandes or operateurs:
+            position = operateurs[-1][1] if operateurs else n - 1
+            if operateurs and operateurs[-1][0] == '(':
+                _erreur("Parenthèse ouvrante non fermée", position)
+            _erreur("Opérande manquant en fin d'expression", n - 1)
+        # Expression vide : mot vide
+        operandes.append(arbre.ajouter(EPSILON, None, -1, -1, 0, 0))
+    while operateurs:
+        if operateurs[-1][0] == '(':
+            _erreur("Parenthèse ouvrante non fermée", operateurs[-1][1])
+        reduire()
+
+    arbre.racine = operandes.pop()
+    return arbre
+
+
+def _bornes(contenu, position):
+    """(m, n) de la répétition {contenu} ; n vaut None pour {m,}"""
+    morceaux = [m.strip() for m in contenu.split(',')]
+    if len(morceaux) > 2 or not all(m.isdigit() for m in morceaux if m) or not any(morceaux):
+        _erreur(f"Répétition invalide {{{contenu}}}", position)
+    minimum = int(morceaux[0]) if morceaux[0] else 0
+    if len(morceaux) == 1:
+        return minimum, minimum
+    maximum = int(morceaux[1]) if morceaux[1] else None
+    if maximum is not None and maximum < minimum:
+        _erreur(f"Répétition invalide {{{contenu}}} : {minimum} > {maximum}", position)
+    return minimum, maximum
+
+
+def _classe(regex, debut, arbre, operandes):
+    """Classe [..] à partir de regex[debut] == '[' ; retourne l'indice du ']'"""
+    fin = regex.find(']', debut + 1)
+    if fin < 0:
+        _erreur("Crochet ouvrant non fermé", debut)
+    contenu = regex[debut + 1:fin]
+    if not contenu:
+        _erreur("Classe de caractères vide", debut)
+    if contenu[0] == '^':
+        _erreur("Les classes complémentées [^...] ne sont pas prises en charge", debut)
+
+    symboles = {}
+    k = 0
+    while k < len(contenu):
+        if k + 2 < len(contenu) and contenu[k + 1] == '-':
+            premier, dernier = contenu[k], contenu[k + 2]
+            if ord(premier) > ord(dernier):
+                _erreur(f"Intervalle invalide {premier}-{dernier}", debut + 1 + k)
+            for code in range(ord(premier), ord(dernier) + 1):
+                symboles.setdefault(chr(code), debut + 1 + k)
+            k += 3
+        else:
+            symboles.setdefault(contenu[k], debut + 1 + k)
+            k += 1
+
+    courant = -1
+    for symbole, position in symboles.items():
+        feuille = arbre.ajouter(CHAR, symbole, -1, -1, position, position + 1)
+        courant = feuille if courant < 0 else arbre.ajouter(UNION, None, courant, feuille, debut, fin + 1)
+    arbre.debuts[courant] = debut
+    arbre.fins[courant] = fin + 1
+    operandes.append(courant)
+    return fin
+
+
+def parse_regex(regex):
+    """Arbre de RegexNode de l'expression (voir analyser_regex)"""
+    return analyser_regex(regex).vers_noeuds()
@@ -0,0 +1,253 @@
+# simplification_regex.py - Simplification algébrique d'un ArbreRegex
+#
+# Réécritures appliquées en un parcours ascendant, avant les constructions :
+#
+#   εE = Eε = E               (E*)* = (E+)* = (E?)* = E*      ε* = ε+ = ε? = ε
+#   E|E = E, E&E = E          (E*)? = (E?)? = E?... voir _unaire
+#   unions et intersections aplaties, membres en double retirés
+#   ε|E = E si E contient ε, E? sinon
+#   préfixes communs factorisés : ab|ac|a = a(b|c)?
+#   E{0,} = E*, E{1,} = E+, E{0,1} = E?, E{1} = E
+#
+# L'arbre obtenu reconnaît le même langage et n'a jamais plus de nœuds que
+# l'arbre d'origine : si les réécritures ne réduisent rien, l'arbre d'origine
+# est retourné tel quel. Les unions et concaténations imbriquées sont réunies
+# en listes avant d'être reconstruites (pas de recopie quadratique), et
+# aucun parcours n'est récursif.
+from regex_parser import (ArbreRegex, CHAR, EPSILON, UNION, CONCAT, STAR, PLUS, OPTION,
+                          REPETITION, INTERSECTION, COMPLEMENT)
+
+
+def taille(arbre):
+    """Nombre de nœuds accessibles depuis la racine"""
+    return len(arbre.ordre_postfixe())
+
+
+class _Constructeur:
+    """
+    Nœuds de l'arbre simplifié, avec pour chacun une clé structurelle (deux
+    sous-arbres de même clé reconnaissent le même langage) et sa nullabilité.
+    """
+
+    def __init__(self, source):
+        self.arbre = ArbreRegex(source)
+        self.cles = []
+        self.nullables = []
+        self._numeros_cles = {}
+
+    def noeud(self, type_, valeur=None, gauche=-1, droit=-1, debut=0, fin=0, cle=None):
+        if cle is None:
+            cle = (type_, valeur, self.cles[gauche] if gauche >= 0 else -1,
+                   self.cles[droit] if droit >= 0 else -1)
+        if type_ == CHAR:
+            nullable = False
+        elif type_ in (EPSILON, STAR, OPTION):
+            nullable = True
+        elif type_ == UNION:
+            nullable = self.nullables[gauche] or self.nullables[droit]
+        elif type_ in (CONCAT, INTERSECTION):
+            nullable = self.nullables[gauche] and self.nullables[droit]
+        elif type_ == COMPLEMENT:
+            nullable = not self.nullables[gauche]
+        elif type_ == REPETITION:
+            nullable = valeur[0] == 0 or self.nullables[gauche]
+        else:
+            nullable = self.nullables[gauche]
+        self.cles.append(self._numeros_cles.setdefault(cle, len(self._numeros_cles)))
+        self.nullables.append(nullable)
+        return self.arbre.ajouter(type_, valeur, gauche, droit, debut, fin)
+
+    def type_(self, i):
+        return self.arbre.types[i]
+
+    def enfant(self, i):
+        return self.arbre.gauches[i]
+
+    # ------------------------------------------------------------------
+    # Listes d'opérandes
+    # ------------------------------------------------------------------
+
+    def facteurs(self, i):
+        """Facteurs d'une concaténation construite (chaîne associée à droite)"""
+        resultat = []
+        while self.type_(i) == CONCAT:
+            resultat.append(self.arbre.gauches[i])
+            i = self.arbre.droits[i]
+        if self.type_(i) != EPSILON:
+            resultat.append(i)
+        return resultat
+
+    def membres(self, i, type_):
+        """Membres d'une union ou intersection construite (chaîne associée à droite)"""
+        resultat = []
+        while self.type_(i) == type_:
+            resultat.append(self.arbre.gauches[i])
+            i = self.arbre.droits[i]
+        resultat.append(i)
+        return resultat
+
+    def concatenation(self, facteurs, debut, fin):
+        if not facteurs:
+            return self.noeud(EPSILON, None, -1, -1, debut, fin)
+        resultat = facteurs[-1]
+        for facteur in reversed(facteurs[:-1]):
+            resultat = self.noeud(CONCAT, None, facteur, resultat, debut, fin)
+        return resultat
+
+    def chaine(self, type_, membres, debut, fin):
+        """
+        Union ou intersection des membres, aplatie et sans doublon ; la clé
+        ne dépend pas de l'ordre des membres.
+        """
+        vus = set()
+        uniques = []
+        for membre in membres:
+            for m in (self.membres(membre, type_) if self.type_(membre) == type_ else (membre,)):
+                if self.cles[m] not in vus:
+                    vus.add(self.cles[m])
+                    uniques.append(m)
+        resultat = uniques[-1]
+        for k in range(len(uniques) - 2, -1, -1):
+            cle = (type_, frozenset(self.cles[m] for m in uniques[k:]))
+            resultat = self.noeud(type_, None, uniques[k], resultat, debut, fin, cle)
+        return resultat
+
+    # ------------------------------------------------------------------
+    # Union avec factorisation des préfixes
+    # ------------------------------------------------------------------
+
+    def union(self, membres, debut, fin):
+        """
+        Union factorisée : les suites de facteurs des membres sont rangées
+        dans un arbre préfixe, puis chaque nœud de cet arbre devient
+        facteur.(union de ses suites), avec '?' si une suite s'y termine.
+        """
+        racine = [{}, False]  # [clé du facteur -> (facteur, sous-arbre), une suite se termine ici]
+        for membre in membres:
+            courant = racine
+            for facteur in self.facteurs(membre):
+                enfants = courant[0]
+                cle = self.cles[facteur]
+                if cle not in enfants:
+                    enfants[cle] = (facteur, [{}, False])
+                courant = enfants[cle][1]
+            courant[1] = True
+
+        resultats = {}  # id(nœud préfixe) -> expression de ce qui suit
+        pile = [(racine, False)]
+        while pile:
+            prefixe, prets = pile.pop()
+            enfants, termine = prefixe
+            if not prets:
+                pile.append((prefixe, True))
+                pile.extend((sous, False) for _, sous in enfants.values())
+                continue
+            alternatives = []
+            for facteur, sous in enfants.values():
+                suite = resultats.pop(id(sous))
+                if suite is None:
+                    alternatives.append(facteur)
+                else:
+                    alternatives.append(self.concatenation([facteur] + self.facteurs(suite), debut, fin))
+            if not alternatives:
+                resultats[id(prefixe)] = None  # ε
+                continue
+            expression = self.chaine(UNION, alternatives, debut, fin)
+            if termine and not self.nullables[expression]:
+                expression = self.noeud(OPTION, None, expression, -1, debut, fin)
+            resultats[id(prefixe)] = expression
+        expression = resultats[id(racine)]
+        return self.noeud(EPSILON, None, -1, -1, debut, fin) if expression is None else expression
+
+    # ------------------------------------------------------------------
+    # Opérateurs unaires
+    # ------------------------------------------------------------------
+
+    def unaire(self, type_, corps, valeur, debut, fin):
+        """E*, E+, E?, E{m,n} et ~E après simplification de leur corps"""
+        if type_ == REPETITION:
+            minimum, maximum = valeur
+            if maximum == 0 or self.type_(corps) == EPSILON:
+                return self.noeud(EPSILON, None, -1, -1, debut, fin)
+            if minimum == maximum == 1:
+                return corps
+            raccourcis = {(0, None): STAR, (1, None): PLUS, (0, 1): OPTION}
+            if (minimum, maximum) not in raccourcis:
+                return self.noeud(REPETITION, valeur, corps, -1, debut, fin)
+            type_ = raccourcis[minimum, maximum]
+        if type_ == COMPLEMENT:
+            if self.type_(corps) == COMPLEMENT:
+                return self.enfant(corps)
+            return self.noeud(COMPLEMENT, None, corps, -1, debut, fin)
+        if self.type_(corps) == EPSILON:
+            return corps
+        interne = self.type_(corps)
+        if type_ == STAR:
+            # (E*)* = (E+)* = (E?)* = E*
+            while self.type_(corps) in (STAR, PLUS, OPTION):
+                corps = self.enfant(corps)
+            return self.noeud(STAR, None, corps, -1, debut, fin)
+        if type_ == PLUS:
+            if interne in (STAR, PLUS):
+                return corps
+            if interne == OPTION:  # (E?)+ = E*
+                return self.unaire(STAR, self.enfant(corps), None, debut, fin)
+            return self.noeud(PLUS, None, corps, -1, debut, fin)
+        # E? = E si E contient déjà ε ; (E+)? = E*
+        if self.nullables[corps]:
+            return corps
+        if interne == PLUS:
+            return self.unaire(STAR, self.enfant(corps), None, debut, fin)
+        return self.noeud(OPTION, None, corps, -1, debut, fin)
+
+
+def simplifier(arbre):
+    """
+    ArbreRegex simplifié équivalent à `arbre` (non modifié), jamais plus
+    grand ; `arbre` lui-même si rien n'a pu être réduit.
+    """
+    constructeur = _Constructeur(arbre.source)
+    construits = {}  # nœud d'origine -> nœud simplifié
+    en_attente = {}  # nœud d'origine -> (type, liste des opérandes) pas encore construit
+
+    def operandes(enfant, type_):
+        if enfant in en_attente and en_attente[enfant][0] == type_:
+            return en_attente.pop(enfant)[1]
+        noeud = construit(enfant)
+        if type_ == CONCAT:
+            return constructeur.facteurs(noeud)
+        if constructeur.type_(noeud) == type_:
+            return constructeur.membres(noeud, type_)
+        if type_ == UNION and constructeur.type_(noeud) == OPTION:
+            # E? dans une union : ε|E, pour que ε et E soient factorisés avec les autres membres
+            return [constructeur.noeud(EPSILON, None, -1, -1, arbre.debuts[enfant], arbre.debuts[enfant]),
+                    constructeur.enfant(noeud)]
+        return [noeud]
+
+    def construit(enfant):
+        if enfant not in en_attente:
+            return construits.pop(enfant)
+        type_, liste = en_attente.pop(enfant)
+        debut, fin = arbre.debuts[enfant], arbre.fins[enfant]
+        if type_ == CONCAT:
+            return constructeur.concatenation(liste, debut, fin)
+        if type_ == UNION:
+            return constructeur.union(liste, debut, fin)
+        return constructeur.chaine(INTERSECTION, liste, debut, fin)
+
+    for i in arbre.ordre_postfixe():
+        type_ = arbre.types[i]
+        debut, fin = arbre.debuts[i], arbre.fins[i]
+        if type_ in (UNION, INTERSECTION, CONCAT):
+            liste = operandes(arbre.gauches[i], type_)
+            liste.extend(operandes(arbre.droits[i], type_))
+            en_attente[i] = (type_, liste)
+            continue
+        if type_ in (CHAR, EPSILON):
+            construits[i] = constructeur.noeud(type_, arbre.valeurs[i], -1, -1, debut, fin)
+        else:
+            construits[i] = constructeur.unaire(type_, construit(arbre.gauches[i]), arbre.valeurs[i], debut, fin)
+
+    resultat = constructeur.arbre
+    resultat.racine = construit(arbre.racine)
+    return resultat if taille(resultat) < taille(arbre) else arbre
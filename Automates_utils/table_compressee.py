@@ -0,0 +1,188 @@
+# table_compressee.py - Tables de transitions compressées (format « peigne » de lex/yacc)
+#
+# Pour un AFD, la plupart des transitions d'un état vont souvent vers la même
+# cible. On garde pour chaque état une transition par défaut, et seules les
+# exceptions sont rangées dans des tableaux partagés : la ligne de l'état q est
+# décalée de base[q] et ses cases sont marquées q dans `verif`, ce qui permet à
+# plusieurs lignes creuses de s'imbriquer comme les dents de deux peignes.
+#
+#   delta(q, a) = suivant[base[q] + a] si verif[base[q] + a] == q
+#                 defaut[q]            sinon (-1 : pas de transition)
+from array import array
+from collections import Counter, deque
+
+from automate_compact import AutomateCompact, TableNoms
+from classes_alphabet import ClassesAlphabet
+
+AUCUNE = -1
+
+
+def reordonner_bfs(compact):
+    """
+    Renumérote les états dans l'ordre d'un parcours en largeur depuis les
+    états initiaux : les états voisins sont proches en mémoire. Les états
+    inaccessibles sont placés à la fin, dans leur ordre d'origine.
+    """
+    n = compact.nombre_etats
+    ordre = []
+    vus = bytearray(n)
+    file = deque()
+    for q in compact.initiaux:
+        if not vus[q]:
+            vus[q] = 1
+            file.append(q)
+    while file:
+        q = file.popleft()
+        ordre.append(q)
+        for cible in compact.successeurs(q):
+            if not vus[cible]:
+                vus[cible] = 1
+                file.append(cible)
+    ordre.extend(q for q in range(n) if not vus[q])
+
+    nouveau = array('i', bytes(4 * n))
+    for rang, q in enumerate(ordre):
+        nouveau[q] = rang
+
+    etats = TableNoms(compact.etats[q] for q in ordre)
+    arcs = [(nouveau[q], a, nouveau[cible]) for q, a, cible in compact.arcs()]
+    return AutomateCompact.depuis_arcs(
+        etats, compact.alphabet,
+        [nouveau[q] for q in compact.initiaux],
+        [nouveau[q] for q in compact.finaux],
+        arcs)
+
+
+class TableCompressee:
+    """
+    Table de transitions d'un AFD en format peigne.
+
+    Construite à partir d'un AutomateCompact déterministe ; les numéros d'états
+    et de symboles sont ceux de l'automate compact.
+    """
+
+    __slots__ = ('etats', 'alphabet', 'initial', 'finaux',
+                 'defaut', 'base', 'suivant', 'verif', 'classes')
+
+    def __init__(self, compact):
+        if not compact.est_deterministe():
+            raise ValueError("La table compressée ne s'applique qu'à un automate déterministe")
+
+        n = compact.nombre_etats
+        self.classes = None
+        self.etats = compact.etats
+        self.alphabet = compact.alphabet
+        self.initial = compact.initiaux[0] if len(compact.initiaux) else AUCUNE
+        self.finaux = bytearray(n)
+        for q in compact.finaux:
+            self.finaux[q] = 1
+
+        self.defaut = array('i', [AUCUNE]) * n
+        self.base = array('i', bytes(4 * n))
+        lignes = []
+        for q in range(n):
+            debut, fin = compact.debuts[q], compact.debuts[q + 1]
+            ligne = list(zip(compact.symboles[debut:fin], compact.cibles[debut:fin]))
+            # Cible la plus fréquente sur tout l'alphabet, -1 comptant pour
+            # chaque symbole sans transition ; les autres cases sont des exceptions
+            frequences = Counter(c for _, c in ligne)
+            manquants = len(self.alphabet) - len(ligne)
+            cible, nombre = frequences.most_common(1)[0] if ligne else (AUCUNE, 0)
+            if manquants >= nombre:
+                cible = AUCUNE
+            self.defaut[q] = cible
+            if cible != AUCUNE:
+                presents = dict(ligne)
+                ligne = [(a, presents.get(a, AUCUNE)) for a in range(len(self.alphabet))
+                         if presents.get(a, AUCUNE) != cible]
+            lignes.append(ligne)
+
+        self._ranger(lignes)
+
+    def _ranger(self, lignes):
+        """Placement « premier ajustement » des lignes, les plus remplies d'abord"""
+        suivant = array('i')
+        verif = array('i')
+        occupees = bytearray()
+        premiere_libre = 0
+        for q in sorted(range(len(lignes)), key=lambda q: -len(lignes[q])):
+            ligne = lignes[q]
+            if not ligne:
+                continue
+            # Seuls les décalages plaçant le premier symbole sur une case libre sont essayés
+            position = max(premiere_libre, ligne[0][0])
+            while True:
+                decalage = position - ligne[0][0]
+                fin = decalage + ligne[-1][0] + 1
+                if fin > len(occupees):
+                    extension = fin - len(occupees)
+                    occupees.extend(bytes(extension))
+                    suivant.extend([AUCUNE] * extension)
+                    verif.extend([AUCUNE] * extension)
+                if not any(occupees[decalage + a] for a, _ in ligne):
+                    break
+                position = occupees.find(0, position + 1)
+                if position < 0:
+                    position = len(occupees)
+            self.base[q] = decalage
+            for a, cible in ligne:
+                occupees[decalage + a] = 1
+                suivant[decalage + a] = cible
+                verif[decalage + a] = q
+            while premiere_libre < len(occupees) and occupees[premiere_libre]:
+                premiere_libre += 1
+        self.suivant = suivant
+        self.verif = verif
+
+    @classmethod
+    def depuis_automate(cls, automate, reordonner=True, classes=False):
+        """
+        Compile un objet Automate déterministe. Avec `classes`, les colonnes
+        sont les classes de symboles équivalents (voir ClassesAlphabet).
+        """
+        compact = AutomateCompact.depuis_automate(automate)
+        partition = None
+        if classes:
+            partition = ClassesAlphabet.depuis_automate(automate)
+            compact = partition.restreindre(compact)
+        if reordonner:
+            compact = reordonner_bfs(compact)
+        table = cls(compact)
+        table.classes = partition
+        return table
+
+    def transition(self, q, a):
+        """État atteint depuis q par le symbole numéro a, ou -1"""
+        k = self.base[q] + a
+        if k < len(self.verif) and self.verif[k] == q:
+            return self.suivant[k]
+        return self.defaut[q]
+
+    def accepte(self, mot):
+        """Reconnaissance d'un mot (suite de symboles)"""
+        q = self.initial
+        if q == AUCUNE:
+            return False
+        if self.classes is not None:
+            codes = self.classes.traduire(mot)
+        else:
+            numeros = self.alphabet.numeros
+            codes = [numeros.get(symbole, len(numeros)) for symbole in mot]
+        for a in codes:
+            if a >= len(self.alphabet):
+                return False
+            q = self.transition(q, a)
+            if q == AUCUNE:
+                return False
+        return bool(self.finaux[q])
+
+    def taille_octets(self):
+        """Mémoire occupée par les tableaux de la table"""
+        return sum(t.itemsize * len(t) for t in (self.defaut, self.base, self.suivant, self.verif)) \
+            + len(self.finaux)
+
+    def taux_remplissage(self):
+        """Proportion de cases utilisées dans les tableaux d'exceptions"""
+        if not self.verif:
+            return 1.0
+        return sum(1 for q in self.verif if q != AUCUNE) / len(self.verif)
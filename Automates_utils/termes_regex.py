@@ -0,0 +1,485 @@
+# termes_regex.py - Termes d'expressions régulières partagés (hash-consing)
+#
+# Chaque terme n'existe qu'en un seul exemplaire : deux termes égaux sont le
+# même objet, l'égalité et le hachage se font par identité. Les constructeurs
+# normalisent au passage (associativité, commutativité et idempotence de
+# l'union et de l'intersection, éléments neutres et absorbants), ce qui garantit que les dérivées
+# successives d'un terme ne prennent qu'un nombre fini de formes.
+#
+# La table d'internement ne garde pas les termes en vie : un terme inutilisé
+# disparaît avec les dérivées mémorisées sur lui.
+import itertools
+import threading
+import weakref
+
+from regex_parser import (analyser_regex, CHAR, EPSILON, UNION, CONCAT, STAR, PLUS, OPTION,
+                          REPETITION, INTERSECTION, COMPLEMENT, SYMBOLE_EPSILON)
+
+# Types de termes
+VIDE = 'vide'
+MOT_VIDE = 'epsilon'
+SYMBOLE = 'symbole'
+T_CONCAT = 'concat'
+T_UNION = 'union'
+T_ETOILE = 'etoile'
+T_REPETITION = 'repetition'  # valeur (m, n), n = None si non bornée
+T_INTER = 'intersection'
+T_COMPL = 'complement'
+
+_table = weakref.WeakValueDictionary()
+_verrou = threading.Lock()
+_numeros = itertools.count()
+
+
+class Terme:
+    """
+    Terme interné : ne pas instancier directement, passer par les
+    constructeurs du module (symbole, concat, union, etoile...).
+    """
+
+    __slots__ = ('type', 'valeur', 'enfants', 'nullable', 'numero',
+                 'derivees', 'partielles', 'reecritures', '__weakref__')
+
+    def __repr__(self):
+        return f"Terme({texte(self)!r})"
+
+    def __lt__(self, autre):
+        return self.numero < autre.numero
+
+
+def _interner(type_, valeur, enfants, nullable):
+    cle = (type_, valeur, enfants)
+    terme = _table.get(cle)
+    if terme is not None:
+        return terme
+    nouveau = Terme()
+    nouveau.type = type_
+    nouveau.valeur = valeur
+    nouveau.enfants = enfants
+    nouveau.nullable = nullable
+    nouveau.numero = next(_numeros)
+    nouveau.derivees = {}
+    nouveau.partielles = {}
+    nouveau.reecritures = {}
+    with _verrou:
+        return _table.setdefault(cle, nouveau)
+
+
+# ----------------------------------------------------------------------
+# Constructeurs normalisants
+# ----------------------------------------------------------------------
+
+def vide():
+    """∅, le langage vide"""
+    return _interner(VIDE, None, (), False)
+
+
+def mot_vide():
+    """ε"""
+    return _interner(MOT_VIDE, None, (), True)
+
+
+def symbole(lettre):
+    return _interner(SYMBOLE, lettre, (), False)
+
+
+def concat(gauche, droite):
+    """
+    Concaténation : ∅ absorbant, ε neutre, associée à droite
+    ((ab)c devient a(bc)) pour que les dérivées restent en forme canonique.
+    """
+    if gauche.type == VIDE or droite.type == VIDE:
+        return vide()
+    if gauche.type == MOT_VIDE:
+        return droite
+    if droite.type == MOT_VIDE:
+        return gauche
+    facteurs = []
+    while gauche.type == T_CONCAT:
+        facteurs.append(gauche.enfants[0])
+        gauche = gauche.enfants[1]
+    facteurs.append(gauche)
+    resultat = droite
+    for facteur in reversed(facteurs):
+        resultat = _interner(T_CONCAT, None, (facteur, resultat), facteur.nullable and resultat.nullable)
+    return resultat
+
+
+def tout():
+    """Σ*, écrit ~∅"""
+    return complement(vide())
+
+
+def union(*termes):
+    """Union n-aire aplatie, sans doublon ni ∅, triée par numéro de terme ; Σ* absorbant"""
+    membres = set()
+    for terme in termes:
+        if terme.type == T_UNION:
+            membres.update(terme.enfants)
+        elif terme.type == T_COMPL and terme.enfants[0].type == VIDE:
+            return terme
+        elif terme.type != VIDE:
+            membres.add(terme)
+    if not membres:
+        return vide()
+    if len(membres) == 1:
+        return membres.pop()
+    enfants = tuple(sorted(membres))
+    return _interner(T_UNION, None, enfants, any(t.nullable for t in enfants))
+
+
+def intersection(*termes):
+    """Intersection n-aire aplatie, sans doublon ni Σ*, triée ; ∅ absorbant"""
+    membres = set()
+    for terme in termes:
+        if terme.type == T_INTER:
+            membres.update(terme.enfants)
+        elif terme.type == VIDE:
+            return terme
+        elif not (terme.type == T_COMPL and terme.enfants[0].type == VIDE):
+            membres.add(terme)
+    if not membres:
+        return tout()
+    if len(membres) == 1:
+        return membres.pop()
+    enfants = tuple(sorted(membres))
+    return _interner(T_INTER, None, enfants, all(t.nullable for t in enfants))
+
+
+def complement(terme):
+    """Complément par rapport à Σ* ; ~~E = E"""
+    if terme.type == T_COMPL:
+        return terme.enfants[0]
+    return _interner(T_COMPL, None, (terme,), not terme.nullable)
+
+
+def etoile(terme):
+    """∅* = ε* = ε, (E*)* = E*"""
+    if terme.type in (VIDE, MOT_VIDE):
+        return mot_vide()
+    if terme.type == T_ETOILE:
+        return terme
+    return _interner(T_ETOILE, None, (terme,), True)
+
+
+def option(terme):
+    return union(mot_vide(), terme)
+
+
+def plus(terme):
+    return concat(terme, etoile(terme))
+
+
+def repetition(terme, minimum, maximum):
+    """E{m,n} gardé tel quel (sans recopie) ; maximum None : non borné"""
+    if maximum == 0 or terme.type == MOT_VIDE:
+        return mot_vide()
+    if terme.type == VIDE:
+        return mot_vide() if minimum == 0 else vide()
+    if maximum is None and minimum == 0:
+        return etoile(terme)
+    if minimum == maximum == 1:
+        return terme
+    return _interner(T_REPETITION, (minimum, maximum), (terme,), minimum == 0 or terme.nullable)
+
+
+# ----------------------------------------------------------------------
+# Conversions
+# ----------------------------------------------------------------------
+
+def concat_liste(facteurs):
+    """Concaténation d'une suite de termes, construite en une passe de droite à gauche"""
+    resultat = mot_vide()
+    for facteur in reversed(facteurs):
+        resultat = concat(facteur, resultat)
+    return resultat
+
+
+def facteurs(terme):
+    """Facteurs d'une concaténation (chaîne associée à droite) ; [] pour ε"""
+    if terme.type == MOT_VIDE:
+        return []
+    resultat = []
+    while terme.type == T_CONCAT:
+        resultat.append(terme.enfants[0])
+        terme = terme.enfants[1]
+    resultat.append(terme)
+    return resultat
+
+
+def depuis_arbre(arbre):
+    """
+    Terme d'un ArbreRegex (parcours postfixe, sans récursion). Les suites de
+    concaténations et d'unions sont d'abord réunies en listes : les combiner
+    deux à deux recopierait la partie déjà construite à chaque étape.
+    """
+    termes = {}
+    en_attente = {}  # nœud -> (type, liste des opérandes) pas encore construit
+
+    def operandes(enfant, type_):
+        if enfant in en_attente and en_attente[enfant][0] == type_:
+            return en_attente.pop(enfant)[1]
+        return [terme_de(enfant)]
+
+    def terme_de(enfant):
+        if enfant in en_attente:
+            type_, liste = en_attente.pop(enfant)
+            if type_ == UNION:
+                return union(*liste)
+            return intersection(*liste) if type_ == INTERSECTION else concat_liste(liste)
+        return termes.pop(enfant)
+
+    for i in arbre.ordre_postfixe():
+        type_ = arbre.types[i]
+        if type_ in (UNION, INTERSECTION, CONCAT):
+            liste = operandes(arbre.gauches[i], type_)
+            liste.extend(operandes(arbre.droits[i], type_))
+            en_attente[i] = (type_, liste)
+            continue
+        if type_ == CHAR:
+            terme = symbole(arbre.valeurs[i])
+        elif type_ == EPSILON:
+            terme = mot_vide()
+        else:
+            gauche = terme_de(arbre.gauches[i])
+            if type_ == STAR:
+                terme = etoile(gauche)
+            elif type_ == PLUS:
+                terme = plus(gauche)
+            elif type_ == OPTION:
+                terme = option(gauche)
+            elif type_ == REPETITION:
+                terme = repetition(gauche, *arbre.valeurs[i])
+            elif type_ == COMPLEMENT:
+                terme = complement(gauche)
+            else:
+                raise ValueError(f"Nœud inconnu: {type_}")
+        termes[i] = terme
+    return terme_de(arbre.racine)
+
+
+def depuis_regex(regex):
+    return depuis_arbre(analyser_regex(regex))
+
+
+def sous_termes(terme, vus=None):
+    """
+    Tous les sous-termes distincts, enfants avant parents. Avec `vus`
+    (ensemble complété au passage), seuls les sous-termes absents de `vus`
+    sont parcourus : plusieurs racines se parcourent ainsi en une fois.
+    """
+    vus = set() if vus is None else vus
+    ordre = []
+    pile = [(terme, False)]
+    while pile:
+        courant, enfants_traites = pile.pop()
+        if enfants_traites:
+            ordre.append(courant)
+            continue
+        if courant in vus:
+            continue
+        vus.add(courant)
+        pile.append((courant, True))
+        pile.extend((enfant, False) for enfant in courant.enfants if enfant not in vus)
+    return ordre
+
+
+def taille_developpee(terme, tailles=None):
+    """
+    Nombre de nœuds du terme une fois développé en arbre (le texte d'un
+    terme partagé peut être exponentiel en sa taille). Avec `tailles`
+    (dictionnaire complété au passage), le parcours s'arrête aux sous-termes
+    déjà mesurés : chaque nœud n'est visité qu'une fois pour plusieurs racines.
+    """
+    tailles = {} if tailles is None else tailles
+    pile = [(terme, False)]
+    while pile:
+        courant, enfants_traites = pile.pop()
+        if courant in tailles:
+            continue
+        if enfants_traites:
+            tailles[courant] = 1 + sum(tailles[enfant] for enfant in courant.enfants)
+        else:
+            pile.append((courant, True))
+            pile.extend((enfant, False) for enfant in courant.enfants if enfant not in tailles)
+    return tailles[terme]
+
+
+def vers_tables(termes):
+    """
+    Forme sérialisable (pickle, JSON) d'une suite de termes, partage compris :
+    (nœuds (type, valeur, indices des enfants), enfants avant parents ;
+    indices des termes dans les nœuds). Sert à passer des termes d'un
+    processus à l'autre, où l'internement doit être refait.
+    """
+    numeros = {}
+    noeuds = []
+    for terme in termes:
+        pile = [terme]
+        while pile:
+            courant = pile[-1]
+            if courant in numeros:
+                pile.pop()
+                continue
+            manquants = [e for e in courant.enfants if e not in numeros]
+            if manquants:
+                pile.extend(manquants)
+                continue
+            pile.pop()
+            numeros[courant] = len(noeuds)
+            noeuds.append((courant.type, courant.valeur, tuple(numeros[e] for e in courant.enfants)))
+    return noeuds, [numeros[terme] for terme in termes]
+
+
+def depuis_tables(noeuds, racines):
+    """Termes (internés dans ce processus) d'une forme produite par vers_tables"""
+    termes = []
+    for type_, valeur, enfants in noeuds:
+        fils = [termes[i] for i in enfants]
+        if type_ == VIDE:
+            terme = vide()
+        elif type_ == MOT_VIDE:
+            terme = mot_vide()
+        elif type_ == SYMBOLE:
+            terme = symbole(valeur)
+        elif type_ == T_CONCAT:
+            terme = concat(*fils)
+        elif type_ == T_UNION:
+            terme = union(*fils)
+        elif type_ == T_INTER:
+            terme = intersection(*fils)
+        elif type_ == T_COMPL:
+            terme = complement(fils[0])
+        elif type_ == T_ETOILE:
+            terme = etoile(fils[0])
+        elif type_ == T_REPETITION:
+            terme = repetition(fils[0], *valeur)
+        else:
+            raise ValueError(f"Terme inconnu: {type_}")
+        termes.append(terme)
+    return [termes[i] for i in racines]
+
+
+def alphabet(terme):
+    """Symboles apparaissant dans le terme, triés"""
+    return sorted({t.valeur for t in sous_termes(terme) if t.type == SYMBOLE})
+
+
+_PRIORITES = {T_UNION: 1, T_INTER: 2, T_CONCAT: 3, T_COMPL: 4}
+# Taille minimale (en nœuds) d'un sous-terme commun pour qu'il soit nommé
+TAILLE_MIN_PARTAGE = 8
+# Préfixes candidats des noms de texte_partage, dans l'ordre de préférence
+_PREFIXES_PARTAGE = tuple('EFGHKLMNPQRSTUVWYZ') + tuple('ΓΔΘΛΞΠΦΨΩ')
+
+
+def _ecrire(ordre, noms):
+    """
+    Texte de chaque terme de `ordre` (enfants avant parents) ; un enfant
+    présent dans `noms` est écrit par son nom.
+    """
+    morceaux = {}
+
+    def morceau(enfant):
+        return noms.get(enfant) or morceaux[enfant]
+
+    for t in ordre:
+        if t.type == VIDE:
+            morceaux[t] = '∅'
+        elif t.type == MOT_VIDE:
+            morceaux[t] = SYMBOLE_EPSILON
+        elif t.type == SYMBOLE:
+            lettre = t.valeur
+            morceaux[t] = '\\' + lettre if lettre in ' |+&~.*?()[]{}\\ε' else lettre
+        else:
+            priorite = _PRIORITES.get(t.type, 5)
+
+            def entoure(enfant):
+                # Parenthèses si l'enfant lie moins fort que t (un nom est atomique)
+                if enfant not in noms and _PRIORITES.get(enfant.type, 5) < priorite:
+                    return f"({morceaux[enfant]})"
+                return morceau(enfant)
+
+            if t.type == T_UNION:
+                morceaux[t] = '+'.join(entoure(e) for e in t.enfants)
+            elif t.type == T_INTER:
+                morceaux[t] = '&'.join(entoure(e) for e in t.enfants)
+            elif t.type == T_CONCAT:
+                morceaux[t] = ''.join(entoure(e) for e in t.enfants)
+            elif t.type == T_COMPL:
+                morceaux[t] = '~' + entoure(t.enfants[0])
+            elif t.type == T_ETOILE:
+                morceaux[t] = entoure(t.enfants[0]) + '*'
+            elif t.type == T_REPETITION:
+                minimum, maximum = t.valeur
+                bornes = f"{minimum}" if minimum == maximum else f"{minimum},{'' if maximum is None else maximum}"
+                morceaux[t] = entoure(t.enfants[0]) + '{' + bornes + '}'
+    return morceaux
+
+
+def _premier_niveau(terme, morceaux, noms, separateur):
+    """Texte complet d'un terme écrit par _ecrire, union externe séparée par `separateur`"""
+    if terme.type == T_UNION:
+        return separateur.join(noms.get(e) or morceaux[e] for e in terme.enfants)
+    return morceaux[terme]
+
+
+def texte(terme, separateur='+'):
+    """
+    Écriture du terme dans la syntaxe de regex_parser ('+' pour l'union) ;
+    ∅, qui n'a pas d'écriture dans cette syntaxe, est noté '∅'. `separateur`
+    sépare les membres de l'union la plus externe seulement : avec ' + ',
+    les termes de premier niveau se découpent par split(' + ').
+    """
+    return _premier_niveau(terme, _ecrire(sous_termes(terme), {}), {}, separateur)
+
+
+def texte_partage(racines, prefixe=None, taille_min=TAILLE_MIN_PARTAGE, separateur='+'):
+    """
+    Écriture de plusieurs termes avec leurs sous-termes communs nommés
+    (let-binding) : un sous-terme utilisé au moins deux fois, dont l'écriture
+    (noms compris) fait au moins `taille_min` nœuds, est défini une fois sous
+    le nom prefixe1, prefixe2... et écrit par ce nom partout ailleurs. La
+    taille du résultat est bornée par celle du DAG, là où texte() peut être
+    exponentiel.
+
+    racines : {nom: terme}. Sans `prefixe`, le premier de _PREFIXES_PARTAGE
+    dont aucune lettre n'apparaît dans les symboles est pris (ValueError
+    s'il n'y en a pas). Retourne (définitions [(nom, texte)], chaque nom
+    n'utilisant que des noms définis avant lui ; {nom de racine: texte}).
+    """
+    # Un seul parcours du DAG commun à toutes les racines
+    ordre = []
+    vus = set()
+    for terme in racines.values():
+        ordre.extend(sous_termes(terme, vus))
+    references = {}
+    lettres = set()
+    for terme in racines.values():
+        references[terme] = references.get(terme, 0) + 1
+    for t in ordre:
+        for e in t.enfants:
+            references[e] = references.get(e, 0) + 1
+        if t.type == SYMBOLE:
+            lettres.update(t.valeur)
+
+    if prefixe is None:
+        prefixe = next((p for p in _PREFIXES_PARTAGE if lettres.isdisjoint(p)), None)
+        if prefixe is None:
+            raise ValueError("Aucun préfixe de nom libre : toutes les lettres candidates sont des symboles")
+
+    noms = {}
+    tailles = {}
+    for t in ordre:
+        tailles[t] = 1 + sum(1 if e in noms else tailles[e] for e in t.enfants)
+        if references[t] >= 2 and tailles[t] >= taille_min:
+            noms[t] = f"{prefixe}{len(noms) + 1}"
+
+    morceaux = _ecrire(ordre, noms)
+    definitions = [(nom, _premier_niveau(t, morceaux, noms, separateur)) for t, nom in noms.items()]
+    textes = {nom: noms.get(terme) or _premier_niveau(terme, morceaux, noms, separateur)
+              for nom, terme in racines.items()}
+    return definitions, textes
+
+
+# ∅, ε et Σ* servent partout (comparaisons par identité) : on les garde en vie
+_PERMANENTS = (vide(), mot_vide(), tout())
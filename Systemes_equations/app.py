@@ -1,11 +1,13 @@
 from flask import Flask, render_template, request, jsonify
-import re
 from typing import Dict, List, Set, Tuple
-from utils import distribute_concatenation , simplify_expression
+from linear_system import LinearSystem, MAX_SOLUTION_TEXT, shared_solution_texts, solution_text
 from decimal import Decimal, ROUND_HALF_UP
 
 app = Flask(__name__)
 
+# Au-delà, les étapes de résolution ne sont pas détaillées
+MAX_DETAILED_EQUATIONS = 50
+
 class AutomatonSolver:
     def __init__(self):
         self.equations = {}
@@ -47,252 +49,6 @@ class AutomatonSolver:
             
         return equations
         
-########################################################################################    
-    
-    # Cette partie permet de definir le lemme d'arden i.e
-    
-    def apply_arden_lemma(self, variable, coefficient, other_terms):
-        """Applique le lemme d'Arden: X = AX + B => X = A*B"""
-        if coefficient and coefficient != "ε":
-            if other_terms and other_terms != "":
-                return f"({coefficient})*({other_terms})"
-            else:
-                return f"({coefficient})*"
-        else:
-            return other_terms if other_terms else "ε"
-            
-########################################################################################    
-    
-
-    def parse_equation(self, equation, variable):
-        """Parse une équation pour extraire le coefficient de la variable et les autres termes"""
-        terms = [term.strip() for term in equation.split(' + ')]
-        coefficient = ""
-        other_terms = []
-        
-        for term in terms:
-            if variable in term:
-                # Terme récursif - extraire le coefficient
-                coeff = term.replace(variable, '').strip()
-                if coeff == "":
-                    coefficient = "ε"
-                else:
-                    coefficient = coeff
-            else:
-                other_terms.append(term)
-        
-        other_part = " + ".join(other_terms) if other_terms else ""
-        return coefficient, other_part
-        
-
-########################################################################################    
-    
-    # Cette fonction me permet me permet de remplacer une dans d'autres equations EX: (1) dans (2) et (3)
-
-    def substitute_in_equation(self, equation, variable, substitution):
-        """Substitue une variable dans une équation"""
-        # Remplacer toutes les occurrences de la variable
-        if variable in equation:
-            if substitution == "ε":
-                # Si la substitution est ε, on peut simplifier
-                new_equation = equation.replace(variable, "")
-            else:
-                new_equation = equation.replace(variable, f"({substitution})")
-            return simplify_expression(new_equation)
-        return equation
-
-        
-########################################################################################    
-    
-    # Cette fonction me permet de groupe les termes d'une équation 
-####################
-
-    def group_terms_by_variable(self, equation, target_variable):
-        """Groupe les termes d'une équation selon qu'ils contiennent la variable cible ou non"""
-        terms = [term.strip() for term in equation.split(' + ') if term.strip()]
-        
-        recursive_terms = []
-        other_terms = []
-        
-        for term in terms:
-            if target_variable in term:
-                recursive_terms.append(term)
-            else:
-                other_terms.append(term)
-        
-        # Extraire les coefficients des termes récursifs
-        
-        coefficients = []
-        for term in recursive_terms:
-            coeff = term.replace(target_variable, '').strip()
-            if coeff == "":
-                coefficients.append("ε")
-            else:
-                coefficients.append(coeff)
-        
-        # Combiner les coefficients
-        
-        if coefficients:
-            if len(coefficients) == 1:
-                combined_coeff = coefficients[0]
-            else:
-                combined_coeff = " + ".join(coefficients)
-        else:
-            combined_coeff = ""
-        
-        other_part = " + ".join(other_terms) if other_terms else ""
-        
-        return combined_coeff, other_part
-
-######################################################################################## 
-   
-  #Cette fonction defini la priorité sur la valeur sur laquelle le lemme d'arden doit s'appliquer 
-####################    
-
-    def variable_score(self, var, eq):
-        """
-        Calcule un score de priorité pour déterminer l'ordre de résolution.
-        Plus le score est bas, plus la variable est prioritaire.
-        """
-        score = 0
-        
-        # Vérifier si la variable a un terme récursif direct
-        has_recursive_term = var in eq
-        
-        if has_recursive_term:
-            # Priorité haute pour les variables avec terme récursif
-            score = 1
-            
-            # Analyser le coefficient du terme récursif
-            coefficient, other_terms = self.group_terms_by_variable(eq, var)
-            
-            # Si le coefficient est simple (une lettre), priorité encore plus haute
-            if coefficient and len(coefficient) == 1 and coefficient.isalpha():
-                score = 0  # Priorité maximale
-            
-            # Pénalité si beaucoup d'autres variables dans les autres termes
-            other_vars = set(re.findall(r'X\d+', other_terms)) if other_terms else set()
-            score += len(other_vars) * 0.1
-            
-        else:
-            # Variables sans terme récursif ont une priorité plus basse
-            score = 10
-            
-            # Bonus si l'équation contient ε (souvent plus simple à résoudre)
-            if 'ε' in eq:
-                score = 5
-            
-            # Pénalité selon le nombre de variables dépendantes
-            deps = set(re.findall(r'X\d+', eq))
-            score += len(deps)
-        
-        return score
-
-  ###################################################################################### 
-            
-            # Nettoyer la solution immédiatement après Arden
-  
-  ################## 
-
-    def clean_solution(self, solution, step_by_step, step_counter):
-        """Nettoie une solution en éliminant les ε inutiles"""
-        if solution == "()*ε" or solution == "()*":
-            return "ε"
-        elif solution and solution.endswith("*ε"):
-            cleaned_solution = solution.replace("*ε", "*")
-            # Utiliser un incrément entier pour éviter les erreurs d'arrondi
-            sub_step = f"{step_counter}.1"
-            step_by_step.append({
-                'step': sub_step,
-                'method': "Élimination de ε",
-                'description': "ε est neutre par concaténation",
-                'before': solution,
-                'after': cleaned_solution
-            })
-            return cleaned_solution
-        elif solution and solution.endswith("*(ε)"):
-            cleaned_solution = solution.replace("*(ε)", "*")
-            sub_step = f"{step_counter}.1"
-            step_by_step.append({
-                'step': sub_step,
-                'method': "Élimination de ε",
-                'description': "ε est neutre par concaténation : A*(ε) = A*",
-                'before': solution,
-                'after': cleaned_solution
-            })
-            return cleaned_solution
-        
-        return solution
-
-    def has_variables(self, expression):
-        """Vérifie si une expression contient encore des variables X"""
-        return bool(re.search(r'X\d+', expression))
-
-  ###################################################################################### 
-            
-      # ici j'effectue les substitutions jusqu'à obtenir un result n'ayant pas de var
-  
-  ################## 
-  
-    def perform_final_substitutions(self, solutions, step_by_step, start_step):
-        """Effectue les substitutions finales jusqu'à élimination complète des variables"""
-        final_solutions = solutions.copy()
-        step_counter = start_step
-        max_iterations = 20  # Protection contre les boucles infinies
-        iteration = 0
-        sub_step_counter = 1  # Compteur pour les sous-étapes
-        
-        while iteration < max_iterations:
-            iteration += 1
-            has_changes = False
-            
-            # Pour chaque solution, vérifier s'il y a encore des variables à substituer
-            for var in list(final_solutions.keys()):
-                current_solution = final_solutions[var]
-                
-                # Trouver toutes les variables dans cette solution
-                variables_in_solution = re.findall(r'X\d+', current_solution)
-                
-                if variables_in_solution:
-                    old_solution = current_solution
-                    
-                    # Substituer chaque variable trouvée
-                    for other_var in variables_in_solution:
-                        if other_var in final_solutions and other_var != var:
-                            current_solution = self.substitute_in_equation(
-                                current_solution, other_var, final_solutions[other_var]
-                            )
-                    
-                    # Si la solution a changé, l'enregistrer
-                    if current_solution != old_solution:
-                        final_solutions[var] = current_solution
-                        has_changes = True
-                        
-                        # Nettoyer la solution
-                        cleaned_solution = self.clean_solution(current_solution, step_by_step, step_counter)
-                        if cleaned_solution != current_solution:
-                            final_solutions[var] = cleaned_solution
-                        
-                        # Utiliser un format de numérotation propre
-                        current_step = f"{step_counter}.{sub_step_counter}"
-                        
-                        step_by_step.append({
-                            'step': current_step,
-                            'method': 'Substitution finale',
-                            'description': f'Substitution des variables dans {var}',
-                            'variable': var,
-                            'before': old_solution,
-                            'after': final_solutions[var]
-                        })
-                        
-                        sub_step_counter += 1
-            
-            # Si aucun changement n'a été effectué, on peut s'arrêter
-            if not has_changes:
-                break
-        
-        return final_solutions, step_by_step
-
 ######################################################################################## 
    
    #Fonction principale pour la résolution du sytem        
@@ -301,143 +57,61 @@ class AutomatonSolver:
 
     def solve_system_with_priority(self, equations):
         """
-        Version améliorée qui résout d'abord les variables avec termes récursifs simples
-        et effectue les substitutions finales complètes
+        Résout le système par élimination symbolique (linear_system) : les
+        équations sont analysées une fois, le lemme d'Arden et les
+        substitutions travaillent sur des termes, et le texte n'est écrit
+        que pour les étapes et les solutions finales
         """
-        working_equations = equations.copy()
-        solutions = {}
-        step_by_step = []
-        step_counter = 1
-        
-        while working_equations:
-            # Recalculer les priorités à chaque itération
-            variables_scores = []
-            for var in working_equations:
-                score = self.variable_score(var, working_equations[var])
-                variables_scores.append((score, var))
-            
-            # Trier par score (priorité)
-            variables_scores.sort()
-            
-            # Prendre la variable la plus prioritaire
-            _, variable = variables_scores[0]
-            equation = working_equations[variable]
-            
-            print(f"Résolution de {variable}: {equation} (score: {variables_scores[0][0]})")
-            
-            # Analyser l'équation courante
-            coefficient, other_terms = self.group_terms_by_variable(equation, variable)
-            
-            # Appliquer le lemme d'Arden si coefficient présent
-            if coefficient and coefficient != "":
-                solution = self.apply_arden_lemma(variable, coefficient, other_terms)
-                method = "Lemme d'Arden"
-                
-                step_by_step.append({
-                    'step': step_counter,
-                    'variable': variable,
-                    'equation': equation,
-                    'solution': solution,
-                    'method': method,
-                    'description': f"Application du lemme d'Arden sur {variable}",
-                    'details': f"{variable} = {coefficient}{variable} + {other_terms if other_terms else ''} → {variable} = {solution}"
-                })
-            else:
-                solution = other_terms if other_terms else "ε"
-                method = "Substitution directe"
-                
-                step_by_step.append({
-                    'step': step_counter,
-                    'variable': variable,
-                    'equation': equation,
-                    'solution': solution,
-                    'method': method,
-                    'description': f"Résolution directe de {variable}"
-                })
-            
-            # Nettoyer la solution
-            solution = self.clean_solution(solution, step_by_step, step_counter)
-            
-            solutions[variable] = solution
-            
-            # Retirer cette variable du système
-            del working_equations[variable]
-            
-            # Substituer dans toutes les équations restantes
-            if working_equations:
-                # Utiliser un format de sous-étape propre
-                substitution_step_num = f"{step_counter}.5"
-                
-                substitution_step = {
-                    'step': substitution_step_num,
-                    'method': "Substitution",
-                    'description': f"Substitution de {variable} = {solution} dans toutes les équations restantes",
-                    'substitutions': []
-                }
-                
-                for var, eq in working_equations.items():
-                    if variable in eq:
-                        old_eq = eq
-                        new_eq = self.substitute_in_equation(eq, variable, solution)
-                        
-                        substitution_step['substitutions'].append({
-                            'variable': var,
-                            'before': old_eq,
-                            'after': new_eq
-                        })
-                        
-                        working_equations[var] = new_eq
-                
-                if substitution_step['substitutions']:
-                    step_by_step.append(substitution_step)
-            
-            step_counter += 1
-        
-        # ÉTAPE CRUCIALE: Substitutions finales complètes
-        print("Début des substitutions finales...")
-        final_solutions, step_by_step = self.perform_final_substitutions(
-            solutions, step_by_step, step_counter
-        )
-        
-        # Vérifier s'il reste encore des variables
-        remaining_vars = []
-        for var, sol in final_solutions.items():
-            if self.has_variables(sol):
-                remaining_vars.append(f"{var}: {sol}")
-        
-        if remaining_vars:
-            print(f"ATTENTION: Variables restantes dans les solutions: {remaining_vars}")
-        
+        solutions, step_by_step = self._solve_terms(equations)
+        final_solutions = {variable: solution_text(solution) for variable, solution in solutions.items()}
+
         # Étape finale d'affichage
-        final_step = {
+        step_by_step.append({
             'step': 'Final',
             'method': 'Solutions finales complètes',
             'description': 'Solutions sans variables interdépendantes',
             'final_solutions': final_solutions
-        }
-        
-        step_by_step.append(final_step)
-        
+        })
+
         return final_solutions, step_by_step
 
+    def solve_system_shared(self, equations, expand=False, budget=None):
+        """
+        Résout le système et écrit les solutions avec leurs sous-expressions
+        communes nommées (bindings E1, E2...) : la réponse reste de la taille
+        du DAG. Les solutions ne sont développées à plat que si `expand`, et
+        seulement celles d'au plus `budget` nœuds (les autres valent None).
+        """
+        solutions, step_by_step = self._solve_terms(equations)
+        shared = shared_solution_texts(solutions, expand, budget if budget is not None else MAX_SOLUTION_TEXT)
 
-######################################################################################## 
-   
+        step_by_step.append({
+            'step': 'Final',
+            'method': 'Solutions finales partagées',
+            'description': 'Solutions écrites avec les sous-expressions communes nommées',
+            'bindings': shared['bindings'],
+            'final_solutions': shared['solutions']
+        })
+        shared['steps'] = step_by_step
+        return shared
+
+    def _solve_terms(self, equations):
+        """Solutions (termes) et étapes détaillées, sans écriture des solutions"""
+        system = LinearSystem.parse(equations)
+        if len(equations) <= MAX_DETAILED_EQUATIONS:
+            step_by_step = []
+            solutions = system.solve(step_by_step)
+        else:
+            # Trop d'étapes pour être lues : résolution sans trace, composantes en parallèle
+            solutions = system.solve()
+            step_by_step = [{
+                'step': 1,
+                'method': 'Résolution par composantes',
+                'description': f"{len(equations)} équations : étapes non détaillées au-delà de "
+                               f"{MAX_DETAILED_EQUATIONS} équations"
+            }]
+        return solutions, step_by_step
 
-    def substitute_variable(self, equations, var_to_substitute, substitution):
-        """Substitue une variable dans toutes les équations"""
-        new_equations = {}
-        
-        for var, eq in equations.items():
-            if var == var_to_substitute:
-                continue
-            
-            # Remplacer la variable par sa substitution
-            new_eq = self.substitute_in_equation(eq, var_to_substitute, substitution)
-            new_equations[var] = new_eq
-        
-        return new_equations
-        
 ########################################################################################    
 
 solver = AutomatonSolver()
@@ -445,6 +119,18 @@ solver = AutomatonSolver()
 ######################################################################################## 
    
 
+def solve_shared(data, equations):
+    """Solutions partagées (bindings), développées seulement sur demande"""
+    # Nombre de nœuds au-delà duquel une solution n'est pas développée
+    budget = data.get('budget')
+    if budget is not None:
+        if isinstance(budget, str) and budget.strip().isdigit():
+            budget = int(budget)
+        if isinstance(budget, bool) or not isinstance(budget, int) or budget < 0:
+            return jsonify({'success': False, 'error': "'budget' doit être un entier positif"}), 400
+    result = solver.solve_system_shared(equations, bool(data.get('expand')), budget)
+    return jsonify({'success': True, **result})
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -469,6 +155,9 @@ def solve_equations():
     try:
         data = request.json
         equations = data.get('equations', {})
+
+        if data.get('shared'):
+            return solve_shared(data, equations)
         
         solutions, steps = solver.solve_system_with_priority(equations)
         
@@ -488,6 +177,9 @@ def manual_equations():
     try:
         data = request.json
         equations = data.get('equations', {})
+
+        if data.get('shared'):
+            return solve_shared(data, equations)
         
         solutions, steps = solver.solve_system_with_priority(equations)
         
@@ -0,0 +1,385 @@
+"""
+Résolution symbolique des systèmes d'équations linéaires à droite.
+
+Chaque équation X = A1 Y1 + ... + An Yn + B est gardée sous forme d'une table
+variable -> coefficient et d'une constante, les coefficients étant des
+termes partagés (termes_regex) : une substitution ne recopie aucun texte,
+elle combine des termes existants. Le lemme d'Arden (X = AX + B ⇒ X = A*B)
+s'applique directement sur ces termes, et le texte n'est produit que pour
+l'affichage des étapes. Le système est résolu composante fortement connexe
+par composante fortement connexe, dans l'ordre topologique inverse.
+"""
+import heapq
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from utils import VARIABLES
+from reecriture_regex import depuis_texte, simplifier_terme
+from termes_regex import (concat, concat_liste, depuis_tables, etoile, facteurs, sous_termes, symbole,
+                          taille_developpee, texte, texte_partage, union, vers_tables, vide, SYMBOLE, T_UNION)
+
+_VARIABLE = re.compile(VARIABLES)
+
+# Au-delà (en nœuds une fois développée), une expression n'est pas écrite
+# dans les étapes : le texte d'un terme partagé peut être exponentiel
+MAX_STEP_TEXT = 10_000
+# Au-delà, une solution finale n'est pas écrite du tout (ValueError)
+MAX_SOLUTION_TEXT = 1_000_000
+# Taille (en variables) à partir de laquelle une composante part dans le pool
+PARALLEL_MIN_COMPONENT = 64
+
+
+def step_text(term):
+    """Texte d'une expression pour les étapes, résumé si elle est trop grande"""
+    size = taille_developpee(term)
+    if size > MAX_STEP_TEXT:
+        return f"[expression de {size} nœuds]"
+    return texte(term, ' + ')
+
+
+def solution_text(term):
+    """Texte d'une solution ; ValueError s'il dépasserait MAX_SOLUTION_TEXT nœuds"""
+    size = taille_developpee(term)
+    if size > MAX_SOLUTION_TEXT:
+        raise ValueError(f"Solution trop grande pour être écrite ({size} nœuds, limite {MAX_SOLUTION_TEXT})")
+    return texte(term, ' + ')
+
+
+def shared_solution_texts(solutions, expand=False, budget=MAX_SOLUTION_TEXT):
+    """
+    Solutions écrites en gardant le partage : les sous-expressions communes
+    sont définies une fois (E1 = ..., E2 = ...) et les solutions y font
+    référence, pour un texte de la taille du DAG et non de l'arbre développé.
+
+    Avec `expand`, chaque solution est aussi écrite à plat si elle fait au
+    plus `budget` nœuds développée, None sinon (au lieu d'une ValueError).
+    """
+    bindings, texts = texte_partage(solutions, separateur=' + ')
+    result = {
+        'bindings': [{'name': name, 'expression': expression} for name, expression in bindings],
+        'solutions': texts,
+    }
+    if expand:
+        sizes = {}
+        result['expanded'] = {variable: texte(term, ' + ') if taille_developpee(term, sizes) <= budget else None
+                              for variable, term in solutions.items()}
+    return result
+
+
+class Equation:
+    """Membre droit Σ coefficients[Y]·Y + constant"""
+
+    __slots__ = ('coefficients', 'constant')
+
+    def __init__(self, coefficients=None, constant=None):
+        self.coefficients: Dict[str, object] = coefficients if coefficients is not None else {}
+        self.constant = constant if constant is not None else vide()
+
+    @classmethod
+    def parse(cls, expression):
+        """
+        Équation depuis son texte ('ε + aX1 + bX2') ; ValueError si elle est
+        invalide ou si une variable n'est pas en facteur à droite d'un terme.
+        """
+        equation = cls()
+        term = depuis_texte(expression, VARIABLES)
+        for member in (term.enfants if term.type == T_UNION else (term,)):
+            factors = facteurs(member)
+            if factors and factors[-1].type == SYMBOLE and _VARIABLE.fullmatch(factors[-1].valeur):
+                coefficient, variable = concat_liste(factors[:-1]), factors[-1].valeur
+            else:
+                coefficient, variable = member, None
+            if _has_variable(coefficient):
+                raise ValueError(f"Équation non linéaire à droite : {texte(member)}")
+            equation.add_term(variable, coefficient)
+        return equation
+
+    def copy(self):
+        return Equation(dict(self.coefficients), self.constant)
+
+    def add_term(self, variable, coefficient):
+        """Ajoute coefficient·variable (variable None : à la constante)"""
+        if variable is None:
+            self.constant = union(self.constant, coefficient)
+        elif variable in self.coefficients:
+            self.coefficients[variable] = union(self.coefficients[variable], coefficient)
+        else:
+            self.coefficients[variable] = coefficient
+
+    def scaled(self, factor):
+        """factor·(membre droit), distribué sur chaque terme"""
+        return Equation({variable: concat(factor, coefficient) for variable, coefficient in self.coefficients.items()},
+                        concat(factor, self.constant))
+
+    def substitute(self, variable, solution: 'Equation'):
+        """Remplace variable par le membre droit `solution` (sur place)"""
+        coefficient = self.coefficients.pop(variable, None)
+        if coefficient is None:
+            return
+        for other, sub_coefficient in solution.coefficients.items():
+            self.add_term(other, concat(coefficient, sub_coefficient))
+        self.add_term(None, concat(coefficient, solution.constant))
+
+    def arden(self, variable):
+        """Lemme d'Arden sur la variable : X = AX + B devient X = A*B (plus petite solution)"""
+        coefficient = self.coefficients.pop(variable, None)
+        if coefficient is None:
+            return self
+        return self.scaled(etoile(coefficient))
+
+    def term(self):
+        """Membre droit sous forme d'un seul terme (les variables comme symboles)"""
+        return union(*(concat(coefficient, symbole(variable))
+                       for variable, coefficient in self.coefficients.items()), self.constant)
+
+    def text(self):
+        return step_text(self.term())
+
+
+def _has_variable(term):
+    return any(sub.type == SYMBOLE and _VARIABLE.fullmatch(sub.valeur) for sub in sous_termes(term))
+
+
+def dependency_components(equations):
+    """
+    Composantes fortement connexes du graphe variable -> variables de son
+    équation (Tarjan, pile explicite). Une composante n'est produite
+    qu'après toutes celles dont elle dépend : l'ordre est topologique inverse.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for root in equations:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(equations[root].coefficients))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(equations[child].coefficients)))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        variable = stack.pop()
+                        on_stack.discard(variable)
+                        component.append(variable)
+                        if variable == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def _eliminate(equations, steps=None, step_counter=1):
+    """
+    Élimination de Gauss à l'intérieur d'un groupe d'équations : la variable
+    éliminée à chaque étape est celle qui crée le moins de termes (nombre
+    d'équations où elle apparaît × nombre de variables de son équation),
+    puis les solutions sont remontées dans l'ordre inverse. Retourne
+    ({variable: Equation ne portant plus que sur les variables extérieures
+    au groupe}, numéro de l'étape suivante).
+    """
+    remaining = {variable: equation.copy() for variable, equation in equations.items()}
+    users = {variable: set() for variable in remaining}  # variable -> équations du groupe où elle apparaît
+    for variable, equation in remaining.items():
+        for other in equation.coefficients:
+            if other in users:
+                users[other].add(variable)
+
+    def cost(variable):
+        return len(users[variable] - {variable}) * len(remaining[variable].coefficients), variable
+
+    heap = [cost(variable) for variable in remaining]
+    heapq.heapify(heap)
+    order = []
+    eliminated = {}
+    while heap:
+        entry = heapq.heappop(heap)
+        variable = entry[1]
+        if variable not in remaining or entry != cost(variable):
+            continue  # entrée périmée
+        equation = remaining.pop(variable)
+        recursive = variable in equation.coefficients
+        before = equation.text() if steps is not None else None
+        solution = equation.arden(variable)
+        users[variable].discard(variable)
+        for other in solution.coefficients:
+            if other in users:
+                users[other].discard(variable)
+        if steps is not None:
+            steps.append(LinearSystem._arden_step(step_counter, variable, before, solution, recursive))
+
+        substitutions = []
+        modified = users.pop(variable)
+        for user in modified:
+            target = remaining[user]
+            old = target.text() if steps is not None else None
+            target.substitute(variable, solution)
+            for other in target.coefficients:
+                if other in users:
+                    users[other].add(user)
+            if steps is not None:
+                substitutions.append({'variable': user, 'before': old, 'after': target.text()})
+        if substitutions:
+            steps.append({
+                'step': f"{step_counter}.5",
+                'method': "Substitution",
+                'description': f"Substitution de {variable} = {solution.text()} dans toutes les équations restantes",
+                'substitutions': substitutions
+            })
+        for neighbour in modified.union(solution.coefficients):
+            if neighbour in remaining:
+                heapq.heappush(heap, cost(neighbour))
+        order.append(variable)
+        eliminated[variable] = solution
+        step_counter += 1
+
+    # Remontée : chaque équation éliminée ne dépend que de variables éliminées après elle
+    solved = {}
+    for variable in reversed(order):
+        equation = eliminated[variable].copy()
+        for other in [v for v in equation.coefficients if v in solved]:
+            equation.substitute(other, solved[other])
+        solved[variable] = equation
+    return solved, step_counter
+
+
+def _pack(equations):
+    """Équations sous forme sérialisable (voir termes_regex.vers_tables)"""
+    layout = []
+    terms = []
+    for variable, equation in equations.items():
+        layout.append((variable, list(equation.coefficients)))
+        terms.extend(equation.coefficients.values())
+        terms.append(equation.constant)
+    nodes, roots = vers_tables(terms)
+    return layout, nodes, roots
+
+
+def _unpack(packed):
+    layout, nodes, roots = packed
+    terms = iter(depuis_tables(nodes, roots))
+    equations = {}
+    for variable, others in layout:
+        coefficients = {other: next(terms) for other in others}
+        equations[variable] = Equation(coefficients, next(terms))
+    return equations
+
+
+def _eliminate_packed(packed):
+    """_eliminate dans un processus du pool : équations et résultats voyagent sous forme de tables"""
+    solved, _ = _eliminate(_unpack(packed))
+    return _pack(solved)
+
+
+class LinearSystem:
+    """
+    Système d'équations {variable: Equation}. Une variable sans équation
+    (état sans issue) vaut ∅ : ses occurrences sont retirées.
+    """
+
+    def __init__(self, equations: Dict[str, Equation]):
+        self.equations = {variable: equation.copy() for variable, equation in equations.items()}
+        for equation in self.equations.values():
+            for variable in [v for v in equation.coefficients if v not in self.equations]:
+                del equation.coefficients[variable]
+
+    @classmethod
+    def parse(cls, equations: Dict[str, str]):
+        return cls({variable: Equation.parse(expression) for variable, expression in equations.items()})
+
+    def solve(self, steps: Optional[List[dict]] = None, workers: Optional[int] = None):
+        """
+        Solutions {variable: terme}. Le graphe des dépendances est découpé en
+        composantes fortement connexes ; chacune est éliminée seule, en ne
+        gardant que ses propres variables, puis les composantes sont
+        assemblées dans l'ordre topologique inverse : la solution d'une
+        composante est substituée une seule fois dans celles qui l'utilisent.
+
+        Les composantes d'au moins PARALLEL_MIN_COMPONENT variables, quand il
+        y en a plusieurs, sont éliminées dans un pool de `workers` processus
+        (défaut : un par cœur ; 1 désactive le pool). `steps` reçoit, si elle
+        est donnée, les étapes au format de l'affichage ; tout est alors
+        résolu dans ce processus, dans l'ordre des étapes.
+        """
+        components = dependency_components(self.equations)
+        partial = {}
+        local = components
+        large = [component for component in components if len(component) >= PARALLEL_MIN_COMPONENT]
+        workers = workers or os.cpu_count() or 1
+        if steps is None and workers > 1 and len(large) >= 2:
+            partial.update(self._eliminate_in_pool(large, workers))
+            local = [component for component in components if len(component) < PARALLEL_MIN_COMPONENT]
+
+        step_counter = 1
+        for component in local:
+            solved, step_counter = _eliminate({variable: self.equations[variable] for variable in component},
+                                              steps, step_counter)
+            partial.update(solved)
+
+        # Assemblage : une composante ne dépend que de composantes déjà résolues
+        solutions = {}
+        rank = 1
+        for component in components:
+            for variable in component:
+                equation = partial[variable]
+                terms = [concat(coefficient, solutions[other]) for other, coefficient in equation.coefficients.items()]
+                solutions[variable] = simplifier_terme(union(equation.constant, *terms))
+                if steps is not None and equation.coefficients:
+                    steps.append({
+                        'step': f"{step_counter}.{rank}",
+                        'method': 'Substitution finale',
+                        'description': f'Substitution des variables dans {variable}',
+                        'variable': variable,
+                        'before': equation.text(),
+                        'after': step_text(solutions[variable])
+                    })
+                    rank += 1
+        return solutions
+
+    def _eliminate_in_pool(self, components, workers):
+        packs = [_pack({variable: self.equations[variable] for variable in component}) for component in components]
+        partial = {}
+        with ProcessPoolExecutor(max_workers=min(workers, len(packs))) as pool:
+            for packed in pool.map(_eliminate_packed, packs):
+                partial.update(_unpack(packed))
+        return partial
+
+    @staticmethod
+    def _arden_step(step_counter, variable, before, solution, recursive):
+        if recursive:
+            return {
+                'step': step_counter,
+                'variable': variable,
+                'equation': before,
+                'solution': solution.text(),
+                'method': "Lemme d'Arden",
+                'description': f"Application du lemme d'Arden sur {variable}",
+                'details': f"{variable} = {before} → {variable} = {solution.text()}"
+            }
+        return {
+            'step': step_counter,
+            'variable': variable,
+            'equation': before,
+            'solution': solution.text(),
+            'method': "Substitution directe",
+            'description': f"Résolution directe de {variable}"
+        }
@@ -1,6 +1,11 @@
+import os
 import re
+import sys
 from typing import Dict, List, Tuple
 
+# Solveur symbolique (termes partagés) utilisé par le mode partagé
+SYSTEMES_EQUATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Systemes_equations')
+
 class StrategicAutomatonSolver:
     
     def __init__(self):
@@ -178,6 +183,28 @@ class StrategicAutomatonSolver:
                 print(f"{var} = {solutions[var]}")
         return solutions
 
+    def solve_system_shared(self, equations: Dict[str, str], expand: bool = False, budget: int = None) -> Dict:
+        """
+        Résolution sur termes partagés (Systemes_equations/linear_system) :
+        les solutions sont écrites avec leurs sous-expressions communes
+        nommées (E1, E2...), en taille polynomiale. Avec `expand`, les
+        solutions d'au plus `budget` nœuds sont aussi développées à plat.
+        """
+        if SYSTEMES_EQUATIONS_DIR not in sys.path:
+            sys.path.append(SYSTEMES_EQUATIONS_DIR)
+        from linear_system import LinearSystem, MAX_SOLUTION_TEXT, shared_solution_texts
+
+        solutions = LinearSystem.parse(equations).solve()
+        result = shared_solution_texts(solutions, expand, budget if budget is not None else MAX_SOLUTION_TEXT)
+        if self.debug:
+            print("\n=== SOUS-EXPRESSIONS PARTAGÉES ===")
+            for binding in result['bindings']:
+                print(f"{binding['name']} = {binding['expression']}")
+            print("\n=== SOLUTIONS (PARTAGÉES) ===")
+            for var, sol in result['solutions'].items():
+                print(f"{var} = {sol}")
+        return result
+
     def set_debug(self, debug: bool):
         self.debug = debug
 
@@ -212,3 +239,8 @@ if __name__ == "__main__":
     for var, sol in solutions.items():
         print(f"{var} = {sol}")
 
+
+    print("\n" + "=" * 50)
+    print("MODE PARTAGÉ (sous-expressions communes nommées):")
+    print("=" * 50)
+    StrategicAutomatonSolver().solve_system_shared(system)
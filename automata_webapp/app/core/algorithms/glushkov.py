@@ -0,0 +1,11 @@
+from app.core.automates_utils import cache_partage, to_automaton
+from glushkov import construire_glushkov
+
+
+class GlushkovConstructor:
+    """Automate des positions (Automates_utils/glushkov.py), mis en cache par expression"""
+
+    def construct(self, regex_pattern):
+        # Même entrée de cache que Automates_utils/app.py : {'automate', 'positions'}
+        data = cache_partage().obtenir(regex_pattern, 'glushkov', construire_glushkov)['automate']
+        return to_automaton(data, f"Glushkov({regex_pattern})")
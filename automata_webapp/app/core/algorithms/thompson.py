@@ -0,0 +1,10 @@
+from app.core.automates_utils import cache_partage, to_automaton
+from thompson import thompson_construction
+
+
+class ThompsonConstructor:
+    """Construction de Thompson (Automates_utils/thompson.py), mise en cache par expression"""
+
+    def construct(self, regex_pattern):
+        data = cache_partage().obtenir(regex_pattern, 'thompson', thompson_construction)
+        return to_automaton(data, f"Thompson({regex_pattern})")
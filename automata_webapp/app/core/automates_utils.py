@@ -0,0 +1,45 @@
+"""
+Accès aux modules de calcul de Automates_utils depuis l'application principale.
+
+Automates_utils est un dossier de modules à plat (lancé par
+`cd Automates_utils && python3 app.py`) : on l'ajoute en fin de sys.path pour
+que les paquets de l'application restent prioritaires en cas d'homonymie.
+"""
+import os
+import sys
+
+AUTOMATES_UTILS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'Automates_utils'))
+
+if AUTOMATES_UTILS_DIR not in sys.path:
+    sys.path.append(AUTOMATES_UTILS_DIR)
+
+from automate_compact import AutomateCompact, TableNoms  # noqa: E402
+from cache_regex import cache_partage  # noqa: E402
+import compteurs  # noqa: E402
+import derivees  # noqa: E402
+import format_binaire  # noqa: E402
+import reecriture_regex  # noqa: E402
+import termes_regex  # noqa: E402
+
+__all__ = ['AUTOMATES_UTILS_DIR', 'AutomateCompact', 'TableNoms', 'cache_partage', 'compteurs', 'derivees',
+           'format_binaire', 'reecriture_regex', 'termes_regex', 'to_automaton']
+
+
+def to_automaton(data, name=''):
+    """Automaton de l'application depuis le format dictionnaire de Automates_utils"""
+    from app.models import Automaton, State, Transition
+
+    initial = set(data['etats_initiaux'])
+    final = set(data['etats_finaux'])
+    automaton = Automaton(name)
+    states = {}
+    for state_name in data['etats']:
+        state = State(state_name, is_initial=state_name in initial, is_final=state_name in final)
+        automaton.add_state(state)
+        states[state_name] = state
+    for key, targets in data['transitions'].items():
+        source, symbol = key.split(',', 1)
+        for target in targets:
+            automaton.add_transition(Transition(states[source], states[target], symbol))
+    return automaton
@@ -0,0 +1,164 @@
+import heapq
+from typing import Dict, Iterable, Set, Tuple
+
+from app.core.automates_utils import reecriture_regex, termes_regex
+from app.models import Automaton
+
+# Symboles de transition lus comme le mot vide
+EPSILON_SYMBOLS = ('ε', 'epsilon', '', 'λ')
+# Au-delà (en nœuds de l'expression développée), l'expression est écrite avec
+# ses sous-expressions communes nommées (termes_regex.texte_partage) : le
+# texte développé peut être exponentiel, le texte partagé reste de la taille
+# du DAG des étiquettes
+MAX_REGEX_SIZE = 1_000_000
+
+
+class RegexGenerator:
+    """
+    Expression régulière d'un automate par élimination d'états.
+
+    Les étiquettes sont des termes partagés (termes_regex) : une étiquette
+    recopiée sur plusieurs arcs n'est jamais dupliquée, et les unions et
+    concaténations sont normalisées à la construction. La matrice est creuse
+    (arcs sortants et entrants par état) et l'état éliminé à chaque étape est
+    celui qui crée le moins d'arcs, degré entrant × degré sortant ; à égalité,
+    celui qui recopie le moins de texte (poids de Delgado et Morais). Le terme
+    final est simplifié (reecriture_regex) et le texte n'est produit qu'une
+    fois, à la fin ; trop grand, il est écrit sous forme partagée. Aucun état
+    global : le générateur peut tourner dans un thread ou un processus de fond.
+    """
+
+    def generate(self, automaton: Automaton) -> str:
+        """Expression (syntaxe de regex_parser, '+' pour l'union) ; '∅' si le langage est vide"""
+        arcs = [(t.from_state.name, t.to_state.name,
+                 termes_regex.mot_vide() if t.is_epsilon() else termes_regex.symbole(t.symbol))
+                for t in automaton.transitions]
+        return self.eliminate([s.name for s in automaton.states],
+                              [s.name for s in automaton.initial_states],
+                              [s.name for s in automaton.final_states], arcs)
+
+    def eliminate(self, states: Iterable, initial_states: Iterable, final_states: Iterable,
+                  arcs: Iterable[Tuple]) -> str:
+        """
+        Élimination sur des arcs (source, destination, étiquette) ; l'étiquette
+        est un terme ou une expression texte. Retourne le texte de l'expression,
+        sous forme partagée (shared_text) s'il dépasserait MAX_REGEX_SIZE nœuds.
+        """
+        term = reecriture_regex.simplifier_terme(
+            self.eliminate_term(states, initial_states, final_states, arcs))
+        if termes_regex.taille_developpee(term) > MAX_REGEX_SIZE:
+            return self.shared_text(term)
+        return termes_regex.texte(term)
+
+    @staticmethod
+    def shared_text(term) -> str:
+        """
+        Écriture avec les sous-expressions communes nommées :
+        'E3 où E1 = ... ; E2 = ... ; E3 = ...', chaque nom n'utilisant que
+        les noms définis avant lui
+        """
+        bindings, roots = termes_regex.texte_partage({'regex': term})
+        if not bindings:
+            return roots['regex']
+        return f"{roots['regex']} où " + ' ; '.join(f"{name} = {text}" for name, text in bindings)
+
+    def eliminate_term(self, states, initial_states, final_states, arcs):
+        """Comme eliminate, mais retourne le terme (DAG partagé) sans l'écrire"""
+        # Nouvel état initial et nouvel état final : aucun arc n'entre dans le
+        # premier ni ne sort du second, il suffit d'éliminer tous les autres
+        start, end = object(), object()
+        outgoing: Dict[object, Dict[object, object]] = {state: {} for state in states}
+        outgoing[start], outgoing[end] = {}, {}
+        incoming: Dict[object, Set[object]] = {state: set() for state in outgoing}
+
+        def add(source, target, term):
+            if term.type == termes_regex.VIDE:
+                return
+            row = outgoing[source]
+            row[target] = termes_regex.union(row[target], term) if target in row else term
+            incoming[target].add(source)
+
+        for source, target, label in arcs:
+            if isinstance(label, str):
+                label = self._label(label)
+            add(source, target, label)
+        for state in initial_states:
+            add(start, state, termes_regex.mot_vide())
+        for state in final_states:
+            add(state, end, termes_regex.mot_vide())
+
+        self._prune(outgoing, incoming, start, end)
+
+        sizes = {}
+
+        def weight(state):
+            row = outgoing[state]
+            loop = row.get(state)
+            entering = [outgoing[source][state] for source in incoming[state] if source is not state]
+            leaving = [label for target, label in row.items() if target is not state]
+            n_in, n_out = len(entering), len(leaving)
+            # Texte recopié : chaque entrant vers chaque sortant, la boucle sur chaque paire
+            size = lambda t: termes_regex.taille_developpee(t, sizes)
+            copied = (sum(map(size, entering)) * (n_out - 1)
+                      + sum(map(size, leaving)) * (n_in - 1)
+                      + (size(loop) if loop is not None else 0) * (n_in * n_out - 1))
+            return n_in * n_out, copied
+
+        order = {state: number for number, state in enumerate(outgoing)}
+        heap = [(weight(state), order[state], state) for state in outgoing if state is not start and state is not end]
+        heapq.heapify(heap)
+        while heap:
+            cost, _, state = heapq.heappop(heap)
+            if state not in outgoing or cost != weight(state):
+                continue  # entrée périmée : l'état a été éliminé ou son coût a changé
+            row = outgoing.pop(state)
+            sources = incoming.pop(state)
+            loop = row.pop(state, None)
+            sources.discard(state)
+            star = termes_regex.etoile(loop) if loop is not None else termes_regex.mot_vide()
+            for target in row:
+                incoming[target].discard(state)
+            for source in sources:
+                prefix = termes_regex.concat(outgoing[source].pop(state), star)
+                for target, label in row.items():
+                    add(source, target, termes_regex.concat(prefix, label))
+            for neighbour in sources.union(row):
+                if neighbour is not start and neighbour is not end:
+                    heapq.heappush(heap, (weight(neighbour), order[neighbour], neighbour))
+
+        return outgoing[start].get(end, termes_regex.vide())
+
+    @staticmethod
+    def _label(text):
+        if text in EPSILON_SYMBOLS:
+            return termes_regex.mot_vide()
+        if text == '∅':
+            return termes_regex.vide()
+        return termes_regex.depuis_regex(text)
+
+    @staticmethod
+    def _prune(outgoing, incoming, start, end):
+        """Retire les états non accessibles depuis start ou ne menant pas à end"""
+        def reach(origin, neighbours):
+            seen = {origin}
+            stack = [origin]
+            while stack:
+                for other in neighbours(stack.pop()):
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            return seen
+
+        useful = reach(start, lambda s: outgoing[s]) & reach(end, lambda s: incoming[s])
+        for state in list(outgoing):
+            if state in useful:
+                continue
+            for target in outgoing.pop(state):
+                if target in useful:
+                    incoming[target].discard(state)
+            for source in incoming.pop(state):
+                if source in useful:
+                    outgoing[source].pop(state, None)
+        if start not in useful:
+            outgoing[start], incoming[start] = {}, set()
+            outgoing[end], incoming[end] = {}, set()
@@ -0,0 +1,221 @@
+import hashlib
+import json
+from collections import deque
+from typing import Dict, List, Tuple
+
+from app.models import Automaton, State, Transition
+from app.core.operations.state_analysis import StateAnalyzer
+
+CANONICAL_FORMAT_VERSION = 1
+
+
+class Canonizer:
+    """
+    Forme canonique d'un automate : deux automates reconnaissant le même
+    langage produisent exactement les mêmes octets, donc la même empreinte.
+
+    Étapes : émondage (StateAnalyzer), déterminisation par sous-ensembles,
+    minimisation de Hopcroft, puis renumérotation des états dans l'ordre du
+    parcours en largeur depuis l'état initial, symboles triés.
+    """
+
+    def __init__(self, automaton: Automaton):
+        self.automaton = automaton
+        self._result = None
+
+    # ------------------------------------------------------------------
+    # Émondage et déterminisation
+    # ------------------------------------------------------------------
+
+    def _determinize(self):
+        """
+        AFD partiel sur les états utiles : chaque sous-ensemble atteint contient
+        un état co-accessible, il n'y a donc pas d'état mort à retirer ensuite.
+        """
+        useful = set(StateAnalyzer(self.automaton).get_useful_states())
+        symbols = sorted({t.symbol for t in self.automaton.transitions if not t.is_epsilon()})
+        symbol_numbers = {a: i for i, a in enumerate(symbols)}
+
+        epsilon: Dict[State, List[State]] = {}
+        moves: Dict[Tuple[State, int], List[State]] = {}
+        for t in self.automaton.transitions:
+            if t.from_state not in useful or t.to_state not in useful:
+                continue
+            if t.is_epsilon():
+                epsilon.setdefault(t.from_state, []).append(t.to_state)
+            else:
+                moves.setdefault((t.from_state, symbol_numbers[t.symbol]), []).append(t.to_state)
+
+        def closure(states):
+            stack = list(states)
+            result = set(stack)
+            while stack:
+                for target in epsilon.get(stack.pop(), ()):
+                    if target not in result:
+                        result.add(target)
+                        stack.append(target)
+            return frozenset(result)
+
+        start = closure(s for s in self.automaton.initial_states if s in useful)
+        if not start:
+            return symbols, [], [], -1
+
+        numbers = {start: 0}
+        subsets = [start]
+        delta: List[Dict[int, int]] = []
+        for subset in subsets:
+            row = {}
+            for a in range(len(symbols)):
+                targets = [q for p in subset for q in moves.get((p, a), ())]
+                if not targets:
+                    continue
+                target = closure(targets)
+                if target not in numbers:
+                    numbers[target] = len(subsets)
+                    subsets.append(target)
+                row[a] = numbers[target]
+            delta.append(row)
+
+        finals = [not subset.isdisjoint(self.automaton.final_states) for subset in subsets]
+        return symbols, delta, finals, 0
+
+    # ------------------------------------------------------------------
+    # Minimisation de Hopcroft
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hopcroft(delta, finals, symbol_count):
+        """
+        Classes d'équivalence de Nerode. Les transitions absentes mènent à un
+        puits implicite (numéro n) ; retourne le numéro de classe de chaque état.
+        """
+        n = len(delta)
+        sink = n
+        inverse = [[[] for _ in range(n + 1)] for _ in range(symbol_count)]
+        for p in range(n + 1):
+            row = delta[p] if p < n else {}
+            for a in range(symbol_count):
+                inverse[a][row.get(a, sink)].append(p)
+
+        accepting = {q for q in range(n) if finals[q]}
+        rejecting = set(range(n + 1)) - accepting
+        blocks = [b for b in (accepting, rejecting) if b]
+        block_of = [0] * (n + 1)
+        for i, block in enumerate(blocks):
+            for q in block:
+                block_of[q] = i
+
+        smallest = min(range(len(blocks)), key=lambda i: len(blocks[i]))
+        waiting = deque((smallest, a) for a in range(symbol_count))
+        in_waiting = set(waiting)
+
+        while waiting:
+            splitter = waiting.popleft()
+            in_waiting.discard(splitter)
+            b, a = splitter
+            predecessors = {p for q in blocks[b] for p in inverse[a][q]}
+
+            touched: Dict[int, set] = {}
+            for p in predecessors:
+                touched.setdefault(block_of[p], set()).add(p)
+
+            for i, inside in touched.items():
+                if len(inside) == len(blocks[i]):
+                    continue
+                outside = blocks[i] - inside
+                blocks[i] = inside
+                j = len(blocks)
+                blocks.append(outside)
+                for q in outside:
+                    block_of[q] = j
+                for c in range(symbol_count):
+                    if (i, c) in in_waiting:
+                        waiting.append((j, c))
+                        in_waiting.add((j, c))
+                    else:
+                        added = (i, c) if len(inside) <= len(outside) else (j, c)
+                        waiting.append(added)
+                        in_waiting.add(added)
+
+        return block_of
+
+    # ------------------------------------------------------------------
+    # Forme canonique
+    # ------------------------------------------------------------------
+
+    def _canonize(self):
+        if self._result is not None:
+            return self._result
+
+        symbols, delta, finals, start = self._determinize()
+        if start < 0:
+            # Langage vide : un unique état initial non final
+            self._result = {'alphabet': [], 'state_count': 1, 'finals': [], 'transitions': []}
+            return self._result
+
+        block_of = self._hopcroft(delta, finals, len(symbols))
+        representative = {}
+        for q in range(len(delta)):
+            representative.setdefault(block_of[q], q)
+
+        # Numérotation en largeur depuis l'état initial, symboles dans l'ordre trié
+        order = {block_of[start]: 0}
+        queue = deque([block_of[start]])
+        transitions = []
+        while queue:
+            block = queue.popleft()
+            row = delta[representative[block]]
+            for a in sorted(row):
+                target = block_of[row[a]]
+                if target not in order:
+                    order[target] = len(order)
+                    queue.append(target)
+                transitions.append((order[block], a, order[target]))
+
+        used = sorted({a for _, a, _ in transitions})
+        renamed = {a: i for i, a in enumerate(used)}
+        finals_out = sorted(order[block] for block in order if finals[representative[block]])
+        self._result = {
+            'alphabet': [symbols[a] for a in used],
+            'state_count': len(order),
+            'finals': finals_out,
+            'transitions': [(p, renamed[a], q) for p, a, q in transitions]
+        }
+        return self._result
+
+    def canonical_bytes(self) -> bytes:
+        """Encodage stable de la forme canonique"""
+        result = self._canonize()
+        payload = {
+            'version': CANONICAL_FORMAT_VERSION,
+            'alphabet': result['alphabet'],
+            'states': result['state_count'],
+            'finals': result['finals'],
+            'transitions': [list(t) for t in result['transitions']]
+        }
+        return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def content_hash(self) -> str:
+        """Empreinte SHA-256 de la forme canonique"""
+        return hashlib.sha256(self.canonical_bytes()).hexdigest()
+
+    def canonical_automaton(self) -> Automaton:
+        """Automate minimal émondé, états nommés q0, q1, ... dans l'ordre canonique"""
+        result = self._canonize()
+        finals = set(result['finals'])
+        automaton = Automaton(self.automaton.name)
+        states = [State(f"q{i}", is_initial=(i == 0), is_final=(i in finals))
+                  for i in range(result['state_count'])]
+        for state in states:
+            automaton.add_state(state)
+        for p, a, q in result['transitions']:
+            automaton.add_transition(Transition(states[p], states[q], result['alphabet'][a]))
+        return automaton
+
+    def to_dict(self):
+        """Automate canonique et empreinte, sérialisables"""
+        return {
+            'automaton': self.canonical_automaton().to_dict(),
+            'hash': self.content_hash(),
+            'states_count': self._canonize()['state_count']
+        }
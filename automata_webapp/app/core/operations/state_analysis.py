@@ -0,0 +1,235 @@
+from typing import Dict, List, Set
+from app.models import Automaton, State
+
+
+class StateAnalyzer:
+    """
+    Analyse structurelle d'un automate en temps linéaire.
+
+    Un seul parcours de Tarjan (itératif, sans limite de récursion) calcule les
+    composantes fortement connexes ; tout le reste (accessibilité,
+    co-accessibilité, états pièges et puits, acyclicité, cœur cyclique, DAG de
+    condensation) s'en déduit en parcourant les composantes une fois.
+    Les composantes sont numérotées dans l'ordre topologique du DAG de
+    condensation : une composante n'a d'arcs que vers des numéros plus grands.
+    """
+
+    def __init__(self, automaton: Automaton):
+        self.automaton = automaton
+        self.states: List[State] = sorted(automaton.states, key=lambda s: s.name)
+        self._numbers: Dict[State, int] = {s: i for i, s in enumerate(self.states)}
+        self._analysis = None
+
+    # ------------------------------------------------------------------
+    # Construction de l'adjacence et parcours de Tarjan
+    # ------------------------------------------------------------------
+
+    def _build_adjacency(self):
+        """Adjacence CSR (successeurs distincts) et marquage des boucles"""
+        n = len(self.states)
+        successors = [set() for _ in range(n)]
+        for transition in self.automaton.transitions:
+            successors[self._numbers[transition.from_state]].add(
+                self._numbers[transition.to_state])
+
+        offsets = [0] * (n + 1)
+        targets = []
+        self_loop = bytearray(n)
+        for v in range(n):
+            if v in successors[v]:
+                self_loop[v] = 1
+            targets.extend(sorted(successors[v]))
+            offsets[v + 1] = len(targets)
+        return offsets, targets, self_loop
+
+    @staticmethod
+    def _tarjan(n, offsets, targets):
+        """Composantes fortement connexes, émises dans l'ordre topologique inverse"""
+        index = [-1] * n
+        low = [0] * n
+        on_stack = bytearray(n)
+        component = [-1] * n
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, offsets[root])]
+
+            while work:
+                v, k = work[-1]
+                end = offsets[v + 1]
+                while k < end:
+                    w = targets[k]
+                    k += 1
+                    if index[w] == -1:
+                        # Descente vers w ; on reprendra v à l'arc suivant
+                        work[-1] = (v, k)
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, offsets[w]))
+                        break
+                    if on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        if low[v] < low[u]:
+                            low[u] = low[v]
+                    if low[v] == index[v]:
+                        members = []
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            component[w] = len(components)
+                            members.append(w)
+                            if w == v:
+                                break
+                        components.append(members)
+
+        return component, components
+
+    def _analyze(self):
+        if self._analysis is not None:
+            return self._analysis
+
+        n = len(self.states)
+        offsets, targets, self_loop = self._build_adjacency()
+        component, components = self._tarjan(n, offsets, targets)
+
+        # Renumérotation dans l'ordre topologique de la condensation
+        count = len(components)
+        component = [count - 1 - c for c in component]
+        components.reverse()
+
+        dag = [set() for _ in range(count)]
+        for v in range(n):
+            for k in range(offsets[v], offsets[v + 1]):
+                c, d = component[v], component[targets[k]]
+                if c != d:
+                    dag[c].add(d)
+
+        cyclic = [len(members) > 1 or bool(self_loop[members[0]]) for members in components]
+
+        # Accessibilité : propagation dans l'ordre topologique
+        reachable = bytearray(count)
+        for state in self.automaton.initial_states:
+            reachable[component[self._numbers[state]]] = 1
+        for c in range(count):
+            if reachable[c]:
+                for d in dag[c]:
+                    reachable[d] = 1
+
+        # Co-accessibilité : propagation dans l'ordre topologique inverse
+        productive = bytearray(count)
+        for state in self.automaton.final_states:
+            productive[component[self._numbers[state]]] = 1
+        for c in range(count - 1, -1, -1):
+            if not productive[c] and any(productive[d] for d in dag[c]):
+                productive[c] = 1
+
+        self._analysis = {
+            'component': component,
+            'components': components,
+            'dag': dag,
+            'cyclic': cyclic,
+            'self_loop': self_loop,
+            'reachable': reachable,
+            'productive': productive,
+        }
+        return self._analysis
+
+    def _states_where(self, predicate) -> List[State]:
+        analysis = self._analyze()
+        component = analysis['component']
+        return [s for v, s in enumerate(self.states) if predicate(v, component[v], analysis)]
+
+    # ------------------------------------------------------------------
+    # Accessibilité
+    # ------------------------------------------------------------------
+
+    def get_accessible_states(self) -> List[State]:
+        """États atteignables depuis un état initial"""
+        return self._states_where(lambda v, c, a: a['reachable'][c])
+
+    def get_coaccessible_states(self) -> List[State]:
+        """États depuis lesquels un état final est atteignable"""
+        return self._states_where(lambda v, c, a: a['productive'][c])
+
+    def get_useful_states(self) -> List[State]:
+        """États à la fois accessibles et co-accessibles"""
+        return self._states_where(lambda v, c, a: a['reachable'][c] and a['productive'][c])
+
+    def get_useless_states(self) -> List[State]:
+        """États à supprimer lors de l'émondage"""
+        return self._states_where(lambda v, c, a: not (a['reachable'][c] and a['productive'][c]))
+
+    # ------------------------------------------------------------------
+    # Structure
+    # ------------------------------------------------------------------
+
+    def get_sccs(self) -> List[List[State]]:
+        """Composantes fortement connexes, dans l'ordre topologique"""
+        return [[self.states[v] for v in members] for members in self._analyze()['components']]
+
+    def get_component_of(self, state: State) -> int:
+        """Numéro (topologique) de la composante contenant l'état"""
+        return self._analyze()['component'][self._numbers[state]]
+
+    def get_condensation(self) -> Dict[int, Set[int]]:
+        """DAG de condensation : composante -> composantes successeurs"""
+        return {c: set(successors) for c, successors in enumerate(self._analyze()['dag'])}
+
+    def get_trap_states(self) -> List[State]:
+        """États pièges : aucun état final n'est atteignable depuis eux"""
+        return self._states_where(lambda v, c, a: not a['productive'][c])
+
+    def get_sink_states(self) -> List[State]:
+        """États puits : leur composante n'a aucun arc sortant (on ne peut plus en sortir)"""
+        return self._states_where(lambda v, c, a: not a['dag'][c])
+
+    def get_self_loop_only_states(self) -> List[State]:
+        """États dont le seul cycle est une boucle sur eux-mêmes"""
+        return self._states_where(
+            lambda v, c, a: len(a['components'][c]) == 1 and a['self_loop'][v])
+
+    def get_cyclic_core(self) -> List[State]:
+        """États appartenant à au moins un cycle"""
+        return self._states_where(lambda v, c, a: a['cyclic'][c])
+
+    def is_acyclic(self) -> bool:
+        """Vrai si le graphe de l'automate ne contient aucun cycle"""
+        return not any(self._analyze()['cyclic'])
+
+    def is_language_finite(self) -> bool:
+        """Le langage est fini si aucun cycle ne passe par un état utile"""
+        analysis = self._analyze()
+        return not any(cyclic and analysis['reachable'][c] and analysis['productive'][c]
+                       for c, cyclic in enumerate(analysis['cyclic']))
+
+    def to_dict(self):
+        """Résumé sérialisable de l'analyse structurelle"""
+        names = lambda states: [s.name for s in states]
+        return {
+            'accessible_states': names(self.get_accessible_states()),
+            'coaccessible_states': names(self.get_coaccessible_states()),
+            'useful_states': names(self.get_useful_states()),
+            'useless_states': names(self.get_useless_states()),
+            'trap_states': names(self.get_trap_states()),
+            'sink_states': names(self.get_sink_states()),
+            'self_loop_only_states': names(self.get_self_loop_only_states()),
+            'cyclic_core': names(self.get_cyclic_core()),
+            'sccs': [names(component) for component in self.get_sccs()],
+            'condensation': {str(c): sorted(d) for c, d in self.get_condensation().items()},
+            'is_acyclic': self.is_acyclic(),
+            'is_language_finite': self.is_language_finite()
+        }
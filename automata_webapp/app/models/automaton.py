@@ -13,6 +13,12 @@ class Automaton:
         self.initial_states: Set[State] = set()
         self.final_states: Set[State] = set()
         self.transition_table: Dict = {}
+        
+        # Index par état source et propriétés tenues à jour par add_transition
+        self.outgoing: Dict[State, List[Transition]] = {}
+        self.out_degree: Dict[State, int] = {}
+        self._epsilon_count = 0
+        self._nondeterministic_keys = 0
     
     def add_state(self, state: State):
         """Ajouter un état à l'automate"""
@@ -25,42 +31,43 @@ class Automaton:
     def add_transition(self, transition: Transition):
         """Ajouter une transition à l'automate"""
         self.transitions.append(transition)
-        if not transition.is_epsilon():
+        source = transition.from_state
+        is_epsilon = transition.is_epsilon()
+        
+        if is_epsilon:
+            self._epsilon_count += 1
+        else:
             self.alphabet.add(transition.symbol)
         
+        outgoing = self.outgoing.get(source)
+        if outgoing is None:
+            outgoing = self.outgoing[source] = []
+        outgoing.append(transition)
+        self.out_degree[source] = len(outgoing)
+        
         # Mise à jour de la table de transition
-        key = (transition.from_state, transition.symbol)
-        if key not in self.transition_table:
-            self.transition_table[key] = set()
-        self.transition_table[key].add(transition.to_state)
+        key = (source, transition.symbol)
+        targets = self.transition_table.get(key)
+        if targets is None:
+            targets = self.transition_table[key] = set()
+        targets.add(transition.to_state)
+        if len(targets) == 2 and not is_epsilon:
+            self._nondeterministic_keys += 1
     
     def get_transitions_from(self, state: State, symbol: str = None):
         """Obtenir les transitions depuis un état donné"""
         if symbol:
             key = (state, symbol)
             return self.transition_table.get(key, set())
-        else:
-            result = []
-            for transition in self.transitions:
-                if transition.from_state == state:
-                    result.append(transition)
-            return result
+        return list(self.outgoing.get(state, ()))
     
     def is_deterministic(self):
         """Vérifier si l'automate est déterministe"""
-        if len(self.initial_states) > 1:
-            return False
-        
-        for state in self.states:
-            for symbol in self.alphabet:
-                transitions = self.get_transitions_from(state, symbol)
-                if len(transitions) > 1:
-                    return False
-        return True
+        return len(self.initial_states) <= 1 and self._nondeterministic_keys == 0
     
     def has_epsilon_transitions(self):
         """Vérifier si l'automate a des epsilon-transitions"""
-        return any(t.is_epsilon() for t in self.transitions)
+        return self._epsilon_count > 0
     
     def to_dict(self):
         """Convertir l'automate en dictionnaire pour la sérialisation"""
@@ -1,6 +1,8 @@
 class State:
     """Classe représentant un état d'automate"""
     
+    __slots__ = ('name', 'is_initial', 'is_final')
+    
     def __init__(self, name, is_initial=False, is_final=False):
         self.name = name
         self.is_initial = is_initial
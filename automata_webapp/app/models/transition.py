@@ -1,6 +1,8 @@
 class Transition:
     """Classe représentant une transition d'automate"""
     
+    __slots__ = ('from_state', 'to_state', 'symbol')
+    
     def __init__(self, from_state, to_state, symbol):
         self.from_state = from_state
         self.to_state = to_state
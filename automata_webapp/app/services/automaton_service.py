@@ -23,13 +23,11 @@ class AutomatonService:
             states_map[state.name] = state
         
         # Créer les transitions
+        add_transition = automaton.add_transition
         for trans_data in data.get('transitions', []):
-            from_state = states_map[trans_data['from']]
-            to_state = states_map[trans_data['to']]
-            symbol = trans_data['symbol']
-            
-            transition = Transition(from_state, to_state, symbol)
-            automaton.add_transition(transition)
+            add_transition(Transition(states_map[trans_data['from']],
+                                      states_map[trans_data['to']],
+                                      trans_data['symbol']))
         
         return automaton
     
@@ -40,11 +38,43 @@ class AutomatonService:
         automaton = AutomatonService.create_automaton_from_dict(automaton_data)
         
         analyzer = StateAnalyzer(automaton)
-        return {
-            'accessible_states': [s.name for s in analyzer.get_accessible_states()],
-            'coaccessible_states': [s.name for s in analyzer.get_coaccessible_states()],
-            'useful_states': [s.name for s in analyzer.get_useful_states()]
-        }
+        return analyzer.to_dict()
+    
+    @staticmethod
+    def canonize_automaton(automaton_data):
+        """Forme canonique (minimale, renumérotée) et empreinte d'un automate"""
+        from app.core.operations.canonization import Canonizer
+        automaton = AutomatonService.create_automaton_from_dict(automaton_data)
+        return Canonizer(automaton).to_dict()
+    
+    @staticmethod
+    def content_hash(automaton_data):
+        """Empreinte du langage reconnu : clé de cache et de déduplication"""
+        from app.core.operations.canonization import Canonizer
+        automaton = AutomatonService.create_automaton_from_dict(automaton_data)
+        return Canonizer(automaton).content_hash()
+    
+    @staticmethod
+    def are_equivalent(first_data, second_data):
+        """Deux automates sont équivalents si leurs formes canoniques coïncident"""
+        return AutomatonService.content_hash(first_data) == AutomatonService.content_hash(second_data)
+    
+    @staticmethod
+    def regex_equivalence(first_regex, second_regex):
+        """L(r1) = L(r2), décidé sur les dérivées sans construire d'automate"""
+        from app.core.automates_utils import compteurs, derivees
+        word = derivees.contre_exemple_equivalence(first_regex, second_regex)
+        result = {'equivalent': word is None, 'counterexample': word}
+        if word is not None:
+            result['accepted_by'] = 'first' if compteurs.reconnaitre_regex(first_regex, word) else 'second'
+        return result
+    
+    @staticmethod
+    def regex_containment(first_regex, second_regex):
+        """L(r1) ⊆ L(r2) ; le contre-exemple est un mot de L(r1) absent de L(r2)"""
+        from app.core.automates_utils import derivees
+        word = derivees.contre_exemple_inclusion(first_regex, second_regex)
+        return {'contained': word is None, 'counterexample': word}
     
     @staticmethod
     def minimize_automaton(automaton_data):
@@ -74,6 +104,18 @@ class AutomatonService:
         automaton = constructor.construct(regex_pattern)
         return automaton.to_dict()
     
+    @staticmethod
+    def regex_to_dfa(regex_pattern):
+        """AFD d'une expression ; E{m,n} passe par l'automate à compteurs, sans recopie"""
+        from app.core.automates_utils import compteurs, to_automaton
+        return to_automaton(compteurs.afd_regex(regex_pattern), f"AFD({regex_pattern})").to_dict()
+    
+    @staticmethod
+    def regex_membership(regex_pattern, word):
+        """Appartenance d'un mot au langage d'une expression (compteurs pour E{m,n})"""
+        from app.core.automates_utils import compteurs
+        return {'accepted': compteurs.reconnaitre_regex(regex_pattern, word)}
+    
     @staticmethod
     def glushkov_construction(regex_pattern):
         """Algorithme de Glushkov"""
@@ -82,6 +124,12 @@ class AutomatonService:
         automaton = constructor.construct(regex_pattern)
         return automaton.to_dict()
     
+    @staticmethod
+    def regex_cache_statistics():
+        """Hits, misses et occupation du cache partagé par les deux constructions"""
+        from app.core.automates_utils import cache_partage
+        return cache_partage().statistiques()
+    
     @staticmethod
     def extract_regex(automaton_data):
         """Extraire une expression régulière d'un automate"""
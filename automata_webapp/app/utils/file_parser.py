@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import tempfile
+from werkzeug.utils import secure_filename
+
+from app.core.automates_utils import AutomateCompact, format_binaire
+
+
+def get_extension(filename):
+    """Extension du fichier, en minuscules"""
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+def allowed_file(filename, allowed_extensions):
+    """Vérifie que l'extension du fichier est autorisée"""
+    return get_extension(filename) in allowed_extensions
+
+
+def parse_uploaded_file(file_storage, config):
+    """
+    Lit un automate envoyé par formulaire et le retourne au format
+    {'name', 'states', 'alphabet', 'transitions'} de l'application.
+
+    Les automates compilés (.afb) sont enregistrés dans UPLOAD_FOLDER sous
+    un nom tiré de leur contenu, puis projetés en mémoire : aucun décodage
+    n'a lieu au chargement. Seule la réponse, qui doit être du JSON, est
+    écrite à partir des tableaux projetés.
+    """
+    filename = secure_filename(file_storage.filename or '')
+    if not filename or not allowed_file(filename, config['ALLOWED_EXTENSIONS']):
+        raise ValueError("Type de fichier non autorisé")
+
+    extension = get_extension(filename)
+    name = filename.rsplit('.', 1)[0]
+
+    if extension == format_binaire.EXTENSION:
+        upload_folder = config['UPLOAD_FOLDER']
+        os.makedirs(upload_folder, exist_ok=True)
+        # Fichier temporaire puis renommage : une projection déjà ouverte sur
+        # un fichier du même nom reste valide (tronquer un fichier projeté
+        # provoque SIGBUS), et deux envois simultanés ne se mélangent pas
+        descriptor, temporary_path = tempfile.mkstemp(dir=upload_folder, suffix='.part')
+        try:
+            with os.fdopen(descriptor, 'wb') as temporary:
+                file_storage.save(temporary)
+            path = os.path.join(upload_folder, f"{name}-{file_digest(temporary_path)}.{extension}")
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        # Lecture unique pour la réponse : la projection est fermée aussitôt
+        # (load_compiled_automaton garde ouverts les fichiers relus ensuite)
+        try:
+            with format_binaire.AutomateBinaire.ouvrir(path) as compiled:
+                return compiled.vers_format_webapp(name)
+        except ValueError:
+            # Fichier corrompu : rien à garder
+            os.remove(path)
+            raise
+
+    if extension == 'json':
+        try:
+            data = json.load(file_storage.stream)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"JSON invalide: {e}")
+        if not isinstance(data, dict):
+            raise ValueError("Le fichier JSON doit contenir un objet automate")
+        try:
+            if 'states' in data:
+                compact = AutomateCompact.depuis_format_webapp(data)
+            else:
+                compact = AutomateCompact.depuis_dict(data)
+        except (KeyError, TypeError, AttributeError) as e:
+            # Champ manquant ou de mauvais type : fichier invalide, pas erreur serveur
+            raise ValueError(f"Automate JSON invalide: {e!r}")
+        return compact.vers_format_webapp(str(data.get('name', name)))
+
+    raise ValueError(f"Format .{extension} non pris en charge à l'import")
+
+
+def file_digest(path, length=16):
+    """Empreinte SHA-256 (tronquée) du contenu d'un fichier"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as stream:
+        for block in iter(lambda: stream.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+def load_compiled_automaton(path):
+    """
+    Automate compilé projeté en mémoire et gardé ouvert pour être relu (une
+    projection par processus et par fichier, en nombre borné)
+    """
+    return format_binaire.charger(path)
+
+
+def export_compiled_automaton(automaton_data):
+    """Octets du format binaire pour un automate au format de l'application"""
+    return format_binaire.encoder(AutomateCompact.depuis_format_webapp(automaton_data))
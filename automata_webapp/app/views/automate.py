@@ -1,7 +1,8 @@
 # routes/automate_routes.py - Routes pour l'API des automates
 import traceback
-from flask import Blueprint, request, jsonify , render_template
+from flask import Blueprint, request, jsonify , render_template, Response
 from app.models.automate import db, Automate, AutomateService
+from app.utils.file_parser import export_compiled_automaton
 from sqlalchemy import func
 
 automate_bp = Blueprint('automate', __name__, url_prefix='/api')
@@ -172,6 +173,34 @@ def validate_automate(automate_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     
+@automate_bp.route('/automates/<int:automate_id>/export', methods=['GET'])
+def export_automate(automate_id):
+    """Exporter un automate (?format=json par défaut, ou afb pour le binaire compilé)"""
+    try:
+        automate = AutomateService.get_automate(automate_id)
+        data = {
+            'name': automate.name,
+            'alphabet': list(automate.alphabet or []),
+            'states': [{'name': s.state_id, 'initial': s.is_initial, 'final': s.is_final}
+                       for s in automate.states],
+            'transitions': [{'from': t.from_state, 'to': t.to_state, 'symbol': t.symbol}
+                            for t in automate.transitions]
+        }
+
+        export_format = request.args.get('format', 'json')
+        if export_format == 'afb':
+            filename = f"automate_{automate.id}.afb"
+            return Response(
+                export_compiled_automaton(data),
+                mimetype='application/octet-stream',
+                headers={'Content-Disposition': f'attachment; filename={filename}'})
+        if export_format == 'json':
+            return jsonify({'success': True, 'automaton': data})
+        return jsonify({'success': False, 'error': f"Format d'export inconnu: {export_format}"}), 400
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @automate_bp.route('/mes-automates')
 def my_automata():
     """Afficher la page des automates avec les données de la BD"""
@@ -9,18 +9,62 @@ def regex_to_automaton():
     """Conversion d'expression régulière vers automate"""
     if request.method == 'POST':
         data = request.get_json()
-        algorithm = data.get('algorithm', 'thompson')  # thompson ou glushkov
+        algorithm = data.get('algorithm', 'thompson')  # thompson, glushkov ou dfa
         
-        if algorithm == 'thompson':
-            result = AutomatonService.thompson_construction(data['regex'])
-        elif algorithm == 'glushkov':
-            result = AutomatonService.glushkov_construction(data['regex'])
-        else:
-            result = {'error': 'Algorithme non reconnu'}
+        try:
+            if algorithm == 'thompson':
+                result = AutomatonService.thompson_construction(data['regex'])
+            elif algorithm == 'glushkov':
+                result = AutomatonService.glushkov_construction(data['regex'])
+            elif algorithm == 'dfa':
+                # AFD sans AFN intermédiaire : E{m,n} n'est pas recopiée
+                result = AutomatonService.regex_to_dfa(data['regex'])
+            else:
+                result = {'error': 'Algorithme non reconnu'}
+        except (KeyError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
         
         return jsonify(result)
     return render_template('expressions/regex_to_automaton.html')
 
+@expressions_bp.route('/regex-cache', methods=['GET'])
+def regex_cache():
+    """Compteurs du cache des constructions Thompson et Glushkov"""
+    return jsonify(AutomatonService.regex_cache_statistics())
+
+@expressions_bp.route('/regex-membership', methods=['POST'])
+def regex_membership():
+    """Appartenance d'un mot au langage d'une expression, sans développer E{m,n}"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}  # corps absent ou non JSON : KeyError, donc 400
+    try:
+        return jsonify(AutomatonService.regex_membership(data['regex'], str(data.get('word', ''))))
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@expressions_bp.route('/regex-equivalence', methods=['POST'])
+def regex_equivalence():
+    """Égalité des langages de deux expressions, avec un mot qui les distingue"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}  # corps absent ou non JSON : KeyError, donc 400
+    try:
+        return jsonify(AutomatonService.regex_equivalence(data['regex1'], data['regex2']))
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+@expressions_bp.route('/regex-containment', methods=['POST'])
+def regex_containment():
+    """Inclusion L(regex1) ⊆ L(regex2), avec un mot de regex1 hors de regex2"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}  # corps absent ou non JSON : KeyError, donc 400
+    try:
+        return jsonify(AutomatonService.regex_containment(data['regex1'], data['regex2']))
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
 @expressions_bp.route('/automaton-to-regex', methods=['GET', 'POST'])
 def automaton_to_regex():
     """Extraction d'expression régulière depuis un automate"""
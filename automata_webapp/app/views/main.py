@@ -1,5 +1,6 @@
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app
 from app.services.automaton_service import AutomatonService
+from app.utils.file_parser import parse_uploaded_file
 
 main_bp = Blueprint('main', __name__)
 
@@ -10,10 +11,16 @@ def index():
 
 @main_bp.route('/upload', methods=['GET', 'POST'])
 def upload_automaton():
-    """Upload d'un automate"""
+    """Upload d'un automate (JSON ou binaire compilé .afb)"""
     if request.method == 'POST':
-        # TODO: Gérer l'upload de fichier
-        pass
+        file = request.files.get('file')
+        if not file or not file.filename:
+            return jsonify({'success': False, 'error': 'Aucun fichier fourni'}), 400
+        try:
+            automaton = parse_uploaded_file(file, current_app.config)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        return jsonify({'success': True, 'automaton': automaton})
     return render_template('upload.html')
 
 @main_bp.route('/automate/nouveau', methods=['GET'])
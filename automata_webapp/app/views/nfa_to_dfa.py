@@ -1,8 +1,9 @@
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for , flash
 from app.models.automate import Automate, AutomateService, db
 from app.utils.nfa_to_dfa import NFAToDFAConverter
+from app.core.automates_utils import termes_regex
+from app.core.expressions.regex_generator import RegexGenerator
 import json
-import re
 
 nfa_to_dfa_bp = Blueprint('nfa_to_dfa', __name__, url_prefix='/nfa-to-dfa')
 
@@ -234,7 +235,6 @@ def convert_epsilon_afn_to_afn():
 # Version corrigée des fonctions d'extraction d'expression régulière
 
 import json
-import re
 from flask import render_template, redirect, url_for, flash
 
 # Route pour l'extraction d'expression régulière
@@ -247,10 +247,6 @@ def extract_regex():
             Automate.type.in_(['afn', 'afd', 'epsilon-afn'])
         ).order_by(Automate.created_at.desc()).all()
         
-        print(f"[DEBUG] Automates trouvés: {len(automates)}")  # Debug
-        for auto in automates:
-            print(f"[DEBUG] Automate {auto.id}: {auto.name}, type: {auto.type}")
-        
         return render_template('conversions/extract_regex.html', automates=automates)
     except Exception as e:
         print(f"[ERROR] Erreur lors du chargement des automates : {str(e)}")
@@ -262,11 +258,9 @@ def extract_regex_from_automate(automate_id):
     """Extraire l'expression régulière d'un automate spécifique"""
     try:
         automate = Automate.query.get_or_404(automate_id)
-        print(f"[DEBUG] Extraction pour automate {automate.id}: {automate.name}")
         
         # Extraire l'expression régulière
         regex = generate_regex_from_automate(automate)
-        print(f"[DEBUG] Expression régulière générée: {regex}")
         
         # Récupérer tous les automates pour la liste
         automates = Automate.query.filter(
@@ -288,15 +282,10 @@ def generate_regex_from_automate(automate):
     Génère une expression régulière à partir d'un automate en utilisant l'algorithme d'élimination d'états
     """
     try:
-        print(f"[DEBUG] Début génération regex pour automate {automate.name}")
-        
         # Parser les données de l'automate de manière sécurisée
         transitions_data = safe_parse_json(automate.transitions)
         states_data = safe_parse_json(automate.states)
-        
-        print(f"[DEBUG] States data: {states_data}")
-        print(f"[DEBUG] Transitions data: {transitions_data}")
-        
+
         if not transitions_data or not states_data:
             raise ValueError("Données d'automate invalides")
         
@@ -317,7 +306,6 @@ def generate_regex_from_automate(automate):
             if hasattr(state, '__dict__'):
                 # Objet SQLAlchemy AutomateState
                 # Inspecter les attributs disponibles
-                print(f"[DEBUG] Objet état: {state.__dict__}")
                 
                 # Priorité au state_id qui correspond aux transitions
                 state_name = (getattr(state, 'state_id', None) or 
@@ -367,27 +355,18 @@ def generate_regex_from_automate(automate):
                 
                 if is_initial:
                     initial_state = state_name
-                    print(f"[DEBUG] État initial trouvé: {state_name}")
                     
                 if is_final:
                     final_states.add(state_name)
-                    print(f"[DEBUG] État final trouvé: {state_name}")
-        
-        print(f"[DEBUG] États: {states}")
-        print(f"[DEBUG] État initial: {initial_state}")
-        print(f"[DEBUG] États finaux: {final_states}")
-        print(f"[DEBUG] Mapping état: {state_mapping}")
-        
+
         # Vérifications et corrections pour les cas où les états ne sont pas marqués
         if not initial_state and states:
             # Prendre le premier état comme initial si aucun n'est marqué
             initial_state = sorted(list(states))[0]
-            print(f"[DEBUG] Aucun état initial trouvé, utilisation de {initial_state}")
             
         if not final_states and states:
             # Prendre le dernier état comme final si aucun n'est marqué
             final_states.add(sorted(list(states))[-1])
-            print(f"[DEBUG] Aucun état final trouvé, utilisation de {final_states}")
         
         if not initial_state:
             raise ValueError("Aucun état initial trouvé")
@@ -396,11 +375,9 @@ def generate_regex_from_automate(automate):
         
         # Construire la matrice de transitions
         transition_matrix = build_transition_matrix(states, transitions_data, state_mapping)
-        print(f"[DEBUG] Matrice de transitions construite: {transition_matrix}")
         
         # Appliquer l'algorithme d'élimination d'états
         regex = state_elimination_algorithm(transition_matrix, initial_state, final_states, states)
-        print(f"[DEBUG] Regex finale: {regex}")
         
         return regex if regex and regex != "∅" else "∅"
         
@@ -412,25 +389,15 @@ def generate_regex_from_automate(automate):
 
 def build_transition_matrix(states, transitions_data, state_mapping=None):
     """
-    Construit une matrice de transitions pour l'algorithme d'élimination
+    Construit une matrice de transitions creuse pour l'algorithme d'élimination :
+    matrix[i] ne contient que les états j atteints depuis i, avec pour étiquette
+    l'union des symboles en terme (termes_regex), jamais en texte à réanalyser ;
+    la mémoire est proportionnelle au nombre de transitions et non à n².
     """
-    print(f"[DEBUG] Construction matrice pour états: {states}")
-    print(f"[DEBUG] Avec transitions: {transitions_data}")
-    print(f"[DEBUG] Mapping disponible: {state_mapping}")
-    
-    states_list = sorted(list(states))
-    matrix = {}
-    
-    # Initialiser la matrice
-    for i in states_list:
-        matrix[i] = {}
-        for j in states_list:
-            matrix[i][j] = []
+    matrix = {state: {} for state in states}
     
     # Remplir la matrice avec les transitions
     for transition in transitions_data:
-        print(f"[DEBUG] Traitement transition: {transition}")
-        
         from_state = None
         to_state = None
         symbol = None
@@ -438,7 +405,6 @@ def build_transition_matrix(states, transitions_data, state_mapping=None):
         # Gérer différents formats de transitions
         if hasattr(transition, '__dict__'):
             # Objet SQLAlchemy AutomateTransition
-            print(f"[DEBUG] Objet transition: {transition.__dict__}")
             
             # Essayer différents attributs possibles
             from_state = (getattr(transition, 'from_state', None) or 
@@ -469,7 +435,6 @@ def build_transition_matrix(states, transitions_data, state_mapping=None):
             try:
                 from_state, to_state, symbol = transition[:3]
             except (IndexError, ValueError):
-                print(f"[DEBUG] Format de transition non reconnu: {transition}")
                 continue
         
         # Convertir en chaînes seulement si nécessaire et appliquer le mapping si disponible
@@ -487,292 +452,43 @@ def build_transition_matrix(states, transitions_data, state_mapping=None):
                 
         if symbol is not None:
             symbol = str(symbol)
-        
-        print(f"[DEBUG] Transition extraite: {from_state} -> {to_state} avec '{symbol}'")
-        
+
         if from_state in states and to_state in states and symbol is not None:
-            # Traiter les epsilon-transitions
+            # Étiquettes en termes : un symbole n'est jamais relu comme une
+            # expression ('+' ou '10' restent un seul symbole)
             if symbol in ['ε', 'epsilon', '', 'λ', 'None', 'null']:
-                symbol = 'ε'
-            elif not symbol or symbol == 'None':
-                symbol = 'ε'
-            
-            matrix[from_state][to_state].append(symbol)
-            print(f"[DEBUG] Ajouté à matrice: {from_state}[{to_state}] = {matrix[from_state][to_state]}")
-        else:
-            print(f"[DEBUG] États non trouvés ou symbole invalide:")
-            print(f"[DEBUG]   from_state '{from_state}' in states: {from_state in states}")
-            print(f"[DEBUG]   to_state '{to_state}' in states: {to_state in states}")
-            print(f"[DEBUG]   symbol: '{symbol}'")
-    
-    # Convertir les listes en expressions régulières
-    for i in states_list:
-        for j in states_list:
-            transitions = matrix[i][j]
-            if not transitions:
-                matrix[i][j] = None
-            elif len(transitions) == 1:
-                matrix[i][j] = transitions[0]
+                label = termes_regex.mot_vide()
             else:
-                # Plusieurs transitions -> union
-                unique_symbols = sorted(list(set(transitions)))
-                if len(unique_symbols) == 1:
-                    matrix[i][j] = unique_symbols[0]
-                else:
-                    matrix[i][j] = '(' + '|'.join(unique_symbols) + ')'
+                label = termes_regex.symbole(symbol)
+            matrix[from_state].setdefault(to_state, []).append(label)
     
-    print(f"[DEBUG] Matrice finale: {matrix}")
-    return matrix
-
-# Fonction utilitaire pour déboguer les objets SQLAlchemy
-def inspect_sqlalchemy_object(obj, name=""):
-    """Fonction utilitaire pour déboguer les objets SQLAlchemy"""
-    print(f"[DEBUG] Inspection de {name}: {obj}")
-    print(f"[DEBUG] Type: {type(obj)}")
-    
-    if hasattr(obj, '__dict__'):
-        print(f"[DEBUG] Attributs dict: {obj.__dict__}")
-    
-    # Lister tous les attributs de l'objet
-    all_attrs = dir(obj)
-    relevant_attrs = [attr for attr in all_attrs if not attr.startswith('_')]
-    print(f"[DEBUG] Attributs publics: {relevant_attrs}")
-    
-    # Tester différents attributs possibles
-    possible_attrs = ['name', 'id', 'label', 'is_initial', 'initial', 'is_final', 'final', 'accepting',
-                     'from_state', 'to_state', 'source', 'target', 'symbol', 'input', 'char']
+    # Plusieurs transitions entre deux états -> union (cellules présentes seulement)
+    for row in matrix.values():
+        for j, labels in row.items():
+            row[j] = termes_regex.union(*labels)
     
-    for attr in possible_attrs:
-        if hasattr(obj, attr):
-            try:
-                value = getattr(obj, attr)
-                print(f"[DEBUG] {attr}: {value} (type: {type(value)})")
-            except Exception as e:
-                print(f"[DEBUG] Erreur lors de l'accès à {attr}: {e}")
+    return matrix
 
-# Version améliorée de safe_parse_json avec plus de débogage
 def safe_parse_json(data):
-    """Parse JSON de manière sécurisée avec débogage avancé"""
-    print(f"[DEBUG] Parsing data: {type(data)} - {data}")
-    
+    """Parse JSON de manière sécurisée (None si le format n'est pas reconnu)"""
     if isinstance(data, str):
         try:
-            parsed = json.loads(data)
-            print(f"[DEBUG] JSON parsé avec succès: {parsed}")
-            return parsed
-        except json.JSONDecodeError as e:
-            print(f"[DEBUG] Erreur JSON: {e}")
+            return json.loads(data)
+        except json.JSONDecodeError:
             return None
     elif isinstance(data, (list, dict)):
-        print(f"[DEBUG] Data déjà en format Python")
         return data
     elif hasattr(data, '__iter__') and not isinstance(data, str):
         # Pour les collections SQLAlchemy
-        print(f"[DEBUG] Collection SQLAlchemy détectée")
-        result = list(data)
-        print(f"[DEBUG] Collection convertie: {result}")
-        
-        # Inspecter chaque élément pour le débogage
-        for i, item in enumerate(result):
-            print(f"[DEBUG] Item {i}:")
-            inspect_sqlalchemy_object(item, f"item_{i}")
-        
-        return result
+        return list(data)
     
-    print(f"[DEBUG] Format de data non reconnu")
     return None
 
 def state_elimination_algorithm(matrix, initial_state, final_states, states):
     """
-    Algorithme d'élimination d'états pour générer l'expression régulière
+    Algorithme d'élimination d'états pour générer l'expression régulière :
+    délègue à RegexGenerator (étiquettes partagées, ordre d'élimination par coût).
+    La matrice peut être creuse : seules les cellules non vides sont lues.
     """
-    print(f"[DEBUG] Début algorithme élimination")
-    print(f"[DEBUG] Initial: {initial_state}, Final: {final_states}")
-    
-    states_list = list(states)
-    working_matrix = {i: {j: matrix[i][j] for j in matrix[i]} for i in matrix}
-    
-    # Cas simple : si on a seulement l'état initial et final
-    if len(states_list) == 1 and initial_state in final_states:
-        # Automate trivial qui accepte epsilon
-        loop = working_matrix.get(initial_state, {}).get(initial_state)
-        if loop:
-            return f"({loop})*"
-        else:
-            return "ε"
-    
-    # Normaliser : s'assurer qu'il n'y a qu'un seul état final
-    if len(final_states) > 1:
-        new_final = generate_unique_state_name(states_list, 'qf')
-        print(f"[DEBUG] Création nouvel état final: {new_final}")
-        
-        # Ajouter le nouvel état final à la matrice
-        working_matrix[new_final] = {}
-        for state in states_list:
-            working_matrix[state][new_final] = None
-            working_matrix[new_final] = working_matrix.get(new_final, {})
-            working_matrix[new_final][state] = None
-        
-        # Connecter tous les états finaux au nouvel état final avec ε
-        for final_state in final_states:
-            working_matrix[final_state][new_final] = 'ε'
-        
-        states_list.append(new_final)
-        final_states = {new_final}
-    
-    final_state = list(final_states)[0]
-    print(f"[DEBUG] État final unique: {final_state}")
-    
-    # Si initial et final sont le même état
-    if initial_state == final_state:
-        loop = working_matrix.get(initial_state, {}).get(final_state)
-        if loop and loop != 'ε':
-            return f"({loop})*"
-        else:
-            return "ε"
-    
-    # Éliminer tous les états sauf l'initial et le final
-    states_to_eliminate = [s for s in states_list if s != initial_state and s != final_state]
-    print(f"[DEBUG] États à éliminer: {states_to_eliminate}")
-    
-    for state_k in states_to_eliminate:
-        print(f"[DEBUG] Élimination de l'état: {state_k}")
-        
-        # Calculer l'auto-boucle sur l'état k
-        loop_kk = working_matrix[state_k][state_k]
-        loop_star = make_star(loop_kk) if loop_kk else None
-        print(f"[DEBUG] Auto-boucle {state_k}: {loop_kk} -> {loop_star}")
-        
-        # Mettre à jour toutes les transitions qui passent par k
-        remaining_states = [s for s in states_list if s != state_k]
-        
-        for i in remaining_states:
-            for j in remaining_states:
-                if i == state_k or j == state_k:
-                    continue
-                
-                # Chemin direct de i vers j
-                r_ij = working_matrix[i][j]
-                
-                # Chemin de i vers k
-                r_ik = working_matrix[i][state_k]
-                
-                # Chemin de k vers j
-                r_kj = working_matrix[state_k][j]
-                
-                # Calculer le nouveau chemin
-                new_path = None
-                if r_ik and r_kj:
-                    if loop_star:
-                        new_path = concatenate_regex([r_ik, loop_star, r_kj])
-                    else:
-                        new_path = concatenate_regex([r_ik, r_kj])
-                    print(f"[DEBUG] Nouveau chemin {i}->{j} via {state_k}: {new_path}")
-                
-                # Combiner avec le chemin direct
-                if r_ij and new_path:
-                    working_matrix[i][j] = f"({r_ij}|{new_path})"
-                elif new_path:
-                    working_matrix[i][j] = new_path
-                
-                print(f"[DEBUG] Mise à jour {i}[{j}]: {working_matrix[i][j]}")
-        
-        # Supprimer l'état k de la matrice
-        states_list.remove(state_k)
-        del working_matrix[state_k]
-        for state in working_matrix:
-            if state_k in working_matrix[state]:
-                del working_matrix[state][state_k]
-    
-    # L'expression régulière finale
-    result = working_matrix.get(initial_state, {}).get(final_state)
-    print(f"[DEBUG] Résultat brut: {result}")
-    
-    # Nettoyer et simplifier l'expression
-    if result:
-        result = clean_regex(result)
-        print(f"[DEBUG] Résultat nettoyé: {result}")
-    
-    return result or "∅"
-
-def generate_unique_state_name(existing_states, prefix):
-    """Génère un nom d'état unique"""
-    counter = 1
-    while f"{prefix}_{counter}" in existing_states:
-        counter += 1
-    return f"{prefix}_{counter}"
-
-def make_star(expression):
-    """Ajoute l'opérateur étoile à une expression"""
-    if not expression or expression == 'ε':
-        return ''
-    
-    if expression == '∅':
-        return ''
-    
-    if len(expression) == 1 and expression.isalnum():
-        return f"{expression}*"
-    else:
-        return f"({expression})*"
-
-def concatenate_regex(parts):
-    """Concatène plusieurs parties d'expression régulière"""
-    result_parts = []
-    for part in parts:
-        if part and part != 'ε' and part != '':
-            result_parts.append(part)
-    
-    if not result_parts:
-        return 'ε'
-    
-    return ''.join(result_parts)
-
-def clean_regex(regex):
-    """Nettoie et simplifie l'expression régulière"""
-    if not regex:
-        return "∅"
-    
-    original = regex
-    
-    # Remplacer les epsilon par des chaînes vides dans les concaténations
-    regex = re.sub(r'ε([a-zA-Z0-9\(\)])', r'\1', regex)
-    regex = re.sub(r'([a-zA-Z0-9\(\)])ε', r'\1', regex)
-    
-    # Simplifier les unions avec epsilon
-    regex = re.sub(r'\(ε\|([^)]+)\)', r'(\1)?', regex)
-    regex = re.sub(r'\(([^)]+)\|ε\)', r'(\1)?', regex)
-    
-    # Supprimer les unions vides
-    regex = re.sub(r'\|\s*\)', ')', regex)
-    regex = re.sub(r'\(\s*\|', '(', regex)
-    
-    # Supprimer les parenthèses inutiles pour les caractères simples
-    regex = re.sub(r'\(([a-zA-Z0-9])\)', r'\1', regex)
-    
-    # Nettoyer les espaces
-    regex = re.sub(r'\s+', '', regex)
-    
-    # Simplifier les expressions vides
-    if regex in ['', '()', 'ε']:
-        return 'ε'
-    
-    print(f"[DEBUG] Nettoyage: '{original}' -> '{regex}'")
-    return regex
-
-# Fonction utilitaire pour déboguer les objets SQLAlchemy
-def inspect_sqlalchemy_object(obj, name=""):
-    """Fonction utilitaire pour déboguer les objets SQLAlchemy"""
-    print(f"[DEBUG] Inspection de {name}: {obj}")
-    print(f"[DEBUG] Type: {type(obj)}")
-    
-    if hasattr(obj, '__dict__'):
-        print(f"[DEBUG] Attributs: {obj.__dict__}")
-    
-    # Tester différents attributs possibles
-    possible_attrs = ['name', 'id', 'label', 'is_initial', 'initial', 'is_final', 'final', 'accepting',
-                     'from_state', 'to_state', 'source', 'target', 'symbol', 'input', 'char']
-    
-    for attr in possible_attrs:
-        if hasattr(obj, attr):
-            value = getattr(obj, attr)
-            print(f"[DEBUG] {attr}: {value} (type: {type(value)})")
\ No newline at end of file
+    arcs = [(i, j, label) for i, row in matrix.items() for j, label in row.items()]
+    return RegexGenerator().eliminate(states, [initial_state], final_states, arcs)
@@ -54,6 +54,27 @@ def pruning():
         return jsonify(result)
     return render_template('operations/pruning.html')
 
+@operations_bp.route('/canonization', methods=['POST'])
+def canonization():
+    """Forme canonique d'un automate, ou comparaison de deux automates"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data:
+        return jsonify({'error': 'Corps JSON attendu (automate ou automata)'}), 400
+    try:
+        if 'automata' in data:
+            automata = data['automata']
+            if (not isinstance(automata, list) or len(automata) != 2
+                    or not all(isinstance(automaton, dict) for automaton in automata)):
+                return jsonify({'error': "'automata' doit être une liste de deux automates"}), 400
+            first, second = automata
+            return jsonify({'equivalent': AutomatonService.are_equivalent(first, second)})
+        return jsonify(AutomatonService.canonize_automaton(data))
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except (TypeError, AttributeError) as e:
+        # Champ d'automate de mauvais type (états, transitions...)
+        return jsonify({'error': f"Automate mal formé : {e}"}), 400
+
 @operations_bp.route('/closure-operations', methods=['GET', 'POST'])
 def closure_operations():
     """Opérations de clôture (union, intersection, etc.)"""
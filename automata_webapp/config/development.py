@@ -5,4 +5,4 @@ class DevelopmentConfig:
     DEBUG = True
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-    ALLOWED_EXTENSIONS = {'txt', 'json', 'xml'}
\ No newline at end of file
+    ALLOWED_EXTENSIONS = {'txt', 'json', 'xml', 'afb'}
\ No newline at end of file